@@ -0,0 +1,631 @@
+"""
+Static KQL cost analyzer for Azure Workbooks.
+
+Walks every .workbook and workbookgroup.json under the given paths (the whole
+repository by default), extracts each query - tiles, grids, charts and
+parameter dropdowns - with the parameters it depends on, and reports per
+workbook:
+
+- how many table scans a full load runs, and how many re-run when each
+  parameter changes (the scan multiplicity)
+- expensive patterns:
+    unbounded-scan      Log Analytics query with no time range in the step or the query
+    wildcard-union      union * (every table in the workspace)
+    rescan              the same table scanned more than once by one query (no materialize())
+    shared-preamble     several queries scan a table with the same leading filters
+    duplicate-query     identical queries in more than one step
+    contains-term       contains / !contains on a whole term, where has / !has can use the term index
+    summarize-then-filter  a where after summarize that only tests its by-columns, so it can move first
+- the steps to fix first, ranked by their estimated scan cost
+
+Nothing is executed; costs are estimates from the query text. Usage:
+
+    python kql_cost_analyzer.py                          # every workbook in the repository
+    python kql_cost_analyzer.py "../../Solutions/SQL Monitoring/Workbooks" --top 5
+    python kql_cost_analyzer.py --json report.json
+"""
+import argparse
+import json
+import re
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Workbook query types
+LOG_ANALYTICS = 0
+RESOURCE_GRAPH = 1
+QUERY_TYPES = {0: "Logs", 1: "Resource Graph", 4: "Metrics", 7: "ARM", 8: "JSON", 9: "Custom endpoint",
+               10: "Azure Data Explorer", 12: "Merge"}
+
+# An unbounded Log Analytics scan reads the table's whole retention, and
+# union * reads every table; weigh each like ten ordinary scans.
+UNBOUNDED_WEIGHT = 10
+
+SEVERITY = {"unbounded-scan": 3, "wildcard-union": 3, "rescan": 2, "shared-preamble": 2, "duplicate-query": 2,
+            "contains-term": 1, "summarize-then-filter": 1}
+
+# Sources that don't read a table
+NON_TABLE_SOURCES = {"print", "datatable", "range", "externaldata", "evaluate", "dynamic", "toscalar", "find",
+                     "search", "let", "set", "declare", "pack_array", "materialize", "union", "view"}
+TABULAR_OPERATORS = {"where", "summarize", "project", "extend", "order", "sort", "top", "take", "limit", "count",
+                     "distinct", "mv-expand", "mvexpand", "join", "parse"}
+KQL_WORDS = {"and", "or", "not", "in", "has", "contains", "startswith", "endswith", "between", "matches", "regex",
+             "true", "false", "null", "by", "on", "kind", "asc", "desc", "isnotempty", "isempty", "isnull",
+             "isnotnull", "dynamic", "datetime", "timespan", "ago", "now", "has_any", "has_all", "in~", "hasprefix",
+             "hassuffix", "like", "with", "typeof"}
+
+PARAMETER = re.compile(r"\{([A-Za-z_]\w*)(?::[\w$]+)?\}")
+STRING = re.compile(r'@"[^"]*"|@\'[^\']*\'|```.*?```|"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'', re.S)
+COMMENT = re.compile(r"//[^\n]*")
+PLACEHOLDER = re.compile(r"__([A-Za-z_]\w*?)__")
+IDENTIFIER = re.compile(r"[A-Za-z_][\w]*")
+TIME_FILTER = re.compile(r"\b(TimeGenerated|timestamp|EventTime|_TimeReceived)\b\s*(>|>=|<|<=|between|==|in)|\{\w*Time\w*\}"
+                         r"|\bago\s*\(", re.I)
+CONTAINS = re.compile(r"(!?contains(?:_cs)?|notcontains(?:cs)?)\s*(\(?\s*)\x00(\d+)\x00")
+TERM = re.compile(r"^[A-Za-z0-9]{3,}$")
+
+
+# ============================================================
+# Workbook walking
+# ============================================================
+class Query:
+    """One KQL query in a workbook: a query step or a parameter's dropdown query."""
+
+    def __init__(self, workbook, step, text, content, parameter=None, visible_when=()):
+        self.workbook = workbook
+        self.step = step
+        self.parameter = parameter
+        self.text = text
+        self.query_type = content.get("queryType")
+        self.resource_type = content.get("resourceType")
+        self.time_context = content.get("timeContext")
+        self.time_parameter = content.get("timeContextFromParameter")
+        self.resources = content.get("crossComponentResources") or []
+        self.visible_when = list(visible_when)
+        self.on_load = True
+        self.depends_on = set(PARAMETER.findall(text))
+        for resource in self.resources:
+            self.depends_on.update(PARAMETER.findall(resource))
+        if self.time_parameter:
+            self.depends_on.add(self.time_parameter)
+        self.analysis = None
+        self.findings = []
+
+    def analyze(self, snippets):
+        """Parse the query, with parameters that hold KQL (snippets) spliced in."""
+        text = PARAMETER.sub(lambda m: snippets.get(m.group(1), m.group(0)), self.text)
+        self.analysis = analyze_kql(text, "resources" if self.query_type == RESOURCE_GRAPH else None)
+        if self.query_type == RESOURCE_GRAPH:
+            # Resource Graph table names aren't case-sensitive
+            self.analysis.tables = [table.lower() for table in self.analysis.tables]
+
+    @property
+    def label(self):
+        return f"{self.step} ▸ parameter {self.parameter}" if self.parameter else self.step
+
+    @property
+    def source(self):
+        return QUERY_TYPES.get(self.query_type, f"type {self.query_type}")
+
+    @property
+    def time_bounded(self):
+        if self.time_parameter or (self.time_context or {}).get("durationMs"):
+            return True
+        return bool(TIME_FILTER.search(COMMENT.sub("", self.text)))
+
+    @property
+    def unbounded(self):
+        return self.query_type == LOG_ANALYTICS and self.analysis.tables and not self.time_bounded
+
+    @property
+    def scans(self):
+        return len(self.analysis.tables)
+
+    @property
+    def cost(self):
+        """Estimated relative cost of one run: table scans, weighted by how much of each table they read."""
+        if self.query_type != LOG_ANALYTICS:
+            return self.scans
+        cost = self.scans + (UNBOUNDED_WEIGHT - 1) * self.analysis.tables.count("*")
+        return cost * (UNBOUNDED_WEIGHT if self.unbounded else 1)
+
+
+def _visibility(item):
+    conditions = list(item.get("conditionalVisibilities") or [])
+    if item.get("conditionalVisibility"):
+        conditions.append(item["conditionalVisibility"])
+    return conditions
+
+
+def _shown(conditions, defaults):
+    """Whether a step is visible with every parameter at its default, i.e. runs on first load."""
+    for condition in conditions:
+        value = defaults.get(condition.get("parameterName"))
+        equal = str(value if value is not None else "") == str(condition.get("value") or "")
+        if equal != (condition.get("comparison") == "isEqualTo"):
+            return False
+    return True
+
+
+def iter_queries(workbook, items, prefix="", visible_when=()):
+    """Yield a Query for every query in a workbook's items, descending into groups."""
+    for index, item in enumerate(items or []):
+        content = item.get("content") or {}
+        step = f"{prefix}{item.get('name') or f'item {index + 1}'}"
+        visible = list(visible_when) + _visibility(item)
+        if isinstance(content.get("query"), str):
+            yield Query(workbook, step, content["query"], content, visible_when=visible)
+        for parameter in content.get("parameters") or []:
+            if isinstance(parameter.get("query"), str):
+                yield Query(workbook, step, parameter["query"], parameter, parameter.get("name"), visible)
+        if content.get("items"):
+            yield from iter_queries(workbook, content["items"], step + " / ", visible)
+
+
+def load_workbook(path):
+    """Parse a .workbook or workbookgroup.json; returns its top-level items."""
+    with open(path, encoding="utf-8-sig") as f:
+        data = json.load(f)
+    if "items" in data:
+        return data["items"]
+    # A workbookgroup.json is a single group item
+    return [data]
+
+
+def kql_parameters(items, snippets=None):
+    """Text parameters edited as KQL, which steps use as (part of) their query: name -> default value."""
+    snippets = {} if snippets is None else snippets
+    for item in items or []:
+        content = item.get("content") or {}
+        for parameter in content.get("parameters") or []:
+            if (parameter.get("typeSettings") or {}).get("editorLanguage") == "kql" \
+                    and isinstance(parameter.get("value"), str):
+                snippets[parameter.get("name")] = parameter["value"]
+        kql_parameters(content.get("items"), snippets)
+    return snippets
+
+
+def parameter_defaults(items, defaults=None):
+    """Parameter name -> its default value, including the tab a tab strip opens on."""
+    defaults = {} if defaults is None else defaults
+    for item in items or []:
+        content = item.get("content") or {}
+        for parameter in content.get("parameters") or []:
+            defaults.setdefault(parameter.get("name"), parameter.get("value"))
+        # Grids and tiles export the clicked row as parameters, unset until then
+        exported = [content.get("exportParameterName")]
+        exported += [p.get("parameterName") for p in content.get("exportedParameters") or []]
+        for name in filter(None, exported):
+            defaults.setdefault(name, None)
+        if item.get("type") == 11 and content.get("style") == "tabs":
+            links = [link for link in content.get("links") or [] if link.get("linkTarget") == "parameter"]
+            if links:
+                defaults.setdefault(links[0].get("cellValue"), links[0].get("subTarget"))
+        parameter_defaults(content.get("items"), defaults)
+    return defaults
+
+
+def discover(paths):
+    for root in paths:
+        root = Path(root)
+        if root.is_file():
+            yield root
+            continue
+        for path in sorted(root.rglob("*")):
+            if path.is_file() and (path.suffix == ".workbook" or path.name == "workbookgroup.json") \
+                    and ".git" not in path.parts:
+                yield path
+
+
+# ============================================================
+# KQL analysis
+# ============================================================
+class KqlAnalysis:
+    def __init__(self):
+        self.tables = []  # one entry per scan
+        self.stages = []  # pipeline stages of the main (last) statement
+        self.preamble = []  # source and the where stages straight after it
+        self.contains_terms = []
+        self.late_filters = []
+        self.normalized = ""
+
+
+def mask(text):
+    """Comments removed, string literals replaced by \\0<n>\\0 and parameters by identifiers.
+
+    Returns the masked text and the literals, so the structure can be split on
+    | ; , and parentheses without tripping over their contents.
+    """
+    literals = []
+
+    def keep(match):
+        literals.append(match.group(0))
+        return f"\x00{len(literals) - 1}\x00"
+
+    # Strings first, so // inside a string (URLs) isn't taken for a comment
+    masked = STRING.sub(keep, text)
+    masked = COMMENT.sub("", masked)
+    masked = PARAMETER.sub(lambda m: f"__{m.group(1)}__", masked)
+    return masked, literals
+
+
+def split_top(text, separator):
+    """Split on separator outside (), [] and {}."""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(text):
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _closing(text, start):
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] == "(":
+            depth += 1
+        elif text[i] == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(text) - 1
+
+
+def _operand_sources(operand, lets, materialized_seen):
+    operand = operand.strip()
+    if operand.startswith("("):
+        return tabular_sources(operand[1:_closing(operand, 0)], lets, materialized_seen)
+    if re.match(r"\w*\*", operand):
+        return ["*"]  # union * / union Perf*: every (matching) table
+    match = IDENTIFIER.match(operand)
+    if not match or match.group(0) in KQL_WORDS or re.match(r"\w+\s*=", operand):
+        return []
+    return _resolve(match.group(0), lets, materialized_seen)
+
+
+def _resolve(name, lets, materialized_seen):
+    if name in lets:
+        sources, materialized = lets[name]
+        if materialized:
+            # A materialized let is computed once, however often it's referenced
+            if name in materialized_seen:
+                return []
+            materialized_seen.add(name)
+        return list(sources)
+    if name in NON_TABLE_SOURCES or name.startswith("__"):
+        return []
+    return [name]
+
+
+def tabular_sources(expression, lets, materialized_seen, implicit=None):
+    """Tables a tabular expression reads, one entry per scan.
+
+    implicit is the table a query that starts with an operator reads
+    (Resource Graph's "resources").
+    """
+    stages = split_top(expression.strip(), "|")
+    head = stages[0].strip()
+    sources = []
+    if head.startswith("("):
+        close = _closing(head, 0)
+        sources += tabular_sources(head[1:close], lets, materialized_seen)
+    elif re.match(r"materialize\s*\(", head):
+        start = head.index("(")
+        sources += tabular_sources(head[start + 1:_closing(head, start)], lets, materialized_seen)
+    elif re.match(r"union\b", head):
+        sources += _union_sources(head[5:], lets, materialized_seen)
+    else:
+        match = IDENTIFIER.match(head)
+        if match and match.group(0) in TABULAR_OPERATORS:
+            sources += [implicit] if implicit else []
+        elif match and not re.match(r"\s*\(", head[match.end():]):
+            sources += _resolve(match.group(0), lets, materialized_seen)
+    for stage in stages[1:]:
+        stage = stage.strip()
+        if re.match(r"(join|lookup)\b", stage):
+            body = re.sub(r"^(join|lookup)(\s+\w+\s*=\s*\w+)*", "", stage).strip()
+            body = re.split(r"\bon\b", body)[0] if not body.startswith("(") else body
+            sources += _operand_sources(body, lets, materialized_seen)
+        elif re.match(r"union\b", stage):
+            sources += _union_sources(stage[5:], lets, materialized_seen)
+    return sources
+
+
+def _union_sources(operands, lets, materialized_seen):
+    operands = re.sub(r"^(\s*\w+\s*=\s*[^\s(,]+)*", "", operands)
+    sources = []
+    for operand in split_top(operands, ","):
+        sources += _operand_sources(operand, lets, materialized_seen)
+    return sources
+
+
+def _by_columns(summarize):
+    by = re.split(r"\bby\b", summarize, maxsplit=1)
+    if len(by) < 2:
+        return set()
+    columns = set()
+    for column in split_top(by[1], ","):
+        column = column.strip()
+        alias = re.match(r"(\w+)\s*=", column)
+        if alias:
+            columns.add(alias.group(1))
+            continue
+        # bin(TimeGenerated, 1h) keeps the column's name
+        match = re.match(r"(?:bin|floor|tostring|startofday)\s*\(\s*(\w+)", column) or IDENTIFIER.match(column)
+        if match:
+            columns.add(match.group(1) if match.groups() else match.group(0))
+    return columns
+
+
+def _columns_used(predicate):
+    names = set()
+    for match in IDENTIFIER.finditer(predicate):
+        name = match.group(0)
+        following = predicate[match.end():].lstrip()
+        if following.startswith("(") or name in KQL_WORDS or name.startswith("__") or name[0].isdigit():
+            continue
+        names.add(name)
+    return names
+
+
+def _stages(expression):
+    return [re.sub(r"\s+", " ", stage).strip() for stage in split_top(expression, "|")]
+
+
+def _preamble(stages):
+    preamble = stages[:1]
+    for stage in stages[1:]:
+        if not stage.startswith("where "):
+            break
+        preamble.append(stage)
+    return preamble
+
+
+def analyze_kql(text, implicit=None):
+    analysis = KqlAnalysis()
+    masked, literals = mask(text)
+    analysis.normalized = re.sub(r"\s+", " ", COMMENT.sub("", text)).strip()
+    lets, let_stages, materialized_seen = {}, {}, set()
+    statements = [s.strip() for s in split_top(masked, ";") if s.strip()]
+    main = ""
+    for statement in statements:
+        let = re.match(r"let\s+(\w+)\s*=\s*(.*)", statement, re.S)
+        if let:
+            name, body = let.groups()
+            body = body.strip()
+            if re.match(r"\(.*?\)\s*\{", body, re.S) or body.startswith("view"):
+                continue  # function definitions aren't scanned until called
+            is_materialized = bool(re.match(r"materialize\s*\(", body))
+            lets[name] = (tabular_sources(body, lets, set()), is_materialized)
+            let_stages[name] = _stages(body)
+            continue
+        main = statement
+        analysis.tables += tabular_sources(statement, lets, materialized_seen, implicit)
+    if not main and statements:
+        main = statements[-1]
+    stages = _stages(main)
+    analysis.stages = stages
+
+    # Source and leading filters, shared by queries that could run off one
+    # base query; a query on a let starts with the let's own preamble
+    preamble = _preamble(stages)
+    if preamble and preamble[0] in let_stages:
+        base = let_stages[preamble[0]]
+        preamble = _preamble(base) + (preamble[1:] if _preamble(base) == base else [])
+    analysis.preamble = [re.sub(r"\x00(\d+)\x00", lambda m: literals[int(m.group(1))], stage) for stage in preamble]
+
+    for match in CONTAINS.finditer(masked):
+        literal = literals[int(match.group(3))]
+        needle = literal.strip("@").strip("'\"")
+        if TERM.match(needle):
+            operator = match.group(1)
+            suggested = re.sub(r"^notcontains", "!has", operator).replace("contains", "has")
+            analysis.contains_terms.append((operator, literal, suggested))
+
+    by_columns = None
+    for stage in stages[1:]:
+        if stage.startswith("summarize "):
+            by_columns = _by_columns(stage)
+        elif by_columns and stage.startswith("where "):
+            used = _columns_used(stage[6:])
+            if used and used <= by_columns:
+                stage = re.sub(r"\x00(\d+)\x00", lambda m: literals[int(m.group(1))], stage)
+                analysis.late_filters.append(PLACEHOLDER.sub(r"{\1}", stage))
+        elif stage.split(" ", 1)[0] in ("project", "project-away", "project-rename", "extend", "join", "lookup",
+                                        "mv-expand", "union", "evaluate"):
+            by_columns = None
+    return analysis
+
+
+# ============================================================
+# Per-workbook report
+# ============================================================
+def fan_out(parameter, queries):
+    """Queries re-run when a parameter changes, following parameters that depend on it."""
+    rerun, pending, seen = set(), [parameter], set()
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        for query in queries:
+            if name in query.depends_on and query not in rerun:
+                rerun.add(query)
+                if query.parameter:
+                    pending.append(query.parameter)
+    return rerun
+
+
+def analyze_workbook(path, root=REPO_ROOT):
+    items = load_workbook(path)
+    try:
+        name = str(Path(path).resolve().relative_to(root))
+    except ValueError:
+        name = str(path)
+    queries = list(iter_queries(name, items))
+    defaults = parameter_defaults(items)
+    snippets = kql_parameters(items)
+    for query in queries:
+        query.on_load = _shown(query.visible_when, defaults)
+        query.analyze(snippets)
+
+    for query in queries:
+        if query.unbounded:
+            query.findings.append(("unbounded-scan", "no time range in the step or the query; scans all retention"))
+        if "*" in query.analysis.tables:
+            query.findings.append(("wildcard-union", "union * reads every table in the workspace; name the "
+                                                     "tables, or use the Usage table for volumes"))
+        for table, count in Counter(query.analysis.tables).items():
+            if count > 1 and table != "*":
+                fix = "materialize() it once" if query.query_type == LOG_ANALYTICS else \
+                    "fold the joins into one pass where the filters allow"
+                query.findings.append(("rescan", f"{table} scanned {count} times; {fix}"))
+        for operator, literal, suggested in query.analysis.contains_terms:
+            reason = "uses the term index" if query.query_type == LOG_ANALYTICS else "skips the substring search"
+            query.findings.append(("contains-term", f"{operator} {literal} looks for a whole term; {suggested} "
+                                                    f"{reason}"))
+        for stage in query.analysis.late_filters:
+            query.findings.append(("summarize-then-filter", f"'{stage}' only tests summarize by-columns; "
+                                                            f"filter before the summarize"))
+
+    duplicates = defaultdict(list)
+    for query in queries:
+        key = (query.analysis.normalized, query.query_type, tuple(query.resources))
+        duplicates[key].append(query)
+    for group in duplicates.values():
+        if len(group) > 1:
+            for query in group:
+                others = ", ".join(q.label for q in group if q is not query)
+                query.findings.append(("duplicate-query", f"same query as {others}"))
+
+    # Queries on the same workspaces that open with the same source and
+    # filters could run off one base query: group each query with the others
+    # that share its longest such prefix (source plus at least one filter)
+    candidates = [q for q in queries if q.scans and q.query_type == LOG_ANALYTICS and len(q.analysis.preamble) > 1]
+    prefixes = Counter()
+    for query in candidates:
+        for length in range(2, len(query.analysis.preamble) + 1):
+            prefixes[(tuple(query.resources), tuple(query.analysis.preamble[:length]))] += 1
+    bases = defaultdict(list)
+    for query in candidates:
+        for length in range(len(query.analysis.preamble), 1, -1):
+            key = (tuple(query.resources), tuple(query.analysis.preamble[:length]))
+            if prefixes[key] > 1:
+                bases[key].append(query)
+                break
+    shared = []
+    for (_, stages), group in bases.items():
+        if len(group) < 2:
+            continue
+        shared.append((PLACEHOLDER.sub(r"{\1}", " | ".join(stages)), group))
+        for query in group:
+            others = len(group) - 1
+            query.findings.append(("shared-preamble", f"starts like {others} other quer{'y' if others == 1 else 'ies'}"
+                                                      f" (base #{len(shared)}); run that part once as a base query"))
+
+    scans = Counter()
+    for query in queries:
+        scans.update(query.analysis.tables)
+    parameters = {}
+    for parameter in sorted(name for name in defaults if name):
+        rerun = fan_out(parameter, queries)
+        if rerun:
+            parameters[parameter] = {"queries": len(rerun), "scans": sum(q.scans for q in rerun),
+                                     "cost": sum(q.cost for q in rerun)}
+    on_load = [q for q in queries if q.on_load]
+    return {
+        "workbook": name,
+        "queries": len(queries),
+        "by_source": dict(Counter(q.source for q in queries)),
+        "scans": sum(q.scans for q in queries),
+        "scans_on_load": sum(q.scans for q in on_load),
+        "hidden_on_load": len(queries) - len(on_load),
+        "cost": sum(q.cost for q in queries),
+        "tables": dict(scans.most_common()),
+        "parameters": parameters,
+        "shared_preambles": [{"preamble": p, "queries": [q.label for q in g]} for p, g in shared],
+        "steps": sorted(({"step": q.label, "source": q.source, "scans": q.scans, "cost": q.cost,
+                          "reruns_on": sorted(q.depends_on),
+                          "on_load": q.on_load,
+                          "visible_when": [f"{c.get('parameterName')} {c.get('comparison')} {c.get('value')}"
+                                           for c in q.visible_when],
+                          "findings": [{"rule": r, "detail": d} for r, d in q.findings]} for q in queries),
+                        key=_priority, reverse=True),
+    }
+
+
+def _priority(step):
+    severity = max((SEVERITY[f["rule"]] for f in step["findings"]), default=0)
+    return step["cost"] * (1 + len(step["reruns_on"])), severity, len(step["findings"])
+
+
+def _shorten(text, width=90):
+    text = text.replace("\x00", "")
+    return text if len(text) <= width else text[:width - 1] + "…"
+
+
+def format_report(report, top=10):
+    lines = [f"== {report['workbook']}",
+             f"   {report['queries']} queries ({', '.join(f'{n} {s}' for s, n in report['by_source'].items())}); "
+             f"{report['scans']} table scans ({report['scans_on_load']} on first load; "
+             f"{report['hidden_on_load']} queries wait until their tab or condition is shown); "
+             f"estimated cost {report['cost']}"]
+    if report["tables"]:
+        lines.append("   scans per table: " + ", ".join(f"{t} x{n}" for t, n in report["tables"].items()))
+    heavy = sorted(report["parameters"].items(), key=lambda kv: kv[1]["cost"], reverse=True)[:5]
+    if heavy:
+        lines.append("   re-run on change: " + ", ".join(f"{p} -> {v['queries']} queries / {v['scans']} scans"
+                                                       for p, v in heavy))
+    for number, shared in enumerate(report["shared_preambles"], 1):
+        lines.append(f"   base #{number}, shared by {len(shared['queries'])} queries: {shared['preamble']}")
+    rules = Counter(f["rule"] for step in report["steps"] for f in step["findings"])
+    if rules:
+        lines.append("   findings: " + ", ".join(f"{rule} x{n}" for rule, n in rules.most_common()))
+    flagged = [step for step in report["steps"] if step["findings"]][:top]
+    if flagged:
+        lines.append("   fix first:")
+    for step in flagged:
+        lines.append(f"   - {step['step']} [{step['source']}, {step['scans']} scan(s), cost {step['cost']}"
+                     f"{', re-runs on ' + ', '.join(step['reruns_on']) if step['reruns_on'] else ''}]")
+        for finding in step["findings"]:
+            lines.append(f"       {finding['rule']}: {_shorten(finding['detail'], 110)}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estimate the KQL scan cost of Azure Workbooks")
+    parser.add_argument("paths", nargs="*", default=[str(REPO_ROOT)],
+                        help="Workbook files or folders to search (default: the repository)")
+    parser.add_argument("--top", type=int, default=10, help="Flagged steps to list per workbook")
+    parser.add_argument("--json", metavar="PATH", help="Also write the full report as JSON (- for stdout)")
+    args = parser.parse_args(argv)
+
+    reports = [analyze_workbook(path) for path in discover(args.paths)]
+    if not reports:
+        print("No .workbook or workbookgroup.json files found", file=sys.stderr)
+        return 1
+    reports.sort(key=lambda r: r["cost"], reverse=True)
+    if args.json == "-":
+        json.dump(reports, sys.stdout, indent=2, ensure_ascii=False)
+        return 0
+    for report in reports:
+        print(format_report(report, args.top))
+        print()
+    total = sum(r["scans"] for r in reports)
+    print(f"{len(reports)} workbook(s), {sum(r['queries'] for r in reports)} queries, {total} table scans")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2, ensure_ascii=False)
+        print(f"Report written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
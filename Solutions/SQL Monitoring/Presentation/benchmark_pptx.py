@@ -0,0 +1,221 @@
+"""
+Benchmarks for the presentation generator.
+
+Measures the add_* helper primitives and full-deck builds (the deck spec repeated
+until it reaches 10, 100 and 1,000 slides by default), reporting wall time,
+shapes/sec, peak traced Python memory (tracemalloc), max RSS and the size of
+the saved .pptx. tracemalloc only sees Python allocations, not lxml's C-level
+trees, so max RSS is the better signal for document size. Max RSS is a
+process-wide high-water mark, so every benchmark runs in a fresh process and
+reports its own peak; under --profile everything runs in one process (the
+profiler can't follow the workers) and the column is the run's peak so far.
+The slide cache is disabled unless --cached is given, so the numbers reflect
+real rendering work.
+--stream builds the full decks with pptx_stream.py instead, writing each slide
+to a temporary file as it is finished.
+
+Usage:
+    python benchmark_pptx.py [--sizes 10,100,1000] [--count 2000] [--cached] [--stream] [--no-memory]
+                             [--json results.json] [--profile build.pstats]
+"""
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import cProfile
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import generate_pptx
+import pptx_stream
+from deck_spec import build_slides
+from pptx.util import Inches
+
+SHAPES_PER_SLIDE = 100
+
+
+def _max_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _measure(make_work, trace_memory=True):
+    """Time a fresh work() from make_work(), then trace a second one for peak memory.
+
+    tracemalloc slows Python allocations down several times over, so the timed
+    pass runs untraced. Returns (result of the timed pass, seconds, peak traced MB).
+    """
+    work = make_work()
+    started = time.perf_counter()
+    result = work()
+    seconds = time.perf_counter() - started
+    peak_mb = None
+    if trace_memory:
+        work = make_work()
+        tracemalloc.start()
+        try:
+            work()
+            peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+    return result, seconds, peak_mb
+
+
+def _saved_size(prs):
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.tell()
+
+
+PRIMITIVES = {
+    "add_text_box": lambda slide, i: generate_pptx.add_text_box(
+        slide, Inches(1), Inches(1), Inches(3), Inches(1), f"Text box {i}", 14, i % 2 == 0),
+    "add_bullet_list": lambda slide, i: generate_pptx.add_bullet_list(
+        slide, Inches(1), Inches(1), Inches(3), Inches(2), [f"Item {i}.{j}" for j in range(4)], 14),
+    "add_rounded_rect": lambda slide, i: generate_pptx.add_rounded_rect(
+        slide, Inches(1), Inches(1), Inches(3), Inches(1), generate_pptx.AZURE_BLUE, f"Tile {i}", 12),
+    "add_shape_bg": lambda slide, i: generate_pptx.add_shape_bg(
+        slide, Inches(1), Inches(1), Inches(3), Inches(1), generate_pptx.LIGHT_BLUE),
+}
+
+
+def bench_primitive(name, count, trace_memory=True):
+    add = PRIMITIVES[name]
+
+    def make_work():
+        prs = generate_pptx.load_template()
+        layout = prs.slide_layouts[6]
+
+        def work():
+            slide = None
+            for i in range(count):
+                if i % SHAPES_PER_SLIDE == 0:
+                    slide = prs.slides.add_slide(layout)
+                    slide.shapes.turbo_add_enabled = True
+                add(slide, i)
+            return prs
+        return work
+
+    prs, seconds, peak_mb = _measure(make_work, trace_memory)
+    return _result(name, count, seconds, peak_mb, _saved_size(prs))
+
+
+def deck_of(slide_count):
+    """The real deck spec, cycled until it has slide_count slides."""
+    return list(itertools.islice(itertools.cycle(build_slides()), slide_count))
+
+
+def bench_deck(slide_count, cached=False, trace_memory=True, stream=False):
+    slides = deck_of(slide_count)
+    shapes = sum(len(spec["shapes"]) for spec in slides)
+    cache = generate_pptx.SlideCache(cache_dir=None)
+    if cached:
+        # Warm the in-memory cache so the measured build only replays slide XML
+        generate_pptx.build_presentation(generate_pptx.load_template(), slides, cache=cache)
+    fd, stream_path = tempfile.mkstemp(suffix=".pptx")
+    os.close(fd)
+
+    def make_work():
+        work_cache = cache if cached else generate_pptx.SlideCache(cache_dir=None, memory=not stream)
+
+        def work():
+            if stream:
+                pptx_stream.stream_presentation(slides, stream_path, cache=work_cache)
+                return None
+            prs = generate_pptx.load_template()
+            generate_pptx.build_presentation(prs, slides, cache=work_cache)
+            return prs
+        return work
+
+    try:
+        prs, seconds, peak_mb = _measure(make_work, trace_memory)
+        file_bytes = os.path.getsize(stream_path) if stream else _saved_size(prs)
+    finally:
+        os.unlink(stream_path)
+    name = f"deck_{slide_count}" + ("_cached" if cached else "") + ("_stream" if stream else "")
+    return _result(name, shapes, seconds, peak_mb, file_bytes)
+
+
+def _result(name, shapes, seconds, peak_mb, file_bytes):
+    return {
+        "benchmark": name,
+        "shapes": shapes,
+        "seconds": seconds,
+        "shapes_per_sec": shapes / seconds,
+        "peak_traced_mb": peak_mb,
+        "max_rss_mb": _max_rss_mb(),
+        "file_bytes": file_bytes,
+    }
+
+
+def _in_fresh_process(function, *args):
+    """function(*args) in a new interpreter, so the max RSS it reports is its own."""
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(function, *args).result()
+
+
+def _in_this_process(function, *args):
+    return function(*args)
+
+
+def run(sizes, count, cached=False, trace_memory=True, stream=False, isolate=True):
+    call = _in_fresh_process if isolate else _in_this_process
+    results = [call(bench_primitive, name, count, trace_memory) for name in PRIMITIVES]
+    results += [call(bench_deck, size, cached, trace_memory, stream) for size in sizes]
+    return results
+
+
+def print_results(results):
+    print(f"{'benchmark':<22}{'shapes':>9}{'seconds':>10}{'shapes/s':>11}{'peak MB':>10}{'RSS MB':>9}{'file KB':>10}")
+
+    def optional(value, width):
+        return f"{value:{width}.1f}" if value is not None else f"{'n/a':>{width}}"
+
+    for r in results:
+        print(f"{r['benchmark']:<22}{r['shapes']:>9}{r['seconds']:>10.3f}{r['shapes_per_sec']:>11.0f}"
+              f"{optional(r['peak_traced_mb'], 10)}{optional(r['max_rss_mb'], 9)}{r['file_bytes'] / 1024:>10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the presentation generator")
+    parser.add_argument("--sizes", default="10,100,1000", help="Comma-separated full-deck slide counts")
+    parser.add_argument("--count", type=int, default=2000, help="Shapes per primitive benchmark")
+    parser.add_argument("--cached", action="store_true", help="Measure full decks rebuilt from a warm slide cache")
+    parser.add_argument("--stream", action="store_true", help="Write full decks with pptx_stream.py, slide by slide")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass (halves the run time)")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    parser.add_argument("--profile", help="Write a cProfile/pstats dump of the whole run to this path")
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    if args.profile:
+        profiler = cProfile.Profile()
+        results = profiler.runcall(run, sizes, args.count, args.cached, not args.no_memory, args.stream, False)
+        profiler.dump_stats(args.profile)
+        print(f"Profile written to: {args.profile} (inspect with python -m pstats)")
+        print("All benchmarks ran in this process: RSS MB is the run's peak up to each row")
+    else:
+        results = run(sizes, args.count, args.cached, not args.no_memory, args.stream)
+
+    print_results(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
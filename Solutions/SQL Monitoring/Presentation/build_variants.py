@@ -0,0 +1,99 @@
+"""
+Build many variants of the SQL Server Monitoring deck in parallel.
+
+A variant matrix is a JSON list of objects:
+
+    {"name": "contoso-pt-br", "locale": "pt-br", "customer": "Contoso",
+     "palette": {"DARK_BLUE": "1F3864"}, "output": "optional/path.pptx"}
+
+Only "name" is required. "locale" picks locales/<locale>.json (en-us needs no
+table), "palette" overrides entries of deck_spec.PALETTE. Variants are spread
+over a process pool; every worker keeps its own template cache and all of
+them share the on-disk slide cache, so slides common to several variants are
+rendered once.
+
+Usage:
+    python build_variants.py variants.json [--output-dir DIR] [--workers N]
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import argparse
+import json
+import os
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+LOCALES_DIR = os.path.join(SCRIPT_DIR, "locales")
+DEFAULT_LOCALE = "en-us"
+
+
+def load_strings(locale):
+    """String table for locale; the English source needs none."""
+    if not locale or locale.lower() == DEFAULT_LOCALE:
+        return {}
+    with open(os.path.join(LOCALES_DIR, locale.lower() + ".json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def variant_output(variant, output_dir):
+    if variant.get("output"):
+        return variant["output"]
+    return os.path.join(output_dir, f"SQLServerMonitoring-Presentation-{variant['name']}.pptx")
+
+
+def build_variant(variant, output_dir):
+    """Build and save one variant. Runs inside a worker process."""
+    # Imported here so the parent process never pays for python-pptx
+    import generate_pptx
+    from deck_spec import PALETTE, build_slides, localize_slides
+
+    started = time.perf_counter()
+    palette = {**PALETTE, **variant.get("palette", {})}
+    slides = localize_slides(build_slides(variant.get("customer")), load_strings(variant.get("locale")))
+    prs = generate_pptx.load_template()
+    rendered, reused = generate_pptx.build_presentation(prs, slides, palette)
+    output = variant_output(variant, output_dir)
+    generate_pptx.save_presentation(prs, output)
+    return {
+        "name": variant["name"],
+        "output": output,
+        "slides": len(slides),
+        "rendered": rendered,
+        "cached": reused,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def build_variants(variants, output_dir=SCRIPT_DIR, workers=None):
+    """Build every variant concurrently and return per-variant results in matrix order."""
+    names = [v["name"] for v in variants]
+    if len(set(names)) != len(names):
+        raise ValueError("Variant names must be unique")
+    os.makedirs(output_dir, exist_ok=True)
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(build_variant, v, output_dir): v["name"] for v in variants}
+        for future in as_completed(futures):
+            result = future.result()
+            results[result["name"]] = result
+            print(f"  {result['name']:<30} {result['seconds']:7.2f}s  "
+                  f"({result['rendered']} rendered, {result['cached']} cached) -> {result['output']}")
+    return [results[name] for name in names]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build deck variants in parallel")
+    parser.add_argument("matrix", help="JSON file with the list of variants")
+    parser.add_argument("--output-dir", default=SCRIPT_DIR)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    with open(args.matrix, encoding="utf-8") as f:
+        variants = json.load(f)
+
+    started = time.perf_counter()
+    print(f"Building {len(variants)} variant(s)...")
+    results = build_variants(variants, args.output_dir, args.workers)
+    total = time.perf_counter() - started
+    busy = sum(r["seconds"] for r in results)
+    print(f"Done: {len(results)} variant(s) in {total:.2f}s wall ({busy:.2f}s summed per-variant time)")
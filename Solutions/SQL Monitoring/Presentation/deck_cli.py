@@ -0,0 +1,165 @@
+"""
+Command line entry point for the SQL Server Monitoring presentation.
+
+    python deck_cli.py build [--slides 5,6] [--output deck.pptx] [--update | --stream]
+                             [--export records.jsonl ... | --store DIR] [--since 2026-02-01] [--lab-guide [GUIDE.md]]
+    python deck_cli.py list-slides [--slides 1-3] [deck options]
+    python deck_cli.py validate [--slides 1-3] [deck options]
+    python deck_cli.py benchmark [benchmark_pptx.py options]
+
+--slides takes 1-based deck positions, as list-slides prints them: single
+numbers and ranges, comma-separated ("5,6", "1-3,10"). build renders only the
+selected slides, in deck order, into the output. build --update patches an
+existing output in place instead of replacing it, rewriting only the zip
+members (slides, their rels and media) that changed; see pptx_patch.py.
+build --stream writes each slide into the output as soon as it is rendered
+and frees it, so memory stays flat for decks of any size; see pptx_stream.py.
+
+Only argparse and os are imported up front. list-slides and validate work on
+the plain-data deck spec (deck_spec.py) and never load python-pptx or lxml,
+so they start in a few tens of milliseconds; build and benchmark import the
+renderer when they run. Importing this module does nothing, so main() and
+select_slides() can be used from other scripts.
+"""
+import argparse
+import os
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(SCRIPT_DIR, "SQLServerMonitoring-Presentation.pptx")
+DEFAULT_GUIDE = os.path.join(SCRIPT_DIR, "LabGuide-SQLServerMonitoring.md")
+
+
+def parse_selection(value, count):
+    """1-based slide numbers from "5,6" / "1-3,10", in deck order and without repeats."""
+    numbers = set()
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        try:
+            first = int(first)
+            last = int(last) if last else first
+        except ValueError:
+            raise ValueError(f"bad slide selection {part!r}: expected N or N-M")
+        if not 1 <= first <= last <= count:
+            raise ValueError(f"slide selection {part!r} is outside 1-{count}")
+        numbers.update(range(first, last + 1))
+    if not numbers:
+        raise ValueError("empty slide selection")
+    return sorted(numbers)
+
+
+def select_slides(slides, selection=None):
+    """(numbers, slides) for the selection, or for the whole deck when selection is empty."""
+    numbers = parse_selection(selection, len(slides)) if selection else range(1, len(slides) + 1)
+    return list(numbers), [slides[number - 1] for number in numbers]
+
+
+def _deck(args):
+    from deck_spec import deck_slides
+    try:
+        slides = deck_slides(args.export, args.since, args.lab_guide, args.store)
+    except FileNotFoundError as e:
+        raise SystemExit(f"error: {e}")
+    try:
+        return select_slides(slides, args.slides)
+    except ValueError as e:
+        raise SystemExit(f"error: --slides: {e}")
+
+
+def cmd_build(args):
+    import generate_pptx
+    _, slides = _deck(args)
+    if args.stream:
+        from pptx_stream import stream_presentation
+        rendered, reused = stream_presentation(slides, args.output)
+        print(f"Presentation saved to: {args.output}")
+        print(f"Slides: {len(slides)} ({rendered} rendered, {reused} from cache)")
+        return 0
+    prs = generate_pptx.load_template()
+    rendered, reused = generate_pptx.build_presentation(prs, slides)
+    counts = generate_pptx.update_presentation(prs, args.output) if args.update else None
+    if counts is None:
+        if not args.update:
+            generate_pptx.save_presentation(prs, args.output)
+        print(f"Presentation saved to: {args.output}")
+    else:
+        kept, copied, rewritten, removed, written = counts
+        print(f"Presentation updated: {args.output}")
+        print(f"Parts: {kept} untouched, {copied} copied, {rewritten} rewritten, {removed} removed "
+              f"({written:,} bytes written)")
+    print(f"Slides: {len(prs.slides)} ({rendered} rendered, {reused} from cache)")
+    return 0
+
+
+def cmd_list_slides(args):
+    numbers, slides = _deck(args)
+    for number, spec in zip(numbers, slides):
+        kinds = {}
+        for shape in spec["shapes"]:
+            kinds[shape["kind"]] = kinds.get(shape["kind"], 0) + 1
+        summary = ", ".join(f"{count} {kind}" for kind, count in kinds.items())
+        print(f"{number:>4}  {spec['name']:<40}  {len(spec['shapes']):>4} shapes  ({summary})")
+    return 0
+
+
+def cmd_validate(args):
+    from deck_spec import validate_slides
+    numbers, slides = _deck(args)
+    problems = validate_slides(slides, numbers=numbers)
+    for problem in problems:
+        print(problem)
+    print(f"{len(slides)} slides checked, {len(problems)} problems")
+    return 1 if problems else 0
+
+
+def cmd_benchmark(args, extra):
+    import benchmark_pptx
+    benchmark_pptx.main(extra)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Build, list and check the SQL Server Monitoring presentation")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    deck = argparse.ArgumentParser(add_help=False)
+    deck.add_argument("--slides", help="1-based slides to use, e.g. 5,6 or 1-3,10 (default: all)")
+    deck.add_argument("--export", action="append", default=[],
+                      help="SQLServerMonitoring_CL export (.jsonl/.csv, optionally .gz) to report on; repeatable")
+    deck.add_argument("--store", help="Report from a record_store.py directory instead of --export files")
+    deck.add_argument("--since", help="Ignore exported records older than this ISO timestamp")
+    deck.add_argument("--lab-guide", nargs="?", const=DEFAULT_GUIDE,
+                      help="Append the lab guide (default: LabGuide-SQLServerMonitoring.md) as appendix slides")
+
+    build = commands.add_parser("build", parents=[deck], help="Render the deck (or the selected slides) to .pptx")
+    build.add_argument("--output", default=DEFAULT_OUTPUT)
+    mode = build.add_mutually_exclusive_group()
+    mode.add_argument("--update", action="store_true",
+                      help="Patch the existing output in place, rewriting only the parts that changed")
+    mode.add_argument("--stream", action="store_true",
+                      help="Write each slide to the output as it is finished, in bounded memory, for very large decks")
+    build.set_defaults(handler=cmd_build)
+    commands.add_parser("list-slides", parents=[deck], help="Print each slide's number, name and shapes"
+                        ).set_defaults(handler=cmd_list_slides)
+    commands.add_parser("validate", parents=[deck], help="Check the deck spec without rendering it"
+                        ).set_defaults(handler=cmd_validate)
+    commands.add_parser("benchmark", add_help=False, help="Run benchmark_pptx.py; other options are passed through"
+                        ).set_defaults(handler=cmd_benchmark)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.handler is cmd_benchmark:
+        return cmd_benchmark(args, extra)
+    if extra:
+        parser.error("unrecognized arguments: " + " ".join(extra))
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,602 @@
+"""
+Declarative description of the SQL Server Monitoring deck.
+
+Every slide is a dict with a name, an optional background color and a list of
+shape specs. Boxes are (left, top, width, height) in inches; colors are either
+a PALETTE key or a literal RRGGBB hex string. The whole spec is plain data so
+generate_pptx.py can fingerprint each slide and skip re-rendering unchanged ones.
+
+Locale variants are produced by localize_slides(), which swaps every text
+through a string table (locales/<locale>.json) keyed by the English source.
+"""
+import copy
+import os
+
+# Color palette (RRGGBB)
+PALETTE = {
+    "DARK_BLUE": "003366",
+    "AZURE_BLUE": "0078D4",
+    "LIGHT_BLUE": "DEECF9",
+    "WHITE": "FFFFFF",
+    "DARK_GRAY": "333333",
+    "MEDIUM_GRAY": "666666",
+    "LIGHT_GRAY": "F2F2F2",
+    "GREEN": "107C10",
+    "ORANGE": "FF8C00",
+    "RED": "D13438",
+}
+
+SLIDE_WIDTH = 13.333
+SLIDE_HEIGHT = 7.5
+
+ARCHITECTURE_DIAGRAM = os.path.join(os.path.dirname(os.path.abspath(__file__)), "SQLMonitoring-Architecture.drawio")
+# Screenshot of the repository's Windows Services workbook (.images/ at the repository root)
+WORKBOOK_SCREENSHOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", ".images",
+                                   "Windows Services Workbook.png")
+
+
+# ============================================================
+# Shape spec builders
+# ============================================================
+def rect(box, color):
+    return {"kind": "shape_bg", "box": box, "color": color}
+
+
+def text(box, value, size=18, bold=False, color="DARK_GRAY", align="left", font=None):
+    shape = {"kind": "text_box", "box": box, "text": value, "size": size,
+             "bold": bold, "color": color, "align": align}
+    if font:
+        shape["font"] = font
+    return shape
+
+
+def bullets(box, items, size=16, color="DARK_GRAY"):
+    return {"kind": "bullet_list", "box": box, "items": list(items), "size": size, "color": color}
+
+
+def rounded(box, color, value="", size=12, font_color="WHITE"):
+    return {"kind": "rounded_rect", "box": box, "color": color, "text": value,
+            "size": size, "font_color": font_color}
+
+
+def table(box, rows, size=11, header_color="DARK_BLUE", col_widths=None):
+    """rows[0] is the header row; every cell is stored as a string."""
+    return {"kind": "table", "box": box, "rows": [[str(cell) for cell in row] for row in rows],
+            "size": size, "header_color": header_color,
+            "col_widths": list(col_widths) if col_widths else None}
+
+
+def chart(chart_type, box, categories, values, title="", colors=None, size=11):
+    """chart_type is "pie" or "bar"; colors, if given, are per data point."""
+    return {"kind": "chart", "chart": chart_type, "box": box, "categories": list(categories),
+            "values": list(values), "title": title, "colors": list(colors) if colors else None, "size": size}
+
+
+def autoshape(box, shape="rect", fill=None, line=None, value="", size=12, bold=False,
+              font_color="DARK_GRAY", align="center", anchor="middle", wrap=True):
+    """Any preset shape with optional fill and outline; line is (color, width_pt, dashed) or None."""
+    return {"kind": "autoshape", "shape": shape, "box": box, "fill": fill,
+            "line": {"color": line[0], "width": line[1], "dashed": line[2]} if line else None,
+            "text": value, "size": size, "bold": bold, "font_color": font_color,
+            "align": align, "anchor": anchor, "wrap": wrap}
+
+
+def connector(points, color="DARK_GRAY", width=1, dashed=False, arrow=True):
+    """A line through points ((x, y) in inches), drawn as straight connectors; arrow marks the last point."""
+    return {"kind": "connector", "points": [list(p) for p in points], "color": color,
+            "width": width, "dashed": dashed, "arrow": arrow}
+
+
+def picture(box, path):
+    """An image file fitted into box (keeping its aspect ratio); the generator downscales it to fit."""
+    return {"kind": "picture", "box": box, "image": os.path.abspath(path)}
+
+
+def header(title, size=36):
+    """Standard white slide with the dark title bar."""
+    return [
+        rect((0, 0, SLIDE_WIDTH, 1.2), "DARK_BLUE"),
+        text((0.8, 0.25, 11, 0.8), title, size, True, "WHITE"),
+    ]
+
+
+def slide(name, shapes, background=None):
+    return {"name": name, "background": background, "shapes": shapes}
+
+
+# ============================================================
+# SLIDE 1: Title Slide
+# ============================================================
+def _title_slide(customer=None):
+    shapes = [
+        rect((0, 0, SLIDE_WIDTH, SLIDE_HEIGHT), "DARK_BLUE"),
+        rect((0, 5.5, SLIDE_WIDTH, 0.08), "AZURE_BLUE"),
+        text((1, 1.5, 11, 1.5), "SQL Server Monitoring Solution", 44, True, "WHITE", "center"),
+        text((1, 3.0, 11, 0.8), "Centralized Monitoring with Azure Automation & Logs Ingestion API",
+             24, False, "BBDEFB", "center"),
+        text((1, 4.5, 11, 0.6), "Azure Monitor  |  Log Analytics  |  Custom Workbook",
+             18, False, "90CAF9", "center"),
+        text((1, 6.0, 11, 0.5), "Microsoft Azure Monitor Assets", 16, False, "64B5F6", "center"),
+    ]
+    if customer:
+        customer_line = text((1, 6.6, 11, 0.5), "Prepared for {customer}", 14, False, "BBDEFB", "center")
+        customer_line["fields"] = {"customer": customer}
+        shapes.append(customer_line)
+    return slide("Title", shapes)
+
+
+# ============================================================
+# SLIDE 2: Agenda
+# ============================================================
+def _agenda_slide():
+    items = [
+        "1.  Challenge & Business Problem",
+        "2.  Solution Overview",
+        "3.  Architecture Deep Dive",
+        "4.  Data Pipeline: Logs Ingestion API",
+        "5.  Workbook Dashboard (4 Tabs)",
+        "6.  Security & Authentication",
+        "7.  Deployment Options",
+        "8.  Demo & Next Steps"
+    ]
+    return slide("Agenda", header("Agenda") + [
+        bullets((1.5, 1.8, 10, 5), items, 22, "DARK_GRAY"),
+    ], background="WHITE")
+
+
+# ============================================================
+# SLIDE 3: The Challenge
+# ============================================================
+def _challenge_slide():
+    shapes = header("The Challenge") + [
+        text((0.8, 1.6, 12, 0.6), "Monitoring SQL Server instances across hybrid environments is complex:",
+             20, False, "DARK_GRAY"),
+    ]
+    challenges = [
+        ("Fragmented Visibility", "SQL Servers spread across on-prem,\nIaaS VMs, and Arc-enabled servers\nwith no unified view"),
+        ("Backup Compliance", "No centralized way to verify backup\nSLA compliance across all databases\nand instances"),
+        ("Manual Processes", "Teams rely on manual scripts or\nthird-party tools with complex\nlicensing and overhead"),
+        ("Reactive Alerting", "Issues discovered after impact;\nno proactive monitoring of\nuptime and backup status")
+    ]
+    for i, (title, desc) in enumerate(challenges):
+        x = 0.8 + i * 3.1
+        shapes += [
+            rounded((x, 2.6, 2.8, 3.5), "LIGHT_BLUE"),
+            text((x + 0.2, 2.8, 2.4, 0.6), title, 18, True, "DARK_BLUE", "center"),
+            text((x + 0.2, 3.5, 2.4, 2.2), desc, 14, False, "DARK_GRAY", "center"),
+        ]
+    return slide("The Challenge", shapes, background="WHITE")
+
+
+# ============================================================
+# SLIDE 4: Solution Overview
+# ============================================================
+def _overview_slide():
+    shapes = header("Solution Overview") + [
+        text((0.8, 1.6, 12, 0.5),
+             "A fully native Azure Monitor solution — no additional agents required on SQL Servers",
+             20, True, "AZURE_BLUE"),
+    ]
+    benefits = [
+        ("Agentless", "No software installed\non SQL Servers.\nOnly the Hybrid Worker\nneeds an extension.", "GREEN"),
+        ("Custom Schema", "Clean 20-column table\nin Log Analytics.\nNo JSON parsing needed\nin KQL queries.", "AZURE_BLUE"),
+        ("Secure by Design", "Managed Identity auth.\nKey Vault for credentials.\nNo passwords in code.", "DARK_BLUE"),
+        ("Pre-built Dashboard", "4-tab Azure Monitor\nWorkbook: Summary,\nInstances, Databases,\nBackups.", "ORANGE"),
+    ]
+    for i, (title, desc, color) in enumerate(benefits):
+        x = 0.8 + i * 3.1
+        shapes += [
+            rounded((x, 2.5, 2.8, 0.6), color, title, 16, "WHITE"),
+            text((x + 0.2, 3.3, 2.4, 2.5), desc, 14, False, "DARK_GRAY", "center"),
+        ]
+    # Key metrics collected
+    shapes += [
+        text((0.8, 5.5, 12, 0.4), "Metrics Collected:", 16, True, "DARK_BLUE"),
+        text((0.8, 5.9, 12, 1),
+             "Instance Uptime  •  Database State & Recovery Model  •  Full/Log Backup Status  •  Backup SLA Compliance  •  Connection Errors",
+             15, False, "MEDIUM_GRAY"),
+    ]
+    return slide("Solution Overview", shapes, background="WHITE")
+
+
+# ============================================================
+# SLIDE 5: Architecture
+# ============================================================
+def _architecture_slide():
+    # Drawn from the drawio diagram itself, so the slide can't drift from it
+    from drawio_import import diagram_shapes, find_page, load_diagram
+    page = find_page(load_diagram(ARCHITECTURE_DIAGRAM))
+    shapes = header("Architecture") + diagram_shapes(page, (0.4, 1.35, 12.533, 6.0), fit="content", exclude=("title",))
+    return slide("Architecture", shapes, background="WHITE")
+
+
+# ============================================================
+# SLIDE 6: Data Pipeline
+# ============================================================
+def _pipeline_slide():
+    shapes = header("Data Pipeline — Logs Ingestion API") + [
+        text((0.8, 1.6, 12, 0.5), "Direct ingestion into Log Analytics using Azure Monitor's native REST API",
+             20, False, "AZURE_BLUE"),
+    ]
+    steps = [
+        ("1. Collect", "Runbook queries SQL\nServers using T-SQL\n(sys.dm_os_sys_info,\nsys.databases,\nmsdb.dbo.backupset)", "AZURE_BLUE"),
+        ("2. Transform", "PowerShell converts\nresults to JSON records\nwith 20 typed columns\n(one record per database)", "43A047"),
+        ("3. Authenticate", "Managed Identity\nobtains OAuth2 token\nfor monitor.azure.com\n(no stored credentials)", "E65100"),
+        ("4. Ingest", "HTTPS POST to DCE\nLogs Ingestion API\nwith JSON payload\n(batched per collection)", "6A1B9A"),
+        ("5. Route", "DCR validates schema,\napplies transformKql,\nroutes to destination\ntable in Log Analytics", "2E7D32"),
+    ]
+    for i, (title, desc, color) in enumerate(steps):
+        x = 0.5 + i * 2.5
+        shapes += [
+            rounded((x, 2.5, 2.2, 0.6), color, title, 14, "WHITE"),
+            text((x + 0.1, 3.3, 2.0, 2.5), desc, 13, False, "DARK_GRAY", "center"),
+        ]
+
+    # Table schema
+    schema_text = ("TimeGenerated  •  CollectorName  •  SqlInstance  •  ServerName  •  SqlVersion  •  InstanceStartTime\n"
+                   "InstanceUptimeSeconds/Minutes/Hours/Days  •  DatabaseName  •  DatabaseState  •  RecoveryModel\n"
+                   "DatabaseCreateDate  •  LastFullBackupTime  •  HoursSinceFullBackup  •  LastFullBackupStatus\n"
+                   "FullBackupAlertStatus  •  LastLogBackupTime  •  MinutesSinceLogBackup")
+    shapes += [
+        text((0.8, 5.5, 12, 0.4), "Custom Table: SQLServerMonitoring_CL (20 columns)", 16, True, "DARK_BLUE"),
+        text((0.8, 5.9, 12, 1.5), schema_text, 12, False, "MEDIUM_GRAY"),
+    ]
+    return slide("Data Pipeline", shapes, background="WHITE")
+
+
+# ============================================================
+# SLIDE 7: Workbook Dashboard
+# ============================================================
+def _workbook_slide():
+    shapes = header("Workbook Dashboard — 4 Tabs")
+    tabs = [
+        ("📊 Summary", [
+            "4 KPI tiles: Instances, Databases,\nBackup Alerts, Compliance %",
+            "Pie charts: Backup status distribution\nand Recovery model breakdown",
+            "Instance uptime table with\nheat-map coloring"
+        ], "AZURE_BLUE"),
+        ("🖥️ Instances", [
+            "Grid with online/offline status,\nSQL version, database count",
+            "Uptime display in days/hours\nwith last-seen timestamp",
+            "Line chart: uptime trend\nover time per instance"
+        ], "43A047"),
+        ("🗄️ Databases", [
+            "Detailed grid with state,\nrecovery model, backup status",
+            "Color-coded: ONLINE=green,\nFULL=blue, SIMPLE=orange",
+            "Bar chart: database count\nper SQL instance"
+        ], "E65100"),
+        ("💾 Backups", [
+            "Compliance table per instance\n(compliant, warning, critical)",
+            "Alert grid: databases needing\nattention (sorted by severity)",
+            "Log backup monitoring for\nFULL recovery model DBs"
+        ], "6A1B9A"),
+    ]
+    for i, (tab_name, features, color) in enumerate(tabs):
+        x = 0.5 + i * 3.15
+        shapes.append(rounded((x, 1.6, 2.9, 0.6), color, tab_name, 16, "WHITE"))
+        for j, feature in enumerate(features):
+            shapes.append(text((x + 0.15, 2.4 + j * 1.4, 2.6, 1.3), feature, 12, False, "DARK_GRAY"))
+
+    # Parameters
+    shapes.append(text((0.8, 6.3, 12, 0.3),
+                       "Interactive Parameters:  Subscription  •  Workspace  •  Time Range  •  SQL Instance (multi-select)  •  Database (multi-select)",
+                       14, True, "DARK_BLUE"))
+    return slide("Workbook Dashboard", shapes, background="WHITE")
+
+
+# ============================================================
+# SLIDE 8: Workbook in the Portal
+# ============================================================
+def _workbook_screenshot_slide():
+    notes = [
+        "Opens from Azure Monitor → Workbooks,\nno extra hosting or licensing",
+        "Parameters across the top drive\nevery tile, chart and grid",
+        "Tabs, KPI tiles and drill-down grids\nfollow the same layout in the\nSQL Server workbook",
+        "Queries run live against the\nLog Analytics workspace",
+    ]
+    shapes = header("Workbook in the Azure Portal") + [
+        picture((0.6, 1.45, 7.4, 5.35), WORKBOOK_SCREENSHOT),
+        text((0.6, 6.85, 7.4, 0.4), "Example: the Windows Services workbook from this repository",
+             11, False, "MEDIUM_GRAY", "center"),
+    ]
+    for i, note in enumerate(notes):
+        shapes.append(rect((8.5, 1.6 + i * 1.35, 0.08, 1.1), "AZURE_BLUE"))
+        shapes.append(text((8.75, 1.6 + i * 1.35, 4.2, 1.1), note, 15, False, "DARK_GRAY"))
+    return slide("Workbook Screenshot", shapes, background="WHITE")
+
+
+# ============================================================
+# SLIDE 9: Security
+# ============================================================
+def _security_slide():
+    azure_auth = [
+        "• System-assigned MI on Automation Account",
+        "• Arc VM MI for IMDS token (Hybrid Worker)",
+        "• OAuth2 tokens for Azure Monitor & Key Vault",
+        "• RBAC: Monitoring Metrics Publisher on DCR",
+        "• RBAC: Key Vault Secrets User (SQL Auth only)",
+        "• No credentials stored in runbook code"
+    ]
+    win_auth_desc = ("Best for domain-joined environments.\nHybrid Worker service account authenticates\nvia Kerberos/NTLM. No password management.\n"
+                     "Requirements: Domain trust, SQL login for machine account.")
+    sql_auth_desc = ("Best for non-domain or mixed environments.\nCredentials stored securely in Azure Key Vault.\nManaged Identity retrieves secrets at runtime.\n"
+                     "Requirements: Key Vault with SQL login secrets.")
+    shapes = header("Security & Authentication") + [
+        # Two authentication options
+        text((0.8, 1.6, 5.5, 0.5), "Azure Authentication (Managed Identity)", 20, True, "AZURE_BLUE"),
+        bullets((0.8, 2.2, 5.5, 3), azure_auth, 15, "DARK_GRAY"),
+        text((7, 1.6, 5.5, 0.5), "SQL Server Authentication Options", 20, True, "AZURE_BLUE"),
+
+        # Windows Auth box
+        rounded((7, 2.3, 5.5, 1.8), "LIGHT_BLUE"),
+        text((7.2, 2.4, 5.1, 0.4), "Option A: Windows Authentication", 16, True, "DARK_BLUE"),
+        text((7.2, 2.8, 5.1, 1.2), win_auth_desc, 13, False, "DARK_GRAY"),
+
+        # SQL Auth box
+        rounded((7, 4.3, 5.5, 1.8), "FFF3E0"),
+        text((7.2, 4.4, 5.1, 0.4), "Option B: SQL Authentication + Key Vault", 16, True, "E65100"),
+        text((7.2, 4.8, 5.1, 1.2), sql_auth_desc, 13, False, "DARK_GRAY"),
+
+        # SQL permissions
+        text((0.8, 5.5, 12, 0.4), "Required SQL Server Permissions:", 16, True, "DARK_BLUE"),
+        text((0.8, 5.9, 12, 0.8),
+             "VIEW SERVER STATE  •  VIEW ANY DATABASE  •  db_datareader on msdb (for backup history)",
+             14, False, "MEDIUM_GRAY"),
+    ]
+    return slide("Security", shapes, background="WHITE")
+
+
+# ============================================================
+# SLIDE 10: Deployment Options
+# ============================================================
+def _deployment_slide():
+    shapes = header("Deployment — Easy as 1-2-3") + [
+        text((0.8, 1.6, 12, 0.5), "Three ARM templates — deployable from the Azure Portal (no CLI required)",
+             20, False, "AZURE_BLUE"),
+    ]
+    templates = [
+        ("Step 1\nInfrastructure", "arm-template-infrastructure.json", [
+            "Automation Account (System MI)",
+            "Log Analytics Workspace",
+            "Custom Table (20 columns)",
+            "Key Vault (optional)"
+        ], "AZURE_BLUE"),
+        ("Step 2\nData Collection", "arm-template-data-collection.json", [
+            "Data Collection Endpoint (DCE)",
+            "Data Collection Rule (DCR)",
+            "Stream declarations",
+            "Transform KQL config"
+        ], "43A047"),
+        ("Step 3\nWorkbook", "arm-template-workbook.json", [
+            "Azure Monitor Workbook",
+            "4 interactive tabs",
+            "Pre-configured KQL queries",
+            "Color-coded visualizations"
+        ], "6A1B9A"),
+    ]
+    for i, (title, filename, items, color) in enumerate(templates):
+        x = 0.8 + i * 4
+        shapes += [
+            rounded((x, 2.3, 3.5, 0.9), color, title, 15, "WHITE"),
+            text((x + 0.1, 3.3, 3.3, 0.3), filename, 11, False, "MEDIUM_GRAY", "center"),
+        ]
+        for j, item in enumerate(items):
+            shapes.append(text((x + 0.2, 3.7 + j * 0.4, 3.1, 0.4), f"✓  {item}", 13, False, "DARK_GRAY"))
+
+    # Manual steps
+    manual = [
+        "→  Configure RBAC (assign Monitoring Metrics Publisher role to Automation Account MI on DCR)",
+        "→  Set up Hybrid Worker Group (add Arc-enabled server to Automation Account)",
+        "→  Import & publish the runbook script (paste into Automation Account runbook editor)",
+        "→  Create schedule and link to runbook with parameters (SQL instances, DCE endpoint, DCR ID)"
+    ]
+    shapes += [
+        text((0.8, 5.5, 12, 0.4), "Manual Steps (Portal-guided):", 16, True, "DARK_BLUE"),
+        bullets((0.8, 5.9, 12, 1.5), manual, 13, "DARK_GRAY"),
+    ]
+    return slide("Deployment", shapes, background="WHITE")
+
+
+# ============================================================
+# SLIDE 11: Next Steps
+# ============================================================
+def _next_steps_slide():
+    next_steps = [
+        "1.  Review the Lab Deployment Guide (LabGuide-SQLServerMonitoring.md)",
+        "2.  Deploy ARM templates to your subscription (Portal or script)",
+        "3.  Configure Hybrid Worker on an Arc-enabled server or Azure VM",
+        "4.  Import the runbook and create a monitoring schedule",
+        "5.  Validate data in the workbook dashboard",
+        "6.  Set up alert rules for backup SLA violations",
+        "7.  Scale: add more SQL instances to the collection parameters"
+    ]
+    return slide("Next Steps", [
+        rect((0, 0, SLIDE_WIDTH, SLIDE_HEIGHT), "DARK_BLUE"),
+        rect((0, 5.5, SLIDE_WIDTH, 0.08), "AZURE_BLUE"),
+        text((1, 0.8, 11, 0.8), "Next Steps", 40, True, "WHITE", "center"),
+        bullets((2, 2.0, 9, 3.5), next_steps, 20, "BBDEFB"),
+        text((1, 5.8, 11, 0.6),
+             "All materials provided:  Presentation  •  Architecture Diagram  •  Lab Guide  •  ARM Templates  •  Deployment Script  •  Runbook",
+             16, False, "90CAF9", "center"),
+        text((1, 6.5, 11, 0.5), "Thank You", 28, True, "WHITE", "center"),
+    ])
+
+
+def build_slides(customer=None):
+    """Return the full deck as a list of slide specs."""
+    return [
+        _title_slide(customer),
+        _agenda_slide(),
+        _challenge_slide(),
+        _overview_slide(),
+        _architecture_slide(),
+        _pipeline_slide(),
+        _workbook_slide(),
+        _workbook_screenshot_slide(),
+        _security_slide(),
+        _deployment_slide(),
+        _next_steps_slide(),
+    ]
+
+
+def deck_slides(export_paths=None, since=None, lab_guide=None, store=None):
+    """The static deck, with report slides from any exports inserted before the closing slide.
+
+    store, a record_store directory, is read instead of parsing exports; only
+    rows at or after since are read from it. lab_guide, a path to the lab guide
+    markdown, is appended after the closing slide as an appendix.
+    """
+    slides = build_slides()
+    if export_paths or store:
+        from sql_export import read_exports, records_since
+        from sql_aggregate import aggregate_records
+        from report_spec import report_slides, summary_slides
+        if store:
+            from record_store import RecordStore
+            records = RecordStore(store).records(start=since)
+        else:
+            records = records_since(read_exports(export_paths), since)
+        aggregate = aggregate_records(records)
+        report = list(summary_slides(aggregate)) + list(report_slides(aggregate))
+        slides = slides[:-1] + report + slides[-1:]
+    if lab_guide:
+        from labguide_spec import appendix_slides
+        slides += appendix_slides(lab_guide)
+    return slides
+
+
+def localize_slides(slides, strings):
+    """Return a copy of slides with every text translated through strings.
+
+    Texts missing from the table stay in English. Shapes carrying "fields"
+    are formatted after translation (e.g. the customer name on the title slide).
+    """
+    localized = copy.deepcopy(slides)
+    for spec in localized:
+        for shape in spec["shapes"]:
+            if shape.get("text"):
+                shape["text"] = strings.get(shape["text"], shape["text"])
+            if "items" in shape:
+                shape["items"] = [strings.get(item, item) for item in shape["items"]]
+            if shape["kind"] == "chart":
+                shape["title"] = strings.get(shape["title"], shape["title"])
+                shape["categories"] = [strings.get(c, c) for c in shape["categories"]]
+            if "rows" in shape:
+                shape["rows"][0] = [strings.get(cell, cell) for cell in shape["rows"][0]]
+            fields = shape.pop("fields", None)
+            if fields:
+                shape["text"] = shape["text"].format(**fields)
+    return localized
+
+
+# ============================================================
+# Validation
+# ============================================================
+# Keys each shape kind must carry, and the names generate_pptx.py can render
+SHAPE_FIELDS = {
+    "shape_bg": ("box", "color"),
+    "text_box": ("box", "text", "size", "bold", "color", "align"),
+    "bullet_list": ("box", "items", "size", "color"),
+    "rounded_rect": ("box", "color", "text", "size", "font_color"),
+    "autoshape": ("shape", "box", "fill", "line", "text", "size", "bold", "font_color", "align", "anchor", "wrap"),
+    "connector": ("points", "color", "width", "dashed", "arrow"),
+    "table": ("box", "rows", "size", "header_color"),
+    "chart": ("chart", "box", "categories", "values", "title", "size"),
+    "picture": ("box", "image"),
+}
+AUTOSHAPE_NAMES = ("rect", "rounded", "ellipse", "diamond", "hexagon", "cylinder", "note")
+ALIGN_NAMES = ("left", "center", "right")
+ANCHOR_NAMES = ("top", "middle", "bottom")
+CHART_TYPES = ("pie", "bar")
+COLOR_KEYS = ("color", "font_color", "header_color", "fill")
+
+_EDGE_TOLERANCE = 0.01
+
+
+def _is_color(value, palette):
+    if value in palette:
+        return True
+    return isinstance(value, str) and len(value) == 6 and all(c in "0123456789abcdefABCDEF" for c in value)
+
+
+def _off_slide(x, y):
+    return (x < -_EDGE_TOLERANCE or y < -_EDGE_TOLERANCE
+            or x > SLIDE_WIDTH + _EDGE_TOLERANCE or y > SLIDE_HEIGHT + _EDGE_TOLERANCE)
+
+
+def _shape_problems(shape, palette):
+    kind = shape.get("kind")
+    if kind not in SHAPE_FIELDS:
+        yield f"unknown kind {kind!r}"
+        return
+    missing = [key for key in SHAPE_FIELDS[kind] if key not in shape]
+    if missing:
+        yield "missing " + ", ".join(missing)
+        return
+    if "box" in shape:
+        box = shape["box"]
+        if len(box) != 4:
+            yield f"box {box!r} is not (left, top, width, height)"
+        else:
+            left, top, width, height = box
+            if width < 0 or height < 0:
+                yield f"box {box!r} has a negative size"
+            elif _off_slide(left, top) or _off_slide(left + width, top + height):
+                yield f"box {box!r} extends past the {SLIDE_WIDTH} x {SLIDE_HEIGHT} in slide"
+    for key in COLOR_KEYS:
+        if shape.get(key) is not None and not _is_color(shape[key], palette):
+            yield f"{key} {shape[key]!r} is neither a palette key nor RRGGBB"
+    if shape.get("line") and not _is_color(shape["line"]["color"], palette):
+        yield f"line color {shape['line']['color']!r} is neither a palette key nor RRGGBB"
+    if "align" in shape and shape["align"] not in ALIGN_NAMES:
+        yield f"align {shape['align']!r} is not one of {', '.join(ALIGN_NAMES)}"
+    if kind == "autoshape":
+        if shape["shape"] not in AUTOSHAPE_NAMES:
+            yield f"shape {shape['shape']!r} is not one of {', '.join(AUTOSHAPE_NAMES)}"
+        if shape["anchor"] not in ANCHOR_NAMES:
+            yield f"anchor {shape['anchor']!r} is not one of {', '.join(ANCHOR_NAMES)}"
+    elif kind == "connector":
+        if len(shape["points"]) < 2:
+            yield "connector needs at least two points"
+        if any(_off_slide(x, y) for x, y in shape["points"]):
+            yield "connector leaves the slide"
+    elif kind == "table":
+        rows = shape["rows"]
+        if not rows or not rows[0]:
+            yield "table has no cells"
+        elif any(len(row) != len(rows[0]) for row in rows):
+            yield "table rows differ in length"
+        elif shape.get("col_widths") and len(shape["col_widths"]) != len(rows[0]):
+            yield f"{len(shape['col_widths'])} column widths for {len(rows[0])} columns"
+    elif kind == "picture":
+        if not os.path.isfile(shape["image"]):
+            yield f"image {shape['image']!r} not found"
+    elif kind == "chart":
+        if shape["chart"] not in CHART_TYPES:
+            yield f"chart type {shape['chart']!r} is not one of {', '.join(CHART_TYPES)}"
+        if len(shape["values"]) != len(shape["categories"]):
+            yield f"{len(shape['values'])} values for {len(shape['categories'])} categories"
+        if shape.get("colors"):
+            if len(shape["colors"]) != len(shape["categories"]):
+                yield f"{len(shape['colors'])} colors for {len(shape['categories'])} categories"
+            for color in shape["colors"]:
+                if not _is_color(color, palette):
+                    yield f"chart color {color!r} is neither a palette key nor RRGGBB"
+
+
+def validate_slides(slides, palette=PALETTE, numbers=None):
+    """Return a list of problems that would make generate_pptx.py fail or draw off the slide.
+
+    numbers, if given, are the 1-based deck positions of slides (for a selection).
+    """
+    problems = []
+    for number, spec in zip(numbers or range(1, len(slides) + 1), slides):
+        where = f"slide {number} ({spec.get('name', '?')})"
+        if not spec.get("name"):
+            problems.append(f"{where}: no name")
+        if spec.get("background") and not _is_color(spec["background"], palette):
+            problems.append(f"{where}: background {spec['background']!r} is neither a palette key nor RRGGBB")
+        for index, shape in enumerate(spec.get("shapes", ()), 1):
+            problems.extend(f"{where}, shape {index} ({shape.get('kind', '?')}): {problem}"
+                            for problem in _shape_problems(shape, palette))
+    return problems
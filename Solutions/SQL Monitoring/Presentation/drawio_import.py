@@ -0,0 +1,613 @@
+"""
+Import draw.io (diagrams.net) diagrams as slide specs.
+
+The .drawio file is read with iterparse, one mxCell at a time, keeping only the
+parsed style, the label text and the mxGeometry of each cell; elements are
+cleared as soon as they are consumed, so large multi-page files never sit in
+memory as a full tree. Compressed pages (the deflate+base64 form draw.io uses
+by default) are inflated and parsed the same way.
+
+Parsed pages are plain data and are cached by the SHA-256 of the file, in
+memory and as JSON in .slide-cache/, so a diagram is only parsed again when it
+changes. diagram_shapes() maps a page onto a box on the slide (by default the
+whole 13.333 x 7.5in slide) and emits deck_spec shapes: vertices become
+autoshapes and edges become connectors. A page shrunk onto a slide has all of
+its text scaled up together, keeping the diagram's relative sizes, until the
+smallest label is min_font points (MIN_FONT_SIZE by default). Labels that no
+longer fit their box are set smaller (down to min_font) and, if still too big,
+get a box sized to the text; shapes below a grown label are moved down to make
+room, and fit="content" takes the grown boxes into account.
+"""
+import base64
+import hashlib
+import html
+import io
+import json
+import math
+import os
+import re
+import tempfile
+import urllib.parse
+import xml.etree.ElementTree as ET
+import zlib
+
+from deck_spec import SLIDE_HEIGHT, SLIDE_WIDTH, autoshape, connector
+
+# Bump whenever the parsed page format changes, to invalidate cached layouts
+PARSER_VERSION = 1
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(SCRIPT_DIR, ".slide-cache")
+
+# draw.io defaults for attributes a cell's style leaves out
+DEFAULT_FONT_SIZE = 12
+DEFAULT_PAGE = (850, 1100)
+# Smallest label on the slide, in points
+MIN_FONT_SIZE = 9
+# Label measurements on the slide: line height and average character width as a
+# fraction of the font size, and generate_pptx's autoshape text inset (inches per side)
+LINE_HEIGHT = 1.2
+CHAR_WIDTH = 0.5
+TEXT_MARGIN = 0.03
+# Space kept (inches) between a grown label and a shape it pushes down
+LABEL_CLEARANCE = 0.05
+# Layout passes to let grown labels, moved shapes and the content fit settle
+FIT_PASSES = 6
+
+# draw.io shape names -> autoshape names understood by generate_pptx
+SHAPES = {
+    "ellipse": "ellipse",
+    "doubleEllipse": "ellipse",
+    "rhombus": "diamond",
+    "hexagon": "hexagon",
+    "cylinder": "cylinder",
+    "cylinder3": "cylinder",
+    "note": "note",
+    "image": "image",
+}
+
+_BREAK_TAGS = re.compile(r"<br\s*/?>|</div>|</p>|</li>", re.IGNORECASE)
+_TAGS = re.compile(r"<[^>]+>")
+
+
+# ============================================================
+# Parsing
+# ============================================================
+def parse_style(style):
+    """Split "ellipse;fillColor=#fff;dashed=1;" into a dict; a bare leading token is the shape name."""
+    parsed = {}
+    for i, part in enumerate((style or "").split(";")):
+        if not part:
+            continue
+        key, sep, value = part.partition("=")
+        if sep:
+            parsed[key] = value
+        elif i == 0:
+            parsed["shape"] = key
+        else:
+            parsed[key] = "1"
+    return parsed
+
+
+def label_text(value, is_html):
+    """Plain text of a cell label; HTML labels keep their line breaks and lose their markup."""
+    if not value:
+        return ""
+    if is_html:
+        value = html.unescape(_TAGS.sub("", _BREAK_TAGS.sub("\n", value)))
+    return "\n".join(line.strip() for line in value.replace("\xa0", " ").splitlines()).strip()
+
+
+def _geometry(element):
+    geometry = {
+        "x": float(element.get("x", 0)),
+        "y": float(element.get("y", 0)),
+        "width": float(element.get("width", 0)),
+        "height": float(element.get("height", 0)),
+        "relative": element.get("relative") == "1",
+        "points": [],
+        "offset": [0.0, 0.0],
+    }
+    for child in element:
+        if child.tag == "mxPoint" and child.get("as") in ("offset", "sourcePoint", "targetPoint"):
+            geometry[child.get("as")] = [float(child.get("x", 0)), float(child.get("y", 0))]
+        elif child.tag == "Array" and child.get("as") == "points":
+            geometry["points"] = [[float(p.get("x", 0)), float(p.get("y", 0))] for p in child]
+    return geometry
+
+
+def _cell(element):
+    style = parse_style(element.get("style"))
+    geometry = next((_geometry(child) for child in element if child.tag == "mxGeometry"), None)
+    return {
+        "id": element.get("id"),
+        "parent": element.get("parent"),
+        "vertex": element.get("vertex") == "1",
+        "edge": element.get("edge") == "1",
+        "source": element.get("source"),
+        "target": element.get("target"),
+        "visible": element.get("visible", "1") != "0",
+        "style": style,
+        "text": label_text(element.get("value", ""), style.get("html") == "1"),
+        "geometry": geometry,
+    }
+
+
+def _new_page(name):
+    return {"name": name, "width": float(DEFAULT_PAGE[0]), "height": float(DEFAULT_PAGE[1]), "cells": []}
+
+
+def _inflate(text):
+    # draw.io's compressed form: base64( raw deflate( encodeURIComponent(xml) ) )
+    return urllib.parse.unquote(zlib.decompress(base64.b64decode(text), -15).decode("utf-8"))
+
+
+def _read_pages(source, pages, page=None):
+    """Stream the diagrams in source (a path or file object) into pages, clearing each element once read."""
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        tag = element.tag
+        if event == "start":
+            if tag == "diagram":
+                page = _new_page(element.get("name") or f"Page-{len(pages) + 1}")
+                pages.append(page)
+            elif tag == "mxGraphModel":
+                if page is None:  # a bare mxGraphModel file
+                    page = _new_page("Page-1")
+                    pages.append(page)
+                page["width"] = float(element.get("pageWidth", DEFAULT_PAGE[0]))
+                page["height"] = float(element.get("pageHeight", DEFAULT_PAGE[1]))
+        elif tag == "mxCell":
+            page["cells"].append(_cell(element))
+            element.clear()
+        elif tag in ("UserObject", "object"):
+            # <UserObject label=... id=...><mxCell .../></UserObject>: id and label live on the wrapper
+            cell = page["cells"][-1]
+            cell["id"] = element.get("id")
+            cell["text"] = label_text(element.get("label", ""), cell["style"].get("html") == "1")
+            element.clear()
+        elif tag == "diagram":
+            if not page["cells"] and (element.text or "").strip():
+                _read_pages(io.BytesIO(_inflate(element.text.strip()).encode("utf-8")), [], page)
+            element.clear()
+            page = None
+    return pages
+
+
+def parse_drawio(path):
+    """Parse every page of a .drawio file into [{"name", "width", "height", "cells"}]."""
+    return _read_pages(path, [])
+
+
+# ============================================================
+# Layout cache
+# ============================================================
+# Parsed pages by file digest, shared by every deck built in this process
+_layouts = {}
+
+
+def file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha256(f"drawio-{PARSER_VERSION}:".encode("ascii"))
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_diagram(path, cache_dir=CACHE_DIR):
+    """Parsed pages of path, re-parsed only when the file's content hash changes."""
+    digest = file_digest(path)
+    pages = _layouts.get(digest)
+    if pages is not None:
+        return pages
+    cache_path = os.path.join(cache_dir, f"drawio-{digest}.json") if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, encoding="utf-8") as f:
+            pages = json.load(f)
+    else:
+        pages = parse_drawio(path)
+        if cache_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(pages, f)
+            os.replace(tmp_path, cache_path)
+    _layouts[digest] = pages
+    return pages
+
+
+def find_page(pages, page=0):
+    """A page by index or by name."""
+    if isinstance(page, int):
+        return pages[page]
+    for candidate in pages:
+        if candidate["name"] == page:
+            return candidate
+    raise KeyError(f"No page named {page!r}")
+
+
+# ============================================================
+# Page -> slide shapes
+# ============================================================
+# Edge styles whose segments are horizontal and vertical only
+ORTHOGONAL_STYLES = {"orthogonalEdgeStyle", "elbowEdgeStyle", "entityRelationEdgeStyle"}
+
+
+def _color(style, key, default):
+    value = style.get(key, default)
+    if value is None or value == "none" or not value.startswith("#"):
+        return None if value in (None, "none") else default
+    return value[1:].upper()
+
+
+def _center(box):
+    x, y, w, h = box
+    return (x + w / 2, y + h / 2)
+
+
+def _font_px(cell):
+    return float(cell["style"].get("fontSize", DEFAULT_FONT_SIZE))
+
+
+def _text_extent(text, font_px):
+    lines = text.split("\n")
+    return max(len(line) for line in lines) * font_px * 0.6, len(lines) * font_px * 1.3
+
+
+class _PageLayout:
+    """Absolute pixel geometry of a page's vertices, edges and labels."""
+
+    def __init__(self, page):
+        self.cells = {cell["id"]: cell for cell in page["cells"]}
+        # Vertical moves (page pixels) made to clear grown labels, by cell id
+        self.shifts = {}
+        self._boxes = {}
+        self._routes = {}
+
+    def is_edge_label(self, cell):
+        parent = self.cells.get(cell["parent"])
+        return parent is not None and parent["edge"]
+
+    def shift(self, cell_id, dy):
+        """Move a vertex (and its children and attached edges) down by dy."""
+        self.shifts[cell_id] = self.shifts.get(cell_id, 0) + dy
+        self._boxes.clear()
+        self._routes.clear()
+
+    def is_top_level(self, cell):
+        return self.box(cell["parent"]) is None
+
+    def box(self, cell_id):
+        """(x, y, w, h) of a vertex; children of vertices (groups, containers) are offset by their parents."""
+        if cell_id in self._boxes:
+            return self._boxes[cell_id]
+        cell = self.cells.get(cell_id)
+        box = None
+        if cell is not None and cell["vertex"] and cell["geometry"]:
+            g = cell["geometry"]
+            x, y = g["x"], g["y"]
+            parent_box = self.box(cell["parent"])
+            if parent_box is not None:
+                x, y = x + parent_box[0], y + parent_box[1]
+            box = (x, y + self.shifts.get(cell_id, 0), g["width"], g["height"])
+        self._boxes[cell_id] = box
+        return box
+
+    def label_box(self, cell, box):
+        """Where a vertex label goes: inside the shape, or below / above it for icon-style labels."""
+        position = cell["style"].get("verticalLabelPosition")
+        if position not in ("top", "bottom") or not cell["text"]:
+            return box
+        width, height = _text_extent(cell["text"], _font_px(cell))
+        width = max(width, box[2])
+        top = box[1] + box[3] if position == "bottom" else box[1] - height
+        return (box[0] + box[2] / 2 - width / 2, top, width, height)
+
+    @staticmethod
+    def _port(box, style, prefix):
+        if box is None or f"{prefix}X" not in style:
+            return None
+        return (box[0] + float(style[f"{prefix}X"]) * box[2] + float(style.get(f"{prefix}Dx", 0)),
+                box[1] + float(style[f"{prefix}Y"]) * box[3] + float(style.get(f"{prefix}Dy", 0)))
+
+    @staticmethod
+    def _side(box, toward):
+        """Midpoint of the side of box facing the point toward."""
+        cx, cy = _center(box)
+        dx, dy = toward[0] - cx, toward[1] - cy
+        if abs(dx) * box[3] >= abs(dy) * box[2]:
+            return (box[0] + box[2], cy) if dx > 0 else (box[0], cy)
+        return (cx, box[1] + box[3]) if dy > 0 else (cx, box[1])
+
+    def route(self, edge):
+        """Polyline of an edge in page pixels, from its source port through its waypoints to its target."""
+        if edge["id"] in self._routes:
+            return self._routes[edge["id"]]
+        g = edge["geometry"] or {}
+        style = edge["style"]
+        waypoints = [tuple(p) for p in g.get("points", [])]
+        source, target = self.box(edge["source"]), self.box(edge["target"])
+        source_ref = _center(source) if source else tuple(g.get("sourcePoint", (0, 0)))
+        target_ref = _center(target) if target else tuple(g.get("targetPoint", (0, 0)))
+
+        begin = self._port(source, style, "exit")
+        if begin is None:
+            begin = self._side(source, waypoints[0] if waypoints else target_ref) if source else source_ref
+        end = self._port(target, style, "entry")
+        if end is None:
+            end = self._side(target, waypoints[-1] if waypoints else begin) if target else target_ref
+
+        points = [begin] + waypoints + [end]
+        if style.get("edgeStyle") in ORTHOGONAL_STYLES:
+            points = self._orthogonal(points, source)
+        self._routes[edge["id"]] = points
+        return points
+
+    @staticmethod
+    def _orthogonal(points, source):
+        if len(points) == 2 and source is not None:
+            (bx, by), (ex, ey) = points
+            if bx in (source[0], source[0] + source[2]):  # leaves a vertical side: horizontal first
+                points = [(bx, by), ((bx + ex) / 2, by), ((bx + ex) / 2, ey), (ex, ey)]
+            else:
+                points = [(bx, by), (bx, (by + ey) / 2), (ex, (by + ey) / 2), (ex, ey)]
+        else:
+            routed = [points[0]]
+            for x, y in points[1:]:
+                px, py = routed[-1]
+                if px != x and py != y:
+                    routed.append((x, py))
+                routed.append((x, y))
+            points = routed
+        # Drop repeated points and the middle of straight runs
+        cleaned = [points[0]]
+        for point in points[1:]:
+            if point == cleaned[-1]:
+                continue
+            if len(cleaned) > 1:
+                (ax, ay), (bx, by) = cleaned[-2], cleaned[-1]
+                if (ax == bx == point[0]) or (ay == by == point[1]):
+                    cleaned[-1] = point
+                    continue
+            cleaned.append(point)
+        return cleaned
+
+    def edge_label_box(self, cell):
+        """Edge labels sit at geometry.x in [-1, 1] along their edge (0 is the middle), moved by the offset."""
+        points = self.route(self.cells[cell["parent"]])
+        g = cell["geometry"] or {}
+        lengths = [abs(bx - ax) + abs(by - ay) if ax == bx or ay == by else ((bx - ax) ** 2 + (by - ay) ** 2) ** 0.5
+                   for (ax, ay), (bx, by) in zip(points, points[1:])]
+        remaining = (g.get("x", 0) + 1) / 2 * sum(lengths)
+        x, y = points[0]
+        for (ax, ay), (bx, by), length in zip(points, points[1:], lengths):
+            if remaining <= length and length:
+                x, y = ax + (bx - ax) * remaining / length, ay + (by - ay) * remaining / length
+                break
+            remaining -= length
+            x, y = bx, by
+        dx, dy = g.get("offset", (0, 0))
+        width, height = _text_extent(cell["text"], _font_px(cell))
+        return (x + dx - width / 2, y + dy + g.get("y", 0) - height / 2, width, height)
+
+
+class _Transform:
+    """Uniform scale from page pixels into a box on the slide (inches), centered in it."""
+
+    def __init__(self, bounds, box):
+        bx, by, bw, bh = bounds
+        left, top, width, height = box
+        # A straight horizontal or vertical line is fitted along its length alone
+        scales = [size / extent for size, extent in ((width, bw), (height, bh)) if extent > 0]
+        if not scales:
+            raise ValueError(f"Can't fit a diagram area of {bw:g} x {bh:g} px onto the slide: it has no size")
+        self.scale = min(scales)
+        self.text_scale = 1.0
+        self.dx = left + (width - bw * self.scale) / 2 - bx * self.scale
+        self.dy = top + (height - bh * self.scale) / 2 - by * self.scale
+
+    def point(self, x, y):
+        return (round(self.dx + x * self.scale, 3), round(self.dy + y * self.scale, 3))
+
+    def box(self, box):
+        return self.point(box[0], box[1]) + (round(box[2] * self.scale, 3), round(box[3] * self.scale, 3))
+
+    def font(self, font_px):
+        # draw.io sizes fonts in page pixels; 72pt per slide inch
+        return round(font_px * self.scale * self.text_scale * 72 * 2) / 2
+
+
+def _label_extent(text, font, wrap_width, t):
+    """(width, height) in page pixels that text needs at font points, wrapped to wrap_width if given."""
+    em = font / 72 / t.scale
+    margin = 2 * TEXT_MARGIN / t.scale
+    widths = [len(line) * CHAR_WIDTH * em for line in text.split("\n")]
+    if wrap_width:
+        room = max(wrap_width - margin, em)
+        lines = sum(max(1, math.ceil(width / room)) for width in widths)
+        widest = min(max(widths), room)
+    else:
+        lines, widest = len(widths), max(widths)
+    return widest + margin, lines * LINE_HEIGHT * em + margin
+
+
+def _fit_label(cell, label_box, wrap, t, min_font):
+    """(font, box) for a label: its scaled font, reduced towards min_font until the text fits label_box,
+    and label_box grown around the label's alignment if it still doesn't."""
+    x, y, w, h = label_box
+    font = t.font(_font_px(cell))
+    floor = min(font, min_font)
+    while True:
+        need_w, need_h = _label_extent(cell["text"], font, w if wrap else None, t)
+        if (need_w <= w and need_h <= h) or font <= floor:
+            break
+        font -= 0.5
+    grow_w, grow_h = max(need_w - w, 0), max(need_h - h, 0)
+    align = {"left": 0, "right": 1}.get(cell["style"].get("align", "center"), 0.5)
+    anchor = {"top": 0, "bottom": 1}.get(cell["style"].get("verticalAlign", "middle"), 0.5)
+    return font, (x - grow_w * align, y - grow_h * anchor, w + grow_w, h + grow_h)
+
+
+def _fit_labels(items, t, min_font):
+    """Fitted (font, box) of every labelled vertex item, by cell id."""
+    fitted = {}
+    for item in items:
+        if item[0] != "vertex" or not item[1]["text"]:
+            continue
+        cell, box, label_box = item[1:]
+        if cell["style"].get("shape") == "image" and label_box == box:
+            continue  # drawn as an icon tile, without its label
+        # Labels keep the footprint they have in draw.io where they can, so they don't run into
+        # their neighbours
+        wrap = label_box == box and cell["style"].get("whiteSpace") == "wrap"
+        fitted[cell["id"]] = _fit_label(cell, label_box, wrap, t, min_font)
+    return fitted
+
+
+def _make_room(layout, items, fitted, t):
+    """Move top-level shapes under a label that grew downwards out of their way; True if any moved."""
+    clearance = LABEL_CLEARANCE / t.scale
+    vertices = [item for item in items if item[0] == "vertex" and not layout.is_edge_label(item[1])]
+    moved = False
+    for item in vertices:
+        cell, label_box = item[1], item[3]
+        if cell["id"] not in fitted:
+            continue
+        grown = fitted[cell["id"]][1]
+        bottom, grown_bottom = label_box[1] + label_box[3], grown[1] + grown[3]
+        if grown_bottom <= bottom + 0.5:
+            continue
+        for other in vertices:
+            other_cell, (ox, oy, ow, oh) = other[1], other[2]
+            contains = ox <= label_box[0] and oy <= label_box[1] and ox + ow >= label_box[0] + label_box[2]
+            if (other_cell is cell or not layout.is_top_level(other_cell) or contains or oy < bottom - 0.5
+                    or ox >= grown[0] + grown[2] or ox + ow <= grown[0] or oy >= grown_bottom + clearance):
+                continue
+            layout.shift(other_cell["id"], grown_bottom + clearance - oy)
+            moved = True
+    return moved
+
+
+def _content_bounds(items, fitted):
+    xs, ys = [], []
+    for item in items:
+        if item[0] == "edge":
+            xs += [x for x, _ in item[2]]
+            ys += [y for _, y in item[2]]
+        else:
+            boxes = [item[2], item[3]]
+            if item[1]["id"] in fitted:
+                boxes.append(fitted[item[1]["id"]][1])
+            for x, y, w, h in boxes:
+                xs += [x, x + w]
+                ys += [y, y + h]
+    if not xs:
+        return None
+    return (min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+
+
+def _same_box(a, b, tolerance=0.5):
+    return all(abs(p - q) < tolerance for p, q in zip(a, b))
+
+
+def _initials(name):
+    """Short tile text for an icon: its acronym word ("SQL Server" -> SQL) or initials ("Key Vaults" -> KV)."""
+    words = name.split()
+    acronym = next((word for word in words if len(word) > 1 and word.isupper()), None)
+    return acronym or "".join(word[0].upper() for word in words[:3])
+
+
+def _vertex_shapes(cell, box, label_box, t, fitted):
+    style = cell["style"]
+    shape = style.get("shape", "rect")
+    font, text_box = fitted.get(cell["id"], (t.font(_font_px(cell)), label_box))
+    label = dict(size=font, bold=bool(int(style.get("fontStyle", 0)) & 1),
+                 font_color=_color(style, "fontColor", "DARK_GRAY") or "DARK_GRAY",
+                 align=style.get("align", "center"), anchor=style.get("verticalAlign", "middle"),
+                 wrap=style.get("whiteSpace") == "wrap")
+    if shape == "image":
+        # Icon libraries aren't bundled, so icons become a tile marked with the image name's initials,
+        # sized to the tile; the cell's own label names it in full
+        tile = t.box(box)
+        icon = _initials(os.path.splitext(os.path.basename(style.get("image", "")))[0].replace("_", " "))
+        side = min(tile[2], tile[3]) * 72
+        size = round(min(side * 0.45, side / (max(len(icon), 1) * 0.75)) * 2) / 2
+        shapes = [autoshape(tile, "rounded", "AZURE_BLUE", None, icon, size, True, "WHITE")]
+    else:
+        preset = SHAPES.get(shape, "rounded" if style.get("rounded") == "1" else "rect")
+        text_only = shape in ("text", "edgeLabel")
+        fill = _color(style, "fillColor", None if text_only else "FFFFFF")
+        if shape == "edgeLabel" and fill is None:
+            fill = _color(style, "labelBackgroundColor", "FFFFFF")
+        stroke = _color(style, "strokeColor", None if text_only else "000000")
+        line = (stroke, float(style.get("strokeWidth", 1)), style.get("dashed") == "1") if stroke else None
+        if label_box == box:
+            # A shape grows with a label that outgrew it
+            return [autoshape(t.box(text_box), preset, fill, line, cell["text"], **label)]
+        shapes = [autoshape(t.box(box), preset, fill, line, "", **label)]
+    if label_box != box:
+        shapes.append(autoshape(t.box(text_box), "rect", None, None, cell["text"], **dict(label, wrap=False)))
+    return shapes
+
+
+def _edge_shape(cell, points, t):
+    style = cell["style"]
+    return connector([t.point(x, y) for x, y in points], _color(style, "strokeColor", "000000") or "000000",
+                     float(style.get("strokeWidth", 1)), style.get("dashed") == "1",
+                     style.get("endArrow", "classic") != "none")
+
+
+def _layout_items(layout, page, exclude):
+    """("edge", cell, points) and ("vertex", cell, box, label_box) for every cell drawn, in z-order."""
+    items = []
+    for cell in page["cells"]:
+        if not cell["visible"] or cell["id"] in exclude or not (cell["vertex"] or cell["edge"]):
+            continue
+        if cell["edge"]:
+            items.append(("edge", cell, layout.route(cell)))
+        elif layout.is_edge_label(cell):
+            if cell["text"]:
+                label_box = layout.edge_label_box(cell)
+                items.append(("vertex", cell, label_box, label_box))
+        elif layout.box(cell["id"]) is not None:
+            vertex_box = layout.box(cell["id"])
+            items.append(("vertex", cell, vertex_box, layout.label_box(cell, vertex_box)))
+    return items
+
+
+def diagram_shapes(page, box=(0, 0, SLIDE_WIDTH, SLIDE_HEIGHT), fit="page", exclude=(), min_font=MIN_FONT_SIZE):
+    """deck_spec shapes drawing page inside box, in the diagram's z-order.
+
+    fit="page" maps the whole drawio page (e.g. 1600x900) onto box; fit="content"
+    maps only the area the cells cover, which suits diagrams that leave part of
+    the page empty. Cells whose id is in exclude are skipped. When the smallest
+    label would come out under min_font points, every label is enlarged by the
+    same factor; see the module docstring for labels that then outgrow their box.
+    """
+    layout = _PageLayout(page)
+    fitted = {}
+    for attempt in range(FIT_PASSES):
+        items = _layout_items(layout, page, exclude)
+        if fit == "content":
+            bounds = _content_bounds(items, fitted)
+            if bounds is None:
+                raise ValueError(f"Page {page['name']!r} has nothing to draw: every cell is hidden or excluded")
+        else:
+            bounds = (0, 0, page["width"], page["height"])
+        t = _Transform(bounds, box)
+        smallest = min((_font_px(item[1]) for item in items if item[0] == "vertex" and item[1]["text"]),
+                       default=None)
+        if smallest and smallest * t.scale * 72 < min_font:
+            t.text_scale = min_font / (smallest * t.scale * 72)
+        previous, fitted = fitted, _fit_labels(items, t, min_font)
+        # The last pass only measures, so the shapes drawn match the layout the labels were fitted to
+        moved = attempt < FIT_PASSES - 1 and _make_room(layout, items, fitted, t)
+        if not moved and (fit != "content" or _same_box(_content_bounds(items, fitted),
+                                                        _content_bounds(items, previous))):
+            break
+
+    shapes = []
+    for item in items:
+        if item[0] == "edge":
+            shapes.append(_edge_shape(item[1], item[2], t))
+        else:
+            shapes += _vertex_shapes(item[1], item[2], item[3], t, fitted)
+    return shapes
@@ -1,33 +1,94 @@
 """
 Generate SQL Server Monitoring Solution PowerPoint Presentation
+
+The deck content lives in deck_spec.py as plain data. Each slide spec is
+fingerprinted and its rendered slide XML is cached in .slide-cache/, so
+re-running the generator only re-renders the slides that actually changed.
+The template is read once per process and the deck is written straight to
+its destination with a single atomic replace, or, with --update, patched in
+place so only the zip members that changed are rewritten. --stream writes
+each slide out as soon as it is rendered (pptx_stream.py), for decks too
+large to hold in memory.
+
+    python generate_pptx.py [--export records.jsonl ... | --store DIR] [--since 2026-02-01] [--lab-guide [GUIDE.md]]
+                            [--slides 5,6] [--output deck.pptx] [--update | --stream]
+
+is shorthand for "deck_cli.py build"; deck_cli.py also lists and validates
+the deck without loading python-pptx.
+
+Picture shapes (screenshots, diagram renders) are hashed, downscaled to
+their display size and cached by media_cache.py before rendering, so every
+image is embedded once and at a sensible resolution.
+
+The Architecture slide is drawn from SQLMonitoring-Architecture.drawio
+(see drawio_import.py), so editing the diagram updates the deck.
+
+Each --export adds per-instance backup-compliance and uptime report slides
+built from a SQLServerMonitoring_CL export (see sql_export.py); --store reads
+the same records from a columnar store (see record_store.py). --lab-guide
+appends the lab guide as appendix slides (see labguide_spec.py).
 """
+import pptx
 from pptx import Presentation
 from pptx.util import Inches, Pt, Emu
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
-from pptx.enum.shapes import MSO_SHAPE
+from pptx.enum.shapes import MSO_CONNECTOR, MSO_SHAPE
+from pptx.enum.dml import MSO_LINE_DASH_STYLE
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
+from pptx.chart.data import CategoryChartData
+from pptx.opc.serialized import PackageWriter
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
+from pptx.text.text import _Paragraph
+from lxml import etree
+import copy
+import hashlib
+import io
+import json
+import mmap
 import os
+import re
+import struct
+import tempfile
+import threading
+import zipfile
+import zlib
 
-# Load default template from a known-good path (workaround OneDrive path issues)
-import shutil
-_template_src = r"C:\Users\rogeriob\OneDrive - Microsoft\repos\.venv\Lib\site-packages\pptx\templates\default.pptx"
-_template_tmp = r"C:\temp\default.pptx"
-shutil.copy2(_template_src, _template_tmp)
-prs = Presentation(_template_tmp)
-prs.slide_width = Inches(13.333)
-prs.slide_height = Inches(7.5)
+from deck_spec import PALETTE, SLIDE_WIDTH, SLIDE_HEIGHT
+
+# Bump whenever the add_* helpers change their output, to invalidate cached slides
+RENDERER_VERSION = 1
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(SCRIPT_DIR, ".slide-cache")
+DEFAULT_OUTPUT = os.path.join(SCRIPT_DIR, "SQLServerMonitoring-Presentation.pptx")
+
+# python-pptx ships the blank 4:3 template we start from
+DEFAULT_TEMPLATE = os.path.join(os.path.dirname(pptx.__file__), "templates", "default.pptx")
 
 # Color palette
-DARK_BLUE = RGBColor(0x00, 0x33, 0x66)
-AZURE_BLUE = RGBColor(0x00, 0x78, 0xD4)
-LIGHT_BLUE = RGBColor(0xDE, 0xEC, 0xF9)
-WHITE = RGBColor(0xFF, 0xFF, 0xFF)
-DARK_GRAY = RGBColor(0x33, 0x33, 0x33)
-MEDIUM_GRAY = RGBColor(0x66, 0x66, 0x66)
-LIGHT_GRAY = RGBColor(0xF2, 0xF2, 0xF2)
-GREEN = RGBColor(0x10, 0x7C, 0x10)
-ORANGE = RGBColor(0xFF, 0x8C, 0x00)
-RED = RGBColor(0xD1, 0x34, 0x38)
+DARK_BLUE = RGBColor.from_string(PALETTE["DARK_BLUE"])
+AZURE_BLUE = RGBColor.from_string(PALETTE["AZURE_BLUE"])
+LIGHT_BLUE = RGBColor.from_string(PALETTE["LIGHT_BLUE"])
+WHITE = RGBColor.from_string(PALETTE["WHITE"])
+DARK_GRAY = RGBColor.from_string(PALETTE["DARK_GRAY"])
+MEDIUM_GRAY = RGBColor.from_string(PALETTE["MEDIUM_GRAY"])
+LIGHT_GRAY = RGBColor.from_string(PALETTE["LIGHT_GRAY"])
+GREEN = RGBColor.from_string(PALETTE["GREEN"])
+ORANGE = RGBColor.from_string(PALETTE["ORANGE"])
+RED = RGBColor.from_string(PALETTE["RED"])
+
+ALIGNMENTS = {"left": PP_ALIGN.LEFT, "center": PP_ALIGN.CENTER, "right": PP_ALIGN.RIGHT}
+ANCHORS = {"top": MSO_ANCHOR.TOP, "middle": MSO_ANCHOR.MIDDLE, "bottom": MSO_ANCHOR.BOTTOM}
+AUTOSHAPES = {
+    "rect": MSO_SHAPE.RECTANGLE,
+    "rounded": MSO_SHAPE.ROUNDED_RECTANGLE,
+    "ellipse": MSO_SHAPE.OVAL,
+    "diamond": MSO_SHAPE.DIAMOND,
+    "hexagon": MSO_SHAPE.HEXAGON,
+    "cylinder": MSO_SHAPE.CAN,
+    "note": MSO_SHAPE.FOLDED_CORNER,
+}
 
 def add_bg(slide, color):
     bg = slide.background
@@ -35,404 +96,521 @@ def add_bg(slide, color):
     fill.solid()
     fill.fore_color.rgb = color
 
-def add_shape_bg(slide, left, top, width, height, color):
-    shape = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, left, top, width, height)
-    shape.fill.solid()
-    shape.fill.fore_color.rgb = color
-    shape.line.fill.background()
+# ============================================================
+# Shape prototypes
+# ============================================================
+# First shape of each kind is built through python-pptx; later ones are deep copies of its
+# still-empty XML with a new id, name and position.
+_prototypes = {}
+
+def _add_from_prototype(slide, key, create, left, top, width, height):
+    prototype = _prototypes.get(key)
+    if prototype is None:
+        shape = create(slide, left, top, width, height)
+        _prototypes[key] = (copy.deepcopy(shape._element), shape.name.rsplit(" ", 1)[0])
+        return shape
+    element, base_name = prototype
+    sp = copy.deepcopy(element)
+    shape_id = slide.shapes._next_shape_id
+    cNvPr = sp.nvSpPr.cNvPr
+    cNvPr.set("id", str(shape_id))
+    cNvPr.set("name", f"{base_name} {shape_id - 1}")
+    xfrm = sp.spPr.xfrm
+    xfrm.off.set("x", str(int(left)))
+    xfrm.off.set("y", str(int(top)))
+    xfrm.ext.set("cx", str(int(width)))
+    xfrm.ext.set("cy", str(int(height)))
+    slide.shapes._spTree.insert_element_before(sp, "p:extLst")
+    return slide.shapes._shape_factory(sp)
+
+def _create_textbox(slide, left, top, width, height):
+    shape = slide.shapes.add_textbox(left, top, width, height)
+    shape.text_frame.word_wrap = True
     return shape
 
-def add_text_box(slide, left, top, width, height, text, font_size=18, bold=False, color=DARK_GRAY, alignment=PP_ALIGN.LEFT, font_name="Segoe UI"):
-    txBox = slide.shapes.add_textbox(left, top, width, height)
+def _filled_shape(autoshape_type, color):
+    def create(slide, left, top, width, height):
+        shape = slide.shapes.add_shape(autoshape_type, left, top, width, height)
+        shape.fill.solid()
+        shape.fill.fore_color.rgb = color
+        shape.line.fill.background()
+        return shape
+    return create
+
+def add_shape_bg(slide, left, top, width, height, color):
+    return _add_from_prototype(slide, ("rect", color), _filled_shape(MSO_SHAPE.RECTANGLE, color),
+                               left, top, width, height)
+
+# ============================================================
+# Text styles
+# ============================================================
+FONT_NAME = "Segoe UI"
+
+# Same escaping python-pptx applies to run text: every control char except tab/line-feed
+_CTRL_CHARS = re.compile(r"([\x00-\x08\x0B-\x1F])")
+_LINE_BREAKS = re.compile("\n|\v")
+_A_P, _A_R, _A_T, _A_BR = qn("a:p"), qn("a:r"), qn("a:t"), qn("a:br")
+
+class TextStyle:
+    """Paragraph formatting rendered once to an a:pPr element and cloned onto paragraphs.
+
+    Setting font size, bold, color, name and alignment one property at a time costs a
+    handful of lxml lookups and insertions per paragraph; copying a prebuilt a:pPr
+    produces the same XML for a fraction of that.
+    """
+
+    def __init__(self, size, bold=None, color=DARK_GRAY, alignment=None, font_name=FONT_NAME, space_after=None):
+        self.size = size
+        self.bold = bold
+        self.color = color
+        self.alignment = alignment
+        self.font_name = font_name
+        self.space_after = space_after
+        self._pPr = None
+
+    def _build_pPr(self):
+        p = _Paragraph(parse_xml(f"<a:p {nsdecls('a')}/>"), None)
+        p.font.size = Pt(self.size)
+        if self.bold is not None:
+            p.font.bold = self.bold
+        p.font.color.rgb = self.color
+        p.font.name = self.font_name
+        if self.space_after is not None:
+            p.space_after = Pt(self.space_after)
+        if self.alignment is not None:
+            p.alignment = self.alignment
+        return p._p.get_or_add_pPr()
+
+    def apply(self, p, text=""):
+        """Give the a:p element p this style and the runs for text."""
+        if self._pPr is None:
+            self._pPr = self._build_pPr()
+        for child in list(p):
+            p.remove(child)
+        p.append(copy.deepcopy(self._pPr))
+        for idx, line in enumerate(_LINE_BREAKS.split(text)):
+            if idx > 0:
+                etree.SubElement(p, _A_BR)
+            if line:
+                r = etree.SubElement(p, _A_R)
+                etree.SubElement(r, _A_T).text = _CTRL_CHARS.sub(lambda m: "_x%04X_" % ord(m.group(1)), line)
+        return p
+
+# Named styles used across the deck
+TEXT_STYLES = {
+    "title": TextStyle(36, True, WHITE, PP_ALIGN.LEFT),
+    "body": TextStyle(16, False, DARK_GRAY, PP_ALIGN.LEFT),
+    "caption": TextStyle(12, False, MEDIUM_GRAY, PP_ALIGN.LEFT),
+    "tile_label": TextStyle(12, True, WHITE, PP_ALIGN.CENTER),
+}
+
+# Ad-hoc styles built from helper arguments, memoized so each combination is rendered once
+_style_cache = {}
+
+def text_style(style=None, font_size=18, bold=None, color=DARK_GRAY, alignment=None, font_name=FONT_NAME, space_after=None):
+    """Resolve a TextStyle: a TextStyle instance, a TEXT_STYLES name, or one built from the arguments."""
+    if isinstance(style, TextStyle):
+        return style
+    if style is not None:
+        return TEXT_STYLES[style]
+    key = (font_size, bold, color, alignment, font_name, space_after)
+    cached = _style_cache.get(key)
+    if cached is None:
+        cached = _style_cache[key] = TextStyle(*key)
+    return cached
+
+def add_text_box(slide, left, top, width, height, text, font_size=18, bold=False, color=DARK_GRAY, alignment=PP_ALIGN.LEFT, font_name=FONT_NAME, style=None):
+    txBox = _add_from_prototype(slide, ("textbox",), _create_textbox, left, top, width, height)
     tf = txBox.text_frame
-    tf.word_wrap = True
-    p = tf.paragraphs[0]
-    p.text = text
-    p.font.size = Pt(font_size)
-    p.font.bold = bold
-    p.font.color.rgb = color
-    p.font.name = font_name
-    p.alignment = alignment
+    text_style(style, font_size, bold, color, alignment, font_name).apply(tf.paragraphs[0]._p, text)
     return tf
 
-def add_bullet_list(slide, left, top, width, height, items, font_size=16, color=DARK_GRAY):
-    txBox = slide.shapes.add_textbox(left, top, width, height)
+def add_bullet_list(slide, left, top, width, height, items, font_size=16, color=DARK_GRAY, style=None):
+    txBox = _add_from_prototype(slide, ("textbox",), _create_textbox, left, top, width, height)
     tf = txBox.text_frame
-    tf.word_wrap = True
+    item_style = text_style(style, font_size, None, color, space_after=6)
+    txBody = tf._txBody
     for i, item in enumerate(items):
-        if i == 0:
-            p = tf.paragraphs[0]
-        else:
-            p = tf.add_paragraph()
-        p.text = item
-        p.font.size = Pt(font_size)
-        p.font.color.rgb = color
-        p.font.name = "Segoe UI"
-        p.space_after = Pt(6)
-        p.level = 0
+        p = txBody.p_lst[0] if i == 0 else etree.SubElement(txBody, _A_P)
+        item_style.apply(p, item)
     return tf
 
-def add_rounded_rect(slide, left, top, width, height, color, text="", font_size=12, font_color=WHITE):
-    shape = slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, left, top, width, height)
-    shape.fill.solid()
-    shape.fill.fore_color.rgb = color
-    shape.line.fill.background()
+def add_rounded_rect(slide, left, top, width, height, color, text="", font_size=12, font_color=WHITE, style=None):
+    shape = _add_from_prototype(slide, ("rounded", color), _filled_shape(MSO_SHAPE.ROUNDED_RECTANGLE, color),
+                                left, top, width, height)
     if text:
         tf = shape.text_frame
         tf.word_wrap = True
-        tf.paragraphs[0].text = text
-        tf.paragraphs[0].font.size = Pt(font_size)
-        tf.paragraphs[0].font.color.rgb = font_color
-        tf.paragraphs[0].font.bold = True
-        tf.paragraphs[0].font.name = "Segoe UI"
-        tf.paragraphs[0].alignment = PP_ALIGN.CENTER
-        shape.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+        text_style(style, font_size, True, font_color, PP_ALIGN.CENTER).apply(tf.paragraphs[0]._p, text)
     return shape
 
-# ============================================================
-# SLIDE 1: Title Slide
-# ============================================================
-slide = prs.slides.add_slide(prs.slide_layouts[6])  # Blank
-add_shape_bg(slide, Inches(0), Inches(0), Inches(13.333), Inches(7.5), DARK_BLUE)
-add_shape_bg(slide, Inches(0), Inches(5.5), Inches(13.333), Inches(0.08), AZURE_BLUE)
-
-add_text_box(slide, Inches(1), Inches(1.5), Inches(11), Inches(1.5),
-             "SQL Server Monitoring Solution", 44, True, WHITE, PP_ALIGN.CENTER)
-add_text_box(slide, Inches(1), Inches(3.0), Inches(11), Inches(0.8),
-             "Centralized Monitoring with Azure Automation & Logs Ingestion API", 24, False, RGBColor(0xBB, 0xDE, 0xFB), PP_ALIGN.CENTER)
-add_text_box(slide, Inches(1), Inches(4.5), Inches(11), Inches(0.6),
-             "Azure Monitor  |  Log Analytics  |  Custom Workbook", 18, False, RGBColor(0x90, 0xCA, 0xF9), PP_ALIGN.CENTER)
-add_text_box(slide, Inches(1), Inches(6.0), Inches(11), Inches(0.5),
-             "Microsoft Azure Monitor Assets", 16, False, RGBColor(0x64, 0xB5, 0xF6), PP_ALIGN.CENTER)
-
-# ============================================================
-# SLIDE 2: Agenda
-# ============================================================
-slide = prs.slides.add_slide(prs.slide_layouts[6])
-add_bg(slide, WHITE)
-add_shape_bg(slide, Inches(0), Inches(0), Inches(13.333), Inches(1.2), DARK_BLUE)
-add_text_box(slide, Inches(0.8), Inches(0.25), Inches(11), Inches(0.8), "Agenda", 36, True, WHITE)
-
-items = [
-    "1.  Challenge & Business Problem",
-    "2.  Solution Overview",
-    "3.  Architecture Deep Dive",
-    "4.  Data Pipeline: Logs Ingestion API",
-    "5.  Workbook Dashboard (4 Tabs)",
-    "6.  Security & Authentication",
-    "7.  Deployment Options",
-    "8.  Demo & Next Steps"
-]
-add_bullet_list(slide, Inches(1.5), Inches(1.8), Inches(10), Inches(5), items, 22, DARK_GRAY)
-
-# ============================================================
-# SLIDE 3: The Challenge
-# ============================================================
-slide = prs.slides.add_slide(prs.slide_layouts[6])
-add_bg(slide, WHITE)
-add_shape_bg(slide, Inches(0), Inches(0), Inches(13.333), Inches(1.2), DARK_BLUE)
-add_text_box(slide, Inches(0.8), Inches(0.25), Inches(11), Inches(0.8), "The Challenge", 36, True, WHITE)
-
-add_text_box(slide, Inches(0.8), Inches(1.6), Inches(12), Inches(0.6),
-             "Monitoring SQL Server instances across hybrid environments is complex:", 20, False, DARK_GRAY)
-
-# Challenge boxes
-challenges = [
-    ("Fragmented Visibility", "SQL Servers spread across on-prem,\nIaaS VMs, and Arc-enabled servers\nwith no unified view"),
-    ("Backup Compliance", "No centralized way to verify backup\nSLA compliance across all databases\nand instances"),
-    ("Manual Processes", "Teams rely on manual scripts or\nthird-party tools with complex\nlicensing and overhead"),
-    ("Reactive Alerting", "Issues discovered after impact;\nno proactive monitoring of\nuptime and backup status")
-]
-
-for i, (title, desc) in enumerate(challenges):
-    x = Inches(0.8 + i * 3.1)
-    box = add_rounded_rect(slide, x, Inches(2.6), Inches(2.8), Inches(3.5), LIGHT_BLUE)
-    add_text_box(slide, x + Inches(0.2), Inches(2.8), Inches(2.4), Inches(0.6), title, 18, True, DARK_BLUE, PP_ALIGN.CENTER)
-    add_text_box(slide, x + Inches(0.2), Inches(3.5), Inches(2.4), Inches(2.2), desc, 14, False, DARK_GRAY, PP_ALIGN.CENTER)
-
-# ============================================================
-# SLIDE 4: Solution Overview
-# ============================================================
-slide = prs.slides.add_slide(prs.slide_layouts[6])
-add_bg(slide, WHITE)
-add_shape_bg(slide, Inches(0), Inches(0), Inches(13.333), Inches(1.2), DARK_BLUE)
-add_text_box(slide, Inches(0.8), Inches(0.25), Inches(11), Inches(0.8), "Solution Overview", 36, True, WHITE)
-
-add_text_box(slide, Inches(0.8), Inches(1.6), Inches(12), Inches(0.5),
-             "A fully native Azure Monitor solution — no additional agents required on SQL Servers", 20, True, AZURE_BLUE)
-
-benefits = [
-    ("Agentless", "No software installed\non SQL Servers.\nOnly the Hybrid Worker\nneeds an extension.", GREEN),
-    ("Custom Schema", "Clean 20-column table\nin Log Analytics.\nNo JSON parsing needed\nin KQL queries.", AZURE_BLUE),
-    ("Secure by Design", "Managed Identity auth.\nKey Vault for credentials.\nNo passwords in code.", DARK_BLUE),
-    ("Pre-built Dashboard", "4-tab Azure Monitor\nWorkbook: Summary,\nInstances, Databases,\nBackups.", ORANGE),
-]
-
-for i, (title, desc, color) in enumerate(benefits):
-    x = Inches(0.8 + i * 3.1)
-    add_rounded_rect(slide, x, Inches(2.5), Inches(2.8), Inches(0.6), color, title, 16, WHITE)
-    add_text_box(slide, x + Inches(0.2), Inches(3.3), Inches(2.4), Inches(2.5), desc, 14, False, DARK_GRAY, PP_ALIGN.CENTER)
-
-# Key metrics collected
-add_text_box(slide, Inches(0.8), Inches(5.5), Inches(12), Inches(0.4),
-             "Metrics Collected:", 16, True, DARK_BLUE)
-add_text_box(slide, Inches(0.8), Inches(5.9), Inches(12), Inches(1),
-             "Instance Uptime  •  Database State & Recovery Model  •  Full/Log Backup Status  •  Backup SLA Compliance  •  Connection Errors",
-             15, False, MEDIUM_GRAY)
-
-# ============================================================
-# SLIDE 5: Architecture
-# ============================================================
-slide = prs.slides.add_slide(prs.slide_layouts[6])
-add_bg(slide, WHITE)
-add_shape_bg(slide, Inches(0), Inches(0), Inches(13.333), Inches(1.2), DARK_BLUE)
-add_text_box(slide, Inches(0.8), Inches(0.25), Inches(11), Inches(0.8), "Architecture", 36, True, WHITE)
-
-# On-Prem Zone
-add_shape_bg(slide, Inches(0.5), Inches(1.5), Inches(3), Inches(5.2), RGBColor(0xE3, 0xF2, 0xFD))
-add_text_box(slide, Inches(0.6), Inches(1.55), Inches(2.8), Inches(0.4), "On-Premises / IaaS", 14, True, RGBColor(0x15, 0x65, 0xC0))
-
-for i, name in enumerate(["SQL Server 1", "SQL Server 2", "SQL Server N"]):
-    y = Inches(2.2 + i * 1.4)
-    add_rounded_rect(slide, Inches(0.8), y, Inches(2.4), Inches(0.8), RGBColor(0x15, 0x65, 0xC0), name, 13, WHITE)
-
-# Hybrid Worker Zone
-add_shape_bg(slide, Inches(4), Inches(1.5), Inches(3), Inches(5.2), RGBColor(0xFF, 0xF3, 0xE0))
-add_text_box(slide, Inches(4.1), Inches(1.55), Inches(2.8), Inches(0.4), "Hybrid Worker (Arc VM)", 14, True, RGBColor(0xE6, 0x51, 0x00))
-
-add_rounded_rect(slide, Inches(4.3), Inches(2.2), Inches(2.4), Inches(0.7), RGBColor(0xE6, 0x51, 0x00), "Arc-enabled Server\n+ Managed Identity", 11, WHITE)
-add_rounded_rect(slide, Inches(4.3), Inches(3.2), Inches(2.4), Inches(0.7), RGBColor(0xFF, 0xB7, 0x4D), "Hybrid Worker\nExtension (PS 7.2)", 11, DARK_GRAY)
-add_rounded_rect(slide, Inches(4.3), Inches(4.2), Inches(2.4), Inches(1.0), RGBColor(0xFF, 0xF9, 0xC4), "PowerShell Runbook\nGet-SQLServerInfo-\nLogsIngestionApi.ps1", 10, DARK_GRAY)
-
-# Azure Zone
-add_shape_bg(slide, Inches(7.5), Inches(1.5), Inches(5.3), Inches(5.2), RGBColor(0xE8, 0xF5, 0xE9))
-add_text_box(slide, Inches(7.6), Inches(1.55), Inches(5.1), Inches(0.4), "Azure Cloud", 14, True, RGBColor(0x2E, 0x7D, 0x32))
-
-add_rounded_rect(slide, Inches(7.8), Inches(2.2), Inches(2.2), Inches(0.7), RGBColor(0x2E, 0x7D, 0x32), "Automation\nAccount", 12, WHITE)
-add_rounded_rect(slide, Inches(10.3), Inches(2.2), Inches(2.2), Inches(0.7), RGBColor(0xF9, 0xA8, 0x25), "Key Vault\n(optional)", 12, WHITE)
-add_rounded_rect(slide, Inches(7.8), Inches(3.3), Inches(2.2), Inches(0.6), RGBColor(0x43, 0xA0, 0x47), "DCE (Endpoint)", 12, WHITE)
-add_rounded_rect(slide, Inches(10.3), Inches(3.3), Inches(2.2), Inches(0.6), RGBColor(0x43, 0xA0, 0x47), "DCR (Rule)", 12, WHITE)
-add_rounded_rect(slide, Inches(7.8), Inches(4.4), Inches(2.2), Inches(0.9), RGBColor(0x1B, 0x5E, 0x20), "Log Analytics\nSQLServerMonitoring_CL", 11, WHITE)
-add_rounded_rect(slide, Inches(10.3), Inches(4.4), Inches(2.2), Inches(0.9), RGBColor(0x6A, 0x1B, 0x9A), "Azure Monitor\nWorkbook (4 tabs)", 11, WHITE)
-
-# Flow arrows (text-based)
-add_text_box(slide, Inches(3.2), Inches(2.8), Inches(1.2), Inches(0.5), "TCP 1433 →", 11, True, RGBColor(0x15, 0x65, 0xC0), PP_ALIGN.CENTER)
-add_text_box(slide, Inches(6.5), Inches(3.4), Inches(1.2), Inches(0.5), "HTTPS →", 11, True, RGBColor(0x2E, 0x7D, 0x32), PP_ALIGN.CENTER)
-
-# Data Flow
-add_text_box(slide, Inches(0.8), Inches(6.0), Inches(12), Inches(0.4),
-             "Data Flow:  ① Schedule triggers runbook  →  ② Hybrid Worker queries SQL Servers  →  ③ POST to Logs Ingestion API  →  ④ DCR routes to custom table  →  ⑤ Workbook visualizes",
-             13, False, MEDIUM_GRAY)
-
-# ============================================================
-# SLIDE 6: Data Pipeline
-# ============================================================
-slide = prs.slides.add_slide(prs.slide_layouts[6])
-add_bg(slide, WHITE)
-add_shape_bg(slide, Inches(0), Inches(0), Inches(13.333), Inches(1.2), DARK_BLUE)
-add_text_box(slide, Inches(0.8), Inches(0.25), Inches(11), Inches(0.8), "Data Pipeline — Logs Ingestion API", 36, True, WHITE)
-
-add_text_box(slide, Inches(0.8), Inches(1.6), Inches(12), Inches(0.5),
-             "Direct ingestion into Log Analytics using Azure Monitor's native REST API", 20, False, AZURE_BLUE)
-
-# Pipeline steps
-steps = [
-    ("1. Collect", "Runbook queries SQL\nServers using T-SQL\n(sys.dm_os_sys_info,\nsys.databases,\nmsdb.dbo.backupset)", AZURE_BLUE),
-    ("2. Transform", "PowerShell converts\nresults to JSON records\nwith 20 typed columns\n(one record per database)", RGBColor(0x43, 0xA0, 0x47)),
-    ("3. Authenticate", "Managed Identity\nobtains OAuth2 token\nfor monitor.azure.com\n(no stored credentials)", RGBColor(0xE6, 0x51, 0x00)),
-    ("4. Ingest", "HTTPS POST to DCE\nLogs Ingestion API\nwith JSON payload\n(batched per collection)", RGBColor(0x6A, 0x1B, 0x9A)),
-    ("5. Route", "DCR validates schema,\napplies transformKql,\nroutes to destination\ntable in Log Analytics", RGBColor(0x2E, 0x7D, 0x32)),
-]
-
-for i, (title, desc, color) in enumerate(steps):
-    x = Inches(0.5 + i * 2.5)
-    add_rounded_rect(slide, x, Inches(2.5), Inches(2.2), Inches(0.6), color, title, 14, WHITE)
-    add_text_box(slide, x + Inches(0.1), Inches(3.3), Inches(2.0), Inches(2.5), desc, 13, False, DARK_GRAY, PP_ALIGN.CENTER)
-
-# Table schema
-add_text_box(slide, Inches(0.8), Inches(5.5), Inches(12), Inches(0.4),
-             "Custom Table: SQLServerMonitoring_CL (20 columns)", 16, True, DARK_BLUE)
-schema_text = ("TimeGenerated  •  CollectorName  •  SqlInstance  •  ServerName  •  SqlVersion  •  InstanceStartTime\n"
-               "InstanceUptimeSeconds/Minutes/Hours/Days  •  DatabaseName  •  DatabaseState  •  RecoveryModel\n"
-               "DatabaseCreateDate  •  LastFullBackupTime  •  HoursSinceFullBackup  •  LastFullBackupStatus\n"
-               "FullBackupAlertStatus  •  LastLogBackupTime  •  MinutesSinceLogBackup")
-add_text_box(slide, Inches(0.8), Inches(5.9), Inches(12), Inches(1.5), schema_text, 12, False, MEDIUM_GRAY)
-
-# ============================================================
-# SLIDE 7: Workbook Dashboard
-# ============================================================
-slide = prs.slides.add_slide(prs.slide_layouts[6])
-add_bg(slide, WHITE)
-add_shape_bg(slide, Inches(0), Inches(0), Inches(13.333), Inches(1.2), DARK_BLUE)
-add_text_box(slide, Inches(0.8), Inches(0.25), Inches(11), Inches(0.8), "Workbook Dashboard — 4 Tabs", 36, True, WHITE)
-
-tabs = [
-    ("📊 Summary", [
-        "4 KPI tiles: Instances, Databases,\nBackup Alerts, Compliance %",
-        "Pie charts: Backup status distribution\nand Recovery model breakdown",
-        "Instance uptime table with\nheat-map coloring"
-    ], AZURE_BLUE),
-    ("🖥️ Instances", [
-        "Grid with online/offline status,\nSQL version, database count",
-        "Uptime display in days/hours\nwith last-seen timestamp",
-        "Line chart: uptime trend\nover time per instance"
-    ], RGBColor(0x43, 0xA0, 0x47)),
-    ("🗄️ Databases", [
-        "Detailed grid with state,\nrecovery model, backup status",
-        "Color-coded: ONLINE=green,\nFULL=blue, SIMPLE=orange",
-        "Bar chart: database count\nper SQL instance"
-    ], RGBColor(0xE6, 0x51, 0x00)),
-    ("💾 Backups", [
-        "Compliance table per instance\n(compliant, warning, critical)",
-        "Alert grid: databases needing\nattention (sorted by severity)",
-        "Log backup monitoring for\nFULL recovery model DBs"
-    ], RGBColor(0x6A, 0x1B, 0x9A)),
-]
-
-for i, (tab_name, features, color) in enumerate(tabs):
-    x = Inches(0.5 + i * 3.15)
-    add_rounded_rect(slide, x, Inches(1.6), Inches(2.9), Inches(0.6), color, tab_name, 16, WHITE)
-    for j, feature in enumerate(features):
-        add_text_box(slide, x + Inches(0.15), Inches(2.4 + j * 1.4), Inches(2.6), Inches(1.3), feature, 12, False, DARK_GRAY)
-
-# Parameters
-add_text_box(slide, Inches(0.8), Inches(6.3), Inches(12), Inches(0.3),
-             "Interactive Parameters:  Subscription  •  Workspace  •  Time Range  •  SQL Instance (multi-select)  •  Database (multi-select)",
-             14, True, DARK_BLUE)
+def _outlined_shape(autoshape_type, fill, line, anchor, wrap):
+    def create(slide, left, top, width, height):
+        shape = slide.shapes.add_shape(autoshape_type, left, top, width, height)
+        if fill is None:
+            shape.fill.background()
+        else:
+            shape.fill.solid()
+            shape.fill.fore_color.rgb = fill
+        if line is None:
+            shape.line.fill.background()
+        else:
+            line_color, line_width, dashed = line
+            shape.line.color.rgb = line_color
+            shape.line.width = Pt(line_width)
+            if dashed:
+                shape.line.dash_style = MSO_LINE_DASH_STYLE.DASH
+        tf = shape.text_frame
+        tf.word_wrap = wrap
+        tf.vertical_anchor = anchor
+        tf.margin_left = tf.margin_right = tf.margin_top = tf.margin_bottom = Inches(0.03)
+        return shape
+    return create
+
+def add_autoshape(slide, left, top, width, height, autoshape_type, fill=None, line=None, text="", font_size=12,
+                  bold=False, font_color=DARK_GRAY, alignment=PP_ALIGN.CENTER, anchor=MSO_ANCHOR.MIDDLE, wrap=True):
+    """Preset shape with an optional fill and an optional (color, width_pt, dashed) outline."""
+    shape = _add_from_prototype(slide, ("autoshape", autoshape_type, fill, line, anchor, wrap),
+                                _outlined_shape(autoshape_type, fill, line, anchor, wrap), left, top, width, height)
+    if text:
+        text_style(None, font_size, bold, font_color, alignment).apply(shape.text_frame.paragraphs[0]._p, text)
+    return shape
 
-# ============================================================
-# SLIDE 8: Security
-# ============================================================
-slide = prs.slides.add_slide(prs.slide_layouts[6])
-add_bg(slide, WHITE)
-add_shape_bg(slide, Inches(0), Inches(0), Inches(13.333), Inches(1.2), DARK_BLUE)
-add_text_box(slide, Inches(0.8), Inches(0.25), Inches(11), Inches(0.8), "Security & Authentication", 36, True, WHITE)
-
-# Two authentication options
-add_text_box(slide, Inches(0.8), Inches(1.6), Inches(5.5), Inches(0.5),
-             "Azure Authentication (Managed Identity)", 20, True, AZURE_BLUE)
-
-azure_auth = [
-    "• System-assigned MI on Automation Account",
-    "• Arc VM MI for IMDS token (Hybrid Worker)",
-    "• OAuth2 tokens for Azure Monitor & Key Vault",
-    "• RBAC: Monitoring Metrics Publisher on DCR",
-    "• RBAC: Key Vault Secrets User (SQL Auth only)",
-    "• No credentials stored in runbook code"
-]
-add_bullet_list(slide, Inches(0.8), Inches(2.2), Inches(5.5), Inches(3), azure_auth, 15, DARK_GRAY)
-
-add_text_box(slide, Inches(7), Inches(1.6), Inches(5.5), Inches(0.5),
-             "SQL Server Authentication Options", 20, True, AZURE_BLUE)
-
-# Windows Auth box
-add_rounded_rect(slide, Inches(7), Inches(2.3), Inches(5.5), Inches(1.8), LIGHT_BLUE)
-add_text_box(slide, Inches(7.2), Inches(2.4), Inches(5.1), Inches(0.4), "Option A: Windows Authentication", 16, True, DARK_BLUE)
-win_auth_desc = ("Best for domain-joined environments.\nHybrid Worker service account authenticates\nvia Kerberos/NTLM. No password management.\n"
-                 "Requirements: Domain trust, SQL login for machine account.")
-add_text_box(slide, Inches(7.2), Inches(2.8), Inches(5.1), Inches(1.2), win_auth_desc, 13, False, DARK_GRAY)
-
-# SQL Auth box
-add_rounded_rect(slide, Inches(7), Inches(4.3), Inches(5.5), Inches(1.8), RGBColor(0xFF, 0xF3, 0xE0))
-add_text_box(slide, Inches(7.2), Inches(4.4), Inches(5.1), Inches(0.4), "Option B: SQL Authentication + Key Vault", 16, True, RGBColor(0xE6, 0x51, 0x00))
-sql_auth_desc = ("Best for non-domain or mixed environments.\nCredentials stored securely in Azure Key Vault.\nManaged Identity retrieves secrets at runtime.\n"
-                 "Requirements: Key Vault with SQL login secrets.")
-add_text_box(slide, Inches(7.2), Inches(4.8), Inches(5.1), Inches(1.2), sql_auth_desc, 13, False, DARK_GRAY)
-
-# SQL permissions
-add_text_box(slide, Inches(0.8), Inches(5.5), Inches(12), Inches(0.4),
-             "Required SQL Server Permissions:", 16, True, DARK_BLUE)
-add_text_box(slide, Inches(0.8), Inches(5.9), Inches(12), Inches(0.8),
-             "VIEW SERVER STATE  •  VIEW ANY DATABASE  •  db_datareader on msdb (for backup history)",
-             14, False, MEDIUM_GRAY)
+def add_connector(slide, points, color=DARK_GRAY, width=1, dashed=False, arrow=True):
+    """Straight connectors through points (EMU x, y pairs), with an arrowhead at the last point."""
+    connectors = []
+    for i, ((begin_x, begin_y), (end_x, end_y)) in enumerate(zip(points, points[1:])):
+        connector = slide.shapes.add_connector(MSO_CONNECTOR.STRAIGHT, begin_x, begin_y, end_x, end_y)
+        connector.line.color.rgb = color
+        connector.line.width = Pt(width)
+        if dashed:
+            connector.line.dash_style = MSO_LINE_DASH_STYLE.DASH
+        if arrow and i == len(points) - 2:
+            connector.line._get_or_add_ln().append(parse_xml(f'<a:tailEnd {nsdecls("a")} type="triangle"/>'))
+        connectors.append(connector)
+    return connectors
+
+def _add_chart(slide, chart_type, left, top, width, height, categories, values, title, colors, font_size):
+    data = CategoryChartData()
+    data.categories = categories
+    data.add_series(title or "Series 1", values)
+    chart = slide.shapes.add_chart(chart_type, left, top, width, height, data).chart
+    chart.font.size = Pt(font_size)
+    chart.font.name = FONT_NAME
+    chart.has_title = bool(title)
+    if title:
+        chart.chart_title.text_frame.text = title
+        text_style(None, font_size + 2, True, DARK_GRAY).apply(chart.chart_title.text_frame.paragraphs[0]._p, title)
+    if colors:
+        points = chart.plots[0].series[0].points
+        for i, color in enumerate(colors):
+            points[i].format.fill.solid()
+            points[i].format.fill.fore_color.rgb = color
+    return chart
+
+def add_pie_chart(slide, left, top, width, height, categories, values, title="", colors=None, font_size=11):
+    chart = _add_chart(slide, XL_CHART_TYPE.PIE, left, top, width, height, categories, values, title, colors, font_size)
+    chart.has_legend = True
+    chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+    chart.legend.include_in_layout = False
+    plot = chart.plots[0]
+    plot.has_data_labels = True
+    plot.data_labels.show_percentage = True
+    plot.data_labels.show_value = False
+    plot.data_labels.number_format = "0%"
+    plot.data_labels.number_format_is_linked = False
+    return chart
+
+def add_bar_chart(slide, left, top, width, height, categories, values, title="", colors=None, font_size=11):
+    chart = _add_chart(slide, XL_CHART_TYPE.COLUMN_CLUSTERED, left, top, width, height,
+                       categories, values, title, colors, font_size)
+    chart.has_legend = False
+    plot = chart.plots[0]
+    plot.has_data_labels = True
+    plot.data_labels.show_value = True
+    plot.gap_width = 60
+    chart.value_axis.has_major_gridlines = False
+    chart.value_axis.visible = False
+    return chart
+
+def add_picture(slide, left, top, width, height, image_path, pixels):
+    """Picture scaled to fit the box, keeping the aspect ratio of its pixels, and centered in it."""
+    aspect = pixels[0] / pixels[1]
+    if width / height > aspect:
+        fitted = int(height * aspect)
+        left, width = left + (width - fitted) // 2, fitted
+    else:
+        fitted = int(width / aspect)
+        top, height = top + (height - fitted) // 2, fitted
+    # python-pptx keeps one image part per distinct blob, however many slides show it
+    return slide.shapes.add_picture(image_path, left, top, width, height)
+
+def add_table(slide, left, top, width, height, rows, font_size=11, header_color=DARK_BLUE, col_widths=None):
+    """Native pptx table; rows[0] is rendered as a filled header row."""
+    shape = slide.shapes.add_table(len(rows), len(rows[0]), left, top, width, height)
+    table = shape.table
+    if col_widths:
+        for column, column_width in zip(table.columns, col_widths):
+            column.width = column_width
+    header_style = text_style(None, font_size, True, WHITE)
+    body_style = text_style(None, font_size, False, DARK_GRAY)
+    for r, row in enumerate(rows):
+        style = header_style if r == 0 else body_style
+        for c, value in enumerate(row):
+            cell = table.cell(r, c)
+            if r == 0:
+                cell.fill.solid()
+                cell.fill.fore_color.rgb = header_color
+            style.apply(cell.text_frame.paragraphs[0]._p, value)
+    return table
 
 # ============================================================
-# SLIDE 9: Deployment Options
+# Spec renderer
 # ============================================================
-slide = prs.slides.add_slide(prs.slide_layouts[6])
-add_bg(slide, WHITE)
-add_shape_bg(slide, Inches(0), Inches(0), Inches(13.333), Inches(1.2), DARK_BLUE)
-add_text_box(slide, Inches(0.8), Inches(0.25), Inches(11), Inches(0.8), "Deployment — Easy as 1-2-3", 36, True, WHITE)
-
-add_text_box(slide, Inches(0.8), Inches(1.6), Inches(12), Inches(0.5),
-             "Three ARM templates — deployable from the Azure Portal (no CLI required)", 20, False, AZURE_BLUE)
-
-templates = [
-    ("Step 1\nInfrastructure", "arm-template-infrastructure.json", [
-        "Automation Account (System MI)",
-        "Log Analytics Workspace",
-        "Custom Table (20 columns)",
-        "Key Vault (optional)"
-    ], AZURE_BLUE),
-    ("Step 2\nData Collection", "arm-template-data-collection.json", [
-        "Data Collection Endpoint (DCE)",
-        "Data Collection Rule (DCR)",
-        "Stream declarations",
-        "Transform KQL config"
-    ], RGBColor(0x43, 0xA0, 0x47)),
-    ("Step 3\nWorkbook", "arm-template-workbook.json", [
-        "Azure Monitor Workbook",
-        "4 interactive tabs",
-        "Pre-configured KQL queries",
-        "Color-coded visualizations"
-    ], RGBColor(0x6A, 0x1B, 0x9A)),
-]
-
-for i, (title, filename, items, color) in enumerate(templates):
-    x = Inches(0.8 + i * 4)
-    add_rounded_rect(slide, x, Inches(2.3), Inches(3.5), Inches(0.9), color, title, 15, WHITE)
-    add_text_box(slide, x + Inches(0.1), Inches(3.3), Inches(3.3), Inches(0.3), filename, 11, False, MEDIUM_GRAY, PP_ALIGN.CENTER)
-    for j, item in enumerate(items):
-        add_text_box(slide, x + Inches(0.2), Inches(3.7 + j * 0.4), Inches(3.1), Inches(0.4),
-                     f"✓  {item}", 13, False, DARK_GRAY)
-
-# Manual steps
-add_text_box(slide, Inches(0.8), Inches(5.5), Inches(12), Inches(0.4),
-             "Manual Steps (Portal-guided):", 16, True, DARK_BLUE)
-manual = [
-    "→  Configure RBAC (assign Monitoring Metrics Publisher role to Automation Account MI on DCR)",
-    "→  Set up Hybrid Worker Group (add Arc-enabled server to Automation Account)",
-    "→  Import & publish the runbook script (paste into Automation Account runbook editor)",
-    "→  Create schedule and link to runbook with parameters (SQL instances, DCE endpoint, DCR ID)"
-]
-add_bullet_list(slide, Inches(0.8), Inches(5.9), Inches(12), Inches(1.5), manual, 13, DARK_GRAY)
+def resolve_color(value, palette=PALETTE):
+    """Map a palette key or RRGGBB literal to an RGBColor."""
+    return RGBColor.from_string(palette.get(value, value))
+
+def _box(spec):
+    return [Inches(v) for v in spec["box"]]
+
+def _render_shape_bg(slide, spec, palette):
+    add_shape_bg(slide, *_box(spec), resolve_color(spec["color"], palette))
+
+def _render_text_box(slide, spec, palette):
+    add_text_box(slide, *_box(spec), spec["text"], spec["size"], spec["bold"],
+                 resolve_color(spec["color"], palette), ALIGNMENTS[spec["align"]], spec.get("font", FONT_NAME))
+
+def _render_bullet_list(slide, spec, palette):
+    add_bullet_list(slide, *_box(spec), spec["items"], spec["size"], resolve_color(spec["color"], palette))
+
+def _render_rounded_rect(slide, spec, palette):
+    add_rounded_rect(slide, *_box(spec), resolve_color(spec["color"], palette), spec["text"],
+                     spec["size"], resolve_color(spec["font_color"], palette))
+
+def _render_autoshape(slide, spec, palette):
+    fill = resolve_color(spec["fill"], palette) if spec["fill"] else None
+    line = spec["line"]
+    if line:
+        line = (resolve_color(line["color"], palette), line["width"], line["dashed"])
+    add_autoshape(slide, *_box(spec), AUTOSHAPES[spec["shape"]], fill, line, spec["text"], spec["size"],
+                  spec["bold"], resolve_color(spec["font_color"], palette), ALIGNMENTS[spec["align"]],
+                  ANCHORS[spec["anchor"]], spec["wrap"])
+
+def _render_connector(slide, spec, palette):
+    add_connector(slide, [(Inches(x), Inches(y)) for x, y in spec["points"]], resolve_color(spec["color"], palette),
+                  spec["width"], spec["dashed"], spec["arrow"])
+
+def _render_table(slide, spec, palette):
+    col_widths = [Inches(w) for w in spec["col_widths"]] if spec.get("col_widths") else None
+    add_table(slide, *_box(spec), spec["rows"], spec["size"], resolve_color(spec["header_color"], palette), col_widths)
+
+def _render_chart(slide, spec, palette):
+    add_chart = add_pie_chart if spec["chart"] == "pie" else add_bar_chart
+    colors = [resolve_color(c, palette) for c in spec["colors"]] if spec.get("colors") else None
+    add_chart(slide, *_box(spec), spec["categories"], spec["values"], spec["title"], colors, spec["size"])
+
+def _render_picture(slide, spec, palette):
+    add_picture(slide, *_box(spec), spec["media"], spec["pixels"])
+
+SHAPE_RENDERERS = {
+    "shape_bg": _render_shape_bg,
+    "text_box": _render_text_box,
+    "bullet_list": _render_bullet_list,
+    "rounded_rect": _render_rounded_rect,
+    "autoshape": _render_autoshape,
+    "connector": _render_connector,
+    "table": _render_table,
+    "chart": _render_chart,
+    "picture": _render_picture,
+}
+
+# Shapes that add their own package parts (and slide relationships), which replayed slide XML can't carry
+UNCACHEABLE_KINDS = {"chart", "picture"}
+
+def render_slide(slide, spec, palette=PALETTE):
+    """Draw one slide spec onto an empty slide."""
+    if spec.get("background"):
+        add_bg(slide, resolve_color(spec["background"], palette))
+    for shape in spec["shapes"]:
+        SHAPE_RENDERERS[shape["kind"]](slide, shape, palette)
+
+def slide_fingerprint(spec, palette=PALETTE):
+    """Stable hash of everything that affects a slide's rendered XML."""
+    payload = json.dumps({"renderer": RENDERER_VERSION, "palette": palette, "slide": spec},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class SlideCache:
+    """Rendered slide XML keyed by fingerprint, kept in memory and on disk.
+
+    memory=False keeps nothing in memory (for streamed decks too large to hold).
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, memory=True):
+        self.cache_dir = cache_dir
+        self._memory = {} if memory else None
+
+    def _path(self, fingerprint):
+        return os.path.join(self.cache_dir, fingerprint + ".xml")
+
+    def get(self, fingerprint):
+        xml = self._memory.get(fingerprint) if self._memory is not None else None
+        if xml is None and self.cache_dir and os.path.exists(self._path(fingerprint)):
+            with open(self._path(fingerprint), "rb") as f:
+                xml = f.read()
+            if self._memory is not None:
+                self._memory[fingerprint] = xml
+        return xml
+
+    def put(self, fingerprint, xml):
+        if self._memory is not None:
+            self._memory[fingerprint] = xml
+        if self.cache_dir:
+            # Several builder processes may share one cache dir, so never expose a partial file
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(xml)
+            os.replace(tmp_path, self._path(fingerprint))
+
+def _apply_cached_xml(slide, xml):
+    """Replace the content of a freshly added slide with previously rendered XML."""
+    sld = slide._element
+    for child in list(sld):
+        sld.remove(child)
+    for child in list(parse_xml(xml)):
+        sld.append(child)
+
+def prepare_media(slides, media=None):
+    """Resolve picture shapes through media (a media_cache.MediaCache, by default one on the shared cache)."""
+    if not any(shape["kind"] == "picture" for spec in slides for shape in spec["shapes"]):
+        return slides
+    if media is None:
+        from media_cache import MediaCache
+        media = MediaCache()
+    return media.prepare(slides)
+
+def fill_slide(slide, spec, cache, palette=PALETTE):
+    """Draw spec onto an empty slide, or replay its cached XML. Returns True if it was rendered."""
+    if any(shape["kind"] in UNCACHEABLE_KINDS for shape in spec["shapes"]):
+        render_slide(slide, spec, palette)
+        return True
+    fingerprint = slide_fingerprint(spec, palette)
+    xml = cache.get(fingerprint)
+    if xml is not None:
+        _apply_cached_xml(slide, xml)
+        return False
+    render_slide(slide, spec, palette)
+    cache.put(fingerprint, etree.tostring(slide._element, encoding="UTF-8"))
+    return True
+
+def build_presentation(prs, slides, palette=PALETTE, cache=None, media=None):
+    """Add every slide spec to prs, reusing cached XML for unchanged slides.
+
+    Pictures are first resolved through prepare_media(). Returns a
+    (rendered, cached) tuple with the number of slides in each bucket.
+    """
+    cache = cache if cache is not None else SlideCache()
+    slides = prepare_media(slides, media)
+    layout = prs.slide_layouts[6]  # Blank
+    rendered = 0
+    for spec in slides:
+        slide = prs.slides.add_slide(layout)
+        # Only this Slide object ever touches the new slide, so shape ids can be counted instead of searched
+        slide.shapes.turbo_add_enabled = True
+        rendered += fill_slide(slide, spec, cache, palette)
+    return rendered, len(slides) - rendered
 
 # ============================================================
-# SLIDE 10: Next Steps
+# Template loading and saving
 # ============================================================
-slide = prs.slides.add_slide(prs.slide_layouts[6])
-add_shape_bg(slide, Inches(0), Inches(0), Inches(13.333), Inches(7.5), DARK_BLUE)
-add_shape_bg(slide, Inches(0), Inches(5.5), Inches(13.333), Inches(0.08), AZURE_BLUE)
-
-add_text_box(slide, Inches(1), Inches(0.8), Inches(11), Inches(0.8),
-             "Next Steps", 40, True, WHITE, PP_ALIGN.CENTER)
-
-next_steps = [
-    "1.  Review the Lab Deployment Guide (LabGuide-SQLServerMonitoring.md)",
-    "2.  Deploy ARM templates to your subscription (Portal or script)",
-    "3.  Configure Hybrid Worker on an Arc-enabled server or Azure VM",
-    "4.  Import the runbook and create a monitoring schedule",
-    "5.  Validate data in the workbook dashboard",
-    "6.  Set up alert rules for backup SLA violations",
-    "7.  Scale: add more SQL instances to the collection parameters"
-]
-add_bullet_list(slide, Inches(2), Inches(2.0), Inches(9), Inches(3.5), next_steps, 20, RGBColor(0xBB, 0xDE, 0xFB))
-
-add_text_box(slide, Inches(1), Inches(5.8), Inches(11), Inches(0.6),
-             "All materials provided:  Presentation  •  Architecture Diagram  •  Lab Guide  •  ARM Templates  •  Deployment Script  •  Runbook",
-             16, False, RGBColor(0x90, 0xCA, 0xF9), PP_ALIGN.CENTER)
-
-add_text_box(slide, Inches(1), Inches(6.5), Inches(11), Inches(0.5),
-             "Thank You", 28, True, WHITE, PP_ALIGN.CENTER)
-
-# Save to temp first (OneDrive paths can cause issues), then copy
-temp_output = r"C:\temp\SQLServerMonitoring-Presentation.pptx"
-final_output = os.path.join(
-    r"C:\Users\rogeriob\OneDrive - Microsoft\repos\AzureMonitorAssets\Solutions\SQL Monitoring\Presentation",
-    "SQLServerMonitoring-Presentation.pptx"
-)
-prs.save(temp_output)
-import shutil
-shutil.copy2(temp_output, final_output)
-print(f"Presentation saved to: {final_output}")
-print(f"Slides: {len(prs.slides)}")
+# Template bytes (or a memory map) per path, shared by every deck built in this process
+_template_cache = {}
+_template_lock = threading.Lock()
+
+def _template_source(template_path, use_mmap):
+    key = (os.path.abspath(template_path), use_mmap)
+    source = _template_cache.get(key)
+    if source is None:
+        with open(template_path, "rb") as f:
+            if use_mmap:
+                source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                source = f.read()
+        _template_cache[key] = source
+    return source
+
+def load_template(template_path=DEFAULT_TEMPLATE, use_mmap=False):
+    """Open a new Presentation from the cached template, without touching the disk again."""
+    with _template_lock:
+        source = _template_source(template_path, use_mmap)
+    # Each deck gets its own view over the shared buffer; python-pptx reads every part up front
+    prs = Presentation(io.BytesIO(source))
+    prs.slide_width = Inches(SLIDE_WIDTH)
+    prs.slide_height = Inches(SLIDE_HEIGHT)
+    return prs
+
+def clear_template_cache():
+    with _template_lock:
+        for source in _template_cache.values():
+            if isinstance(source, mmap.mmap):
+                source.close()
+        _template_cache.clear()
+
+def save_presentation(prs, output_path):
+    """Serialize in memory, then atomically replace output_path with a single write."""
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    fd, tmp_path = tempfile.mkstemp(dir=output_dir, prefix=".~", suffix=".pptx")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(buffer.getbuffer())
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return buffer.tell()
+
+def package_members(prs):
+    """(member name, bytes) for every zip member prs.save() would write, in the same order, uncompressed."""
+    members = []
+
+    class _Collector:
+        def write(self, pack_uri, blob):
+            members.append((pack_uri.membername, blob))
+
+    package = prs.part.package
+    writer = PackageWriter(None, package._rels, tuple(package.iter_parts()))
+    collector = _Collector()
+    writer._write_content_types_stream(collector)
+    writer._write_pkg_rels(collector)
+    writer._write_parts(collector)
+    return members
+
+def update_presentation(prs, output_path):
+    """Patch output_path in place, rewriting only the zip members that changed (see pptx_patch.py).
+
+    Falls back to save_presentation() when output_path doesn't exist yet, is
+    not a readable zip (truncated or corrupt) or can't be patched. Returns pptx_patch.patch_package()'s counts, or None
+    after a full save.
+    """
+    from pptx_patch import patch_package
+    if os.path.exists(output_path):
+        try:
+            counts = patch_package(output_path, package_members(prs))
+        except (zipfile.BadZipFile, struct.error, zlib.error):
+            # Not a zip, or truncated (e.g. an interrupted save); the full save below replaces it
+            counts = None
+        if counts is not None:
+            return counts
+    save_presentation(prs, output_path)
+    return None
+
+
+if __name__ == "__main__":
+    # Same as "deck_cli.py build"; kept so existing scripts and docs keep working
+    import sys
+    from deck_cli import main
+    sys.exit(main(["build"] + sys.argv[1:]))
@@ -0,0 +1,405 @@
+"""
+Appendix slides compiled from LabGuide-SQLServerMonitoring.md.
+
+The guide is split into sections at its #, ## and ### headings. Each section
+is tokenized into blocks (paragraphs, lists, code blocks, tables and ####
+sub-headings) and laid out onto as many slides as it needs: headings become
+slide titles, lists go through add_bullet_list, code blocks are set in a
+monospace font on a gray panel and tables become native pptx tables. Blocks
+that overflow a slide continue on the next one, lists, tables (with their
+header row repeated) and code split where they have to.
+
+Compilation is incremental per section: the slide specs of a section are
+cached under the hash of its markdown, in memory and as JSON in .slide-cache/,
+so only edited sections are tokenized again. Unchanged sections produce
+identical specs, which generate_pptx's slide cache then replays without
+re-rendering.
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import tempfile
+
+from deck_spec import SLIDE_WIDTH, bullets, header, rect, slide, table, text
+
+# Bump whenever tokenizing or layout changes, to invalidate cached sections
+COMPILER_VERSION = 1
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(SCRIPT_DIR, ".slide-cache")
+DEFAULT_GUIDE = os.path.join(SCRIPT_DIR, "LabGuide-SQLServerMonitoring.md")
+
+# Sections that only make sense in the markdown itself
+SKIPPED_SECTIONS = {"Table of Contents"}
+
+# Layout, in inches and points
+LEFT = 0.6
+WIDTH = SLIDE_WIDTH - 2 * LEFT
+TOP = 1.75
+BOTTOM = 7.1
+BLOCK_GAP = 0.15
+TITLE_SIZE = 26
+BODY_SIZE = 14
+CODE_SIZE = 11
+MIN_CODE_SIZE = 7
+TABLE_SIZE = 11
+MONO_FONT = "Consolas"
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_LIST_ITEM = re.compile(r"^(\s*)([-*+]|\d+[.)])\s+(.*)$")
+_TABLE_SEPARATOR = re.compile(r"^\|?\s*:?-{2,}:?\s*(\|\s*:?-{2,}:?\s*)*\|?$")
+_RULE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+_INLINE = [
+    (re.compile(r"!?\[([^\]]*)\]\([^)]*\)"), r"\1"),   # links and images keep their text
+    (re.compile(r"`([^`]*)`"), r"\1"),
+    (re.compile(r"\*\*(.+?)\*\*|__(.+?)__"), lambda m: m.group(1) or m.group(2)),
+    (re.compile(r"(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?!\*)"), r"\1"),
+]
+
+
+def plain(value):
+    """Markdown inline markup reduced to the text it displays."""
+    for pattern, replacement in _INLINE:
+        value = pattern.sub(replacement, value)
+    return value.replace("\\|", "|").strip()
+
+
+# ============================================================
+# Sections
+# ============================================================
+def split_sections(markdown, max_level=3):
+    """Yield (level, title, parent titles, body lines) for every heading up to max_level.
+
+    Parent titles leave out the level-1 document title, which every section shares.
+    """
+    level, title, parents, body = 0, "", (), []
+    trail = {}
+    fence = None
+    for line in markdown.splitlines():
+        stripped = line.strip()
+        if fence:
+            if stripped.startswith(fence):
+                fence = None
+        elif stripped.startswith(("```", "~~~")):
+            fence = stripped[:3]
+        else:
+            match = _HEADING.match(line)
+            if match and len(match.group(1)) <= max_level:
+                if title or any(body_line.strip() for body_line in body):
+                    yield level, title, parents, body
+                level, title = len(match.group(1)), plain(match.group(2))
+                trail = {k: v for k, v in trail.items() if k < level}
+                parents = tuple(trail[k] for k in sorted(trail) if k > 1)
+                trail[level] = title
+                body = []
+                continue
+        body.append(line)
+    if title or any(body_line.strip() for body_line in body):
+        yield level, title, parents, body
+
+
+def section_hash(title, parents, body):
+    payload = json.dumps({"compiler": COMPILER_VERSION, "title": title, "parents": parents, "body": body},
+                         ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ============================================================
+# Tokenizer
+# ============================================================
+def _table_cells(line):
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|") and not line.endswith("\\|"):
+        line = line[:-1]
+    return [plain(cell) for cell in re.split(r"(?<!\\)\|", line)]
+
+
+def tokenize(lines):
+    """Block tokens of a section body: (kind, payload) with kind in paragraph/list/code/table/subheading."""
+    blocks = []
+    paragraph, items = [], []
+
+    def flush():
+        if paragraph:
+            # Markdown hard breaks (two trailing spaces) survive as line breaks
+            text_lines, current = [], ""
+            for raw in paragraph:
+                current = f"{current} {raw.strip()}".strip()
+                if raw.endswith("  "):
+                    text_lines.append(current)
+                    current = ""
+            if current:
+                text_lines.append(current)
+            blocks.append(("paragraph", plain("\n".join(text_lines))))
+            paragraph.clear()
+        if items:
+            blocks.append(("list", list(items)))
+            items.clear()
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        if stripped.startswith(">"):
+            # Blockquoted notes and tips read like the text around them
+            line = stripped[2:] if stripped[1:2] == " " else stripped[1:]
+            stripped = line.strip()
+        if stripped.startswith(("```", "~~~")):
+            flush()
+            fence, language, code = stripped[:3], stripped[3:].strip(), []
+            indent = len(line) - len(line.lstrip())
+            i += 1
+            while i < len(lines) and not lines[i].strip().startswith(fence):
+                code.append(lines[i][indent:] if lines[i][:indent].isspace() else lines[i].lstrip())
+                i += 1
+            blocks.append(("code", {"language": language, "lines": code}))
+        elif not stripped or _RULE.match(line):
+            flush()
+        elif stripped.startswith("|"):
+            flush()
+            rows = []
+            while i < len(lines) and lines[i].strip().startswith("|"):
+                if not _TABLE_SEPARATOR.match(lines[i].strip()):
+                    rows.append(_table_cells(lines[i]))
+                i += 1
+            if rows:  # a table of separator lines only has nothing to show
+                width = max(len(row) for row in rows)
+                blocks.append(("table", [row + [""] * (width - len(row)) for row in rows]))
+            continue
+        elif _HEADING.match(line):
+            flush()
+            blocks.append(("subheading", plain(_HEADING.match(line).group(2))))
+        elif _LIST_ITEM.match(line):
+            if paragraph:
+                flush()
+            indent, marker, content = _LIST_ITEM.match(line).groups()
+            depth = len(indent.expandtabs(4)) // 2
+            bullet = marker if marker[0].isdigit() else "•"
+            items.append("    " * min(depth, 3) + f"{bullet}  {plain(content)}")
+        elif items and line[:1].isspace():
+            # Continuation line of the previous list item
+            items[-1] += " " + plain(stripped)
+        else:
+            if items:
+                flush()
+            paragraph.append(line)
+        i += 1
+    flush()
+    return blocks
+
+
+# ============================================================
+# Layout
+# ============================================================
+def _line_height(size):
+    return size * 1.2 / 72
+
+
+def _wrapped_lines(value, width, size, char_width=0.5):
+    per_line = max(int(width / (size * char_width / 72)), 1)
+    return sum(max(math.ceil(len(line) / per_line), 1) for line in value.split("\n"))
+
+
+def _text_height(value, size, width=WIDTH):
+    return _wrapped_lines(value, width - 0.2, size) * _line_height(size) + 0.1
+
+
+def _list_height(items, size=BODY_SIZE):
+    return sum(_text_height(item, size) - 0.1 + 6 / 72 for item in items) + 0.1
+
+
+def _code_height(lines, size):
+    return sum(_wrapped_lines(line, WIDTH - 0.4, size, 0.6) for line in lines or [""]) * _line_height(size) + 0.3
+
+
+def _column_widths(rows):
+    lengths = [max(min(len(row[c]), 60) for row in rows) + 4 for c in range(len(rows[0]))]
+    total = sum(lengths)
+    return [round(WIDTH * length / total, 2) for length in lengths]
+
+
+def _row_height(row, widths, size=TABLE_SIZE):
+    lines = max(_wrapped_lines(cell, width - 0.2, size) for cell, width in zip(row, widths))
+    return lines * _line_height(size) + 0.12
+
+
+class _Pager:
+    """Stacks blocks down the content area, starting a new slide when the next one doesn't fit."""
+
+    def __init__(self, content_top):
+        self.content_top = content_top
+        self.pages = [[]]
+        self.y = content_top
+
+    @property
+    def room(self):
+        return BOTTOM - self.y
+
+    @property
+    def fresh(self):
+        return not self.pages[-1]
+
+    def new_page(self):
+        if not self.fresh:
+            self.pages.append([])
+            self.y = self.content_top
+
+    def place(self, height, make_shapes):
+        if height > self.room and not self.fresh:
+            self.new_page()
+        self.pages[-1] += make_shapes(self.y, height)
+        self.y += height + BLOCK_GAP
+
+
+def _place_paragraph(pager, value):
+    pager.place(_text_height(value, BODY_SIZE),
+                lambda y, h: [text((LEFT, y, WIDTH, h), value, BODY_SIZE, False, "DARK_GRAY")])
+
+
+def _place_subheading(pager, value):
+    height = _text_height(value, BODY_SIZE + 4)
+    # Keep a sub-heading with at least a couple of lines of what follows it
+    if height + 3 * _line_height(BODY_SIZE) > pager.room:
+        pager.new_page()
+    pager.place(height, lambda y, h: [text((LEFT, y, WIDTH, h), value, BODY_SIZE + 4, True, "DARK_BLUE")])
+
+
+def _place_list(pager, items):
+    while items:
+        # Take as many items as fit (at least one on a fresh slide)
+        count = len(items)
+        while count > 1 and _list_height(items[:count]) > pager.room:
+            count -= 1
+        if _list_height(items[:count]) > pager.room and not pager.fresh:
+            pager.new_page()
+            continue
+        chunk, items = items[:count], items[count:]
+        pager.place(_list_height(chunk), lambda y, h: [bullets((LEFT, y, WIDTH, h), chunk, BODY_SIZE, "DARK_GRAY")])
+
+
+def _place_code(pager, lines):
+    # Shrink a block that would fit on one slide at a smaller size rather than splitting it
+    size = CODE_SIZE
+    full_page = BOTTOM - pager.content_top
+    while size > MIN_CODE_SIZE and _code_height(lines, size) > full_page:
+        size -= 1
+    while True:
+        count = len(lines)
+        while count > 1 and _code_height(lines[:count], size) > pager.room:
+            count -= 1
+        if _code_height(lines[:count], size) > pager.room and not pager.fresh:
+            pager.new_page()
+            continue
+        chunk, lines = lines[:count], lines[count:]
+        pager.place(_code_height(chunk, size), lambda y, h: [
+            rect((LEFT, y, WIDTH, h), "LIGHT_GRAY"),
+            text((LEFT + 0.15, y + 0.1, WIDTH - 0.3, h - 0.2), "\n".join(chunk), size, False, "DARK_GRAY",
+                 font=MONO_FONT),
+        ])
+        if not lines:
+            return
+
+
+def _place_table(pager, rows):
+    widths = _column_widths(rows)
+    head, body = rows[0], rows[1:]
+    heights = [_row_height(row, widths) for row in rows]
+    while True:
+        used, count = heights[0], 0
+        while count < len(body) and used + heights[count + 1] <= pager.room:
+            used += heights[count + 1]
+            count += 1
+        if count == 0 and body and not pager.fresh:
+            pager.new_page()
+            continue
+        count = max(count, 1 if body else 0)
+        chunk = [head] + body[:count]
+        height = sum(heights[:1]) + sum(heights[1:count + 1])
+        pager.place(height, lambda y, h: [table((LEFT, y, WIDTH, h), chunk, TABLE_SIZE, "DARK_BLUE", widths)])
+        body, heights = body[count:], heights[:1] + heights[count + 1:]
+        if not body:
+            return
+
+
+PLACERS = {
+    "paragraph": _place_paragraph,
+    "subheading": _place_subheading,
+    "list": _place_list,
+    "code": lambda pager, code: _place_code(pager, code["lines"]),
+    "table": _place_table,
+}
+
+
+def section_slides(title, parents, blocks):
+    """Lay the blocks of one section onto as many appendix slides as they need."""
+    trail = " › ".join(("Lab Guide",) + tuple(parents))
+    pager = _Pager(TOP)
+    for kind, payload in blocks:
+        PLACERS[kind](pager, payload)
+    pages = [page for page in pager.pages if page]
+    slides = []
+    for number, shapes in enumerate(pages, 1):
+        suffix = f" ({number}/{len(pages)})" if len(pages) > 1 else ""
+        slides.append(slide(f"Appendix: {title}{suffix}", header(title + suffix, TITLE_SIZE) + [
+            text((LEFT, 1.3, WIDTH, 0.35), trail, 12, False, "MEDIUM_GRAY"),
+        ] + shapes, background="WHITE"))
+    return slides
+
+
+# ============================================================
+# Incremental compiler
+# ============================================================
+class LabGuideCompiler:
+    """Compiles the guide section by section, reusing the slides of sections whose hash is unchanged."""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._memory = {}
+        self.compiled = self.reused = 0
+
+    def _path(self, digest):
+        return os.path.join(self.cache_dir, f"labguide-{digest}.json")
+
+    def _get(self, digest):
+        slides = self._memory.get(digest)
+        if slides is None and self.cache_dir and os.path.exists(self._path(digest)):
+            with open(self._path(digest), encoding="utf-8") as f:
+                slides = self._memory[digest] = json.load(f)
+        return slides
+
+    def _put(self, digest, slides):
+        self._memory[digest] = slides
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(slides, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(digest))
+
+    def compile(self, markdown):
+        """Appendix slide specs for the whole guide."""
+        self.compiled = self.reused = 0
+        slides = []
+        for level, title, parents, body in split_sections(markdown):
+            if not title or title in SKIPPED_SECTIONS:
+                continue
+            digest = section_hash(title, parents, body)
+            section = self._get(digest)
+            if section is None:
+                section = section_slides(title, parents, tokenize(body))
+                self._put(digest, section)
+                self.compiled += 1
+            else:
+                self.reused += 1
+            slides += section
+        return slides
+
+
+def appendix_slides(path=DEFAULT_GUIDE, compiler=None):
+    """Appendix slides for the lab guide at path."""
+    with open(path, encoding="utf-8") as f:
+        markdown = f.read()
+    return (compiler or LabGuideCompiler()).compile(markdown)
@@ -0,0 +1,161 @@
+"""
+Content-addressed media for picture shapes (screenshots, diagram renders).
+
+Picture specs name a source file and a box on the slide. Before rendering,
+MediaCache.prepare() hashes every source, works out the largest size each
+image is displayed at across the deck (the box at DEFAULT_DPI, never larger
+than the source) and downscales or recompresses it once to that size with
+Pillow, on a thread pool. Screenshots and other flat-color images are
+palette-encoded, photos (JPEG sources) re-encoded as JPEG. The result is
+stored in .slide-cache/ as media-<source sha256>-<width>x<height>.<ext>, so
+later builds and other variants reuse it without opening the source again.
+
+Every use of one source in a deck then points at the same bytes, and
+python-pptx stores identical image bytes as a single package part, so a
+screenshot repeated on several slides is embedded once.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import hashlib
+import io
+import math
+import os
+import shutil
+import tempfile
+
+from PIL import Image
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(SCRIPT_DIR, ".slide-cache")
+
+# Pixels per inch of slide; enough for a projector or a full-screen 1080p/1440p display
+DEFAULT_DPI = 150
+JPEG_QUALITY = 85
+# Sources with at most this many colors (UI screenshots, diagrams) are palette-encoded after
+# resizing; resampling blends their flat colors into thousands and would bloat a plain PNG
+FLAT_COLORS = 4096
+_HASH_CHUNK = 1 << 20
+
+
+def file_digest(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _encode(image, fmt, flat):
+    buffer = io.BytesIO()
+    if image.mode in ("RGBA", "LA") and image.getextrema()[-1] == (255, 255):
+        image = image.convert(image.mode[:-1])  # Opaque alpha channel
+    if fmt == "JPEG":
+        image.convert("RGB").save(buffer, "JPEG", quality=JPEG_QUALITY, optimize=True)
+    else:
+        if flat and image.mode in ("RGB", "RGBA"):
+            image = image.quantize(256, method=Image.Quantize.FASTOCTREE)
+        image.save(buffer, "PNG", optimize=True)
+    return buffer.getvalue()
+
+
+class MediaCache:
+    """Processed images keyed by source hash and pixel size, kept on disk and shared by every build."""
+
+    def __init__(self, cache_dir=CACHE_DIR, dpi=DEFAULT_DPI, workers=None):
+        self.cache_dir = cache_dir
+        self.dpi = dpi
+        self.workers = workers
+        # (abspath, mtime_ns, size) -> (sha256, (width, height), format, source format), so unchanged
+        # files are hashed once
+        self._sources = {}
+        self.processed = self.reused = 0
+
+    def _path(self, digest, size, fmt):
+        return os.path.join(self.cache_dir, f"media-{digest}-{size[0]}x{size[1]}.{'jpg' if fmt == 'JPEG' else 'png'}")
+
+    def _source(self, path):
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        source = self._sources.get(key)
+        if source is None:
+            with Image.open(path) as image:
+                # Anything that isn't a JPEG (screenshots, diagrams) is stored losslessly as PNG
+                fmt = "JPEG" if image.format == "JPEG" else "PNG"
+                size = image.size
+            source = self._sources[key] = (file_digest(path), size, fmt, image.format)
+        return source
+
+    def _target_size(self, box, source_size):
+        """Pixel size that fills box at self.dpi, keeping the aspect ratio and never upscaling."""
+        width, height = source_size
+        scale = min(1.0, box[2] * self.dpi / width, box[3] * self.dpi / height)
+        return max(1, math.ceil(width * scale)), max(1, math.ceil(height * scale))
+
+    def _process(self, path, digest, size, source_size, fmt, source_format):
+        """Write the image at path, resized to size, into the cache; returns (cached path, processed now)."""
+        target = self._path(digest, size, fmt)
+        if os.path.exists(target):
+            return target, False
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                with Image.open(path) as image:
+                    flat = fmt == "PNG" and image.getcolors(FLAT_COLORS) is not None
+                    if size != source_size:
+                        # Palette images would otherwise be resampled with nearest-neighbour
+                        if image.mode not in ("RGB", "RGBA", "L", "LA"):
+                            image = image.convert("RGBA")
+                        image = image.resize(size, Image.LANCZOS)
+                    data = _encode(image, fmt, flat)
+                if source_format == fmt and size == source_size and os.path.getsize(path) <= len(data):
+                    # Already a PNG / JPEG at display size and better compressed than we can do
+                    # (GIF, WebP, BMP... are always re-encoded, so the file matches its extension)
+                    with open(path, "rb") as f:
+                        shutil.copyfileobj(f, out)
+                else:
+                    out.write(data)
+            # Builds running in parallel may race on the same entry; both write the same bytes
+            os.replace(tmp_path, target)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return target, True
+
+    def prepare(self, slides):
+        """Return a copy of slides with every picture pointing at its processed image.
+
+        Each picture shape gains "media" (the cached file) and "pixels" (its
+        width and height), which the renderer uses to fit it in its box.
+        """
+        self.processed = self.reused = 0
+        pictures = [shape for spec in slides for shape in spec["shapes"] if shape["kind"] == "picture"]
+        if not pictures:
+            return slides
+        paths = list(dict.fromkeys(shape["image"] for shape in pictures))
+        with ThreadPoolExecutor(self.workers) as pool:
+            sources = dict(zip(paths, pool.map(self._source, paths)))
+            # One size per distinct image (copies under other names included): the largest it is
+            # shown at, so every use shares the same bytes
+            sizes, first_path = {}, {}
+            for shape in pictures:
+                digest, source_size = sources[shape["image"]][:2]
+                size = self._target_size(shape["box"], source_size)
+                if size > sizes.get(digest, (0, 0)):
+                    sizes[digest] = size
+                first_path.setdefault(digest, shape["image"])
+            jobs = [(path, digest, sizes[digest], *sources[path][1:]) for digest, path in first_path.items()]
+            results = dict(zip(first_path, pool.map(lambda job: self._process(*job), jobs)))
+        self.processed = sum(fresh for _, fresh in results.values())
+        self.reused = len(results) - self.processed
+        prepared = []
+        for spec in slides:
+            if any(shape["kind"] == "picture" for shape in spec["shapes"]):
+                spec = copy.deepcopy(spec)
+                for shape in spec["shapes"]:
+                    if shape["kind"] == "picture":
+                        digest = sources[shape["image"]][0]
+                        shape["media"] = results[digest][0]
+                        shape["pixels"] = list(sizes[digest])
+            prepared.append(spec)
+        return prepared
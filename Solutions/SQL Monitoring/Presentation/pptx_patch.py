@@ -0,0 +1,202 @@
+"""
+Part-level patching of an existing .pptx (or any zip) in place.
+
+patch_package() compares every member of a freshly generated package with
+what the file on disk already holds and rewrites only what changed:
+
+- members up to the first difference are left untouched on disk;
+- unchanged members after it are copied raw (local header and compressed
+  bytes as they are, never decompressed and recompressed);
+- changed and new members are deflated and written; members the new
+  package no longer has are dropped;
+- the central directory is rebuilt and the file truncated after it.
+
+Unchanged members keep their order and changed or new ones move to the end,
+so the parts a rebuild always touches (presentation.xml, [Content_Types].xml,
+the rels) gather at the tail after the first patch, and editing one slide of
+a deck rewrites that slide and whatever follows it, not the whole package.
+Embedded chart workbooks (ppt/embeddings/*.xlsx) carry their creation time,
+so they count as unchanged when everything but that time matches.
+
+The file is modified in place, which is the point on slow or network storage;
+an interrupted patch leaves a broken file that a full build replaces. Only
+plain zips are patched: archives that need zip64 return None so the caller
+can fall back to a full save. Standard library only.
+"""
+import io
+import struct
+import sys
+import time
+import zipfile
+import zlib
+
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+_CENTRAL_HEADER = struct.Struct("<4s6H3L5H2L")
+_END_OF_CENTRAL_DIR = struct.Struct("<4s4H2LH")
+_DATA_DESCRIPTOR_SIGNATURE = b"PK\x07\x08"
+_ZIP32_LIMIT = 0xFFFFFFFF
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+# Same as zipfile.writestr() on this platform
+_CREATE_SYSTEM = 0 if sys.platform == "win32" else 3
+_VERSION = 20
+
+
+def _dos_time(date_time):
+    year, month, day, hour, minute, second = date_time
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+
+def _member_span(f, info):
+    """(start, end) of info's local header, data and data descriptor in f."""
+    f.seek(info.header_offset)
+    fields = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+    end = info.header_offset + _LOCAL_HEADER.size + fields[9] + fields[10] + info.compress_size
+    if info.flag_bits & _FLAG_DATA_DESCRIPTOR:
+        f.seek(end)
+        end += 16 if f.read(4) == _DATA_DESCRIPTOR_SIGNATURE else 12
+    return info.header_offset, end
+
+
+def _workbook_parts(blob):
+    with zipfile.ZipFile(io.BytesIO(blob)) as workbook:
+        return {name: workbook.read(name) for name in workbook.namelist() if name != "docProps/core.xml"}
+
+
+def _same_content(name, old, new):
+    if old == new:
+        return True
+    if name.startswith("ppt/embeddings/") and name.endswith(".xlsx"):
+        try:
+            return _workbook_parts(old) == _workbook_parts(new)
+        except zipfile.BadZipFile:
+            return False
+    return False
+
+
+class _Entry:
+    """One member of the archive being written: its central directory fields and where its bytes come from."""
+
+    def __init__(self, name, flags, method, dos_time, dos_date, crc, compress_size, file_size,
+                 made_by=(_CREATE_SYSTEM << 8) | _VERSION, needed=_VERSION, extra=b"", comment=b"",
+                 internal_attr=0, external_attr=0o600 << 16, raw=None):
+        self.name = name
+        self.flags = flags
+        self.method = method
+        self.dos_time = dos_time
+        self.dos_date = dos_date
+        self.crc = crc
+        self.compress_size = compress_size
+        self.file_size = file_size
+        self.made_by = made_by
+        self.needed = needed
+        self.extra = extra
+        self.comment = comment
+        self.internal_attr = internal_attr
+        self.external_attr = external_attr
+        self.raw = raw
+        self.offset = None
+
+    @classmethod
+    def copied(cls, info, raw):
+        return cls(info.filename, info.flag_bits, info.compress_type, *_dos_time(info.date_time), info.CRC,
+                   info.compress_size, info.file_size, (info.create_system << 8) | info.create_version,
+                   info.extract_version, info.extra, info.comment, info.internal_attr, info.external_attr, raw)
+
+    @classmethod
+    def deflated(cls, name, data, date_time):
+        try:
+            name.encode("ascii")
+            flags = 0
+        except UnicodeEncodeError:
+            flags = _FLAG_UTF8
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        compressed = compressor.compress(data) + compressor.flush()
+        entry = cls(name, flags, zipfile.ZIP_DEFLATED, *_dos_time(date_time), zlib.crc32(data),
+                    len(compressed), len(data))
+        encoded = entry.encoded_name
+        entry.raw = _LOCAL_HEADER.pack(b"PK\x03\x04", entry.needed, flags, entry.method, entry.dos_time,
+                                       entry.dos_date, entry.crc, entry.compress_size, entry.file_size,
+                                       len(encoded), 0) + encoded + compressed
+        return entry
+
+    @property
+    def encoded_name(self):
+        return self.name.encode("utf-8" if self.flags & _FLAG_UTF8 else "cp437")
+
+    def central_header(self):
+        encoded = self.encoded_name
+        return _CENTRAL_HEADER.pack(b"PK\x01\x02", self.made_by, self.needed, self.flags, self.method,
+                                    self.dos_time, self.dos_date, self.crc, self.compress_size, self.file_size,
+                                    len(encoded), len(self.extra), len(self.comment), 0, self.internal_attr,
+                                    self.external_attr, self.offset) + encoded + self.extra + self.comment
+
+
+def patch_package(path, members):
+    """Rewrite the zip at path so it holds exactly members, an iterable of (name, bytes).
+
+    Returns (kept, copied, rewritten, removed, bytes_written): members left in
+    place, copied raw, written from members, and dropped, and the bytes
+    written to path. Returns None, without touching the file, for archives
+    this can't patch (zip64).
+    """
+    members = dict(members)
+    with open(path, "r+b") as f:
+        with zipfile.ZipFile(f) as old:
+            infos = old.infolist()
+            if any(info.file_size >= _ZIP32_LIMIT or info.compress_size >= _ZIP32_LIMIT
+                   or info.header_offset >= _ZIP32_LIMIT for info in infos) or len(members) >= 0xFFFF:
+                return None
+            unchanged = {info.filename for info in infos
+                         if info.filename in members and _same_content(info.filename, old.read(info),
+                                                                       members[info.filename])}
+        spans = [_member_span(f, info) for info in infos]
+
+        # Unchanged members in their existing order, then changed and new ones, so parts that change
+        # on every build (presentation.xml, [Content_Types].xml) settle at the tail. Everything before
+        # the first member that moves or changes stays where it is.
+        order = [info.filename for info in infos if info.filename in unchanged]
+        order += [info.filename for info in infos if info.filename in members and info.filename not in unchanged]
+        existing = set(order)
+        order += [name for name in members if name not in existing]
+        kept = 0
+        while (kept < len(infos) and kept < len(order) and order[kept] == infos[kept].filename
+               and order[kept] in unchanged):
+            kept += 1
+        if kept == len(infos) == len(order):
+            return kept, 0, 0, 0, 0
+        start = spans[kept - 1][1] if kept else 0
+
+        by_name = {info.filename: (info, span) for info, span in zip(infos, spans)}
+        now = time.localtime(time.time())[:6]
+        entries = []
+        for name in order[kept:]:
+            if name in unchanged:
+                info, (begin, end) = by_name[name]
+                f.seek(begin)
+                entries.append(_Entry.copied(info, f.read(end - begin)))
+            else:
+                entries.append(_Entry.deflated(name, members[name], now))
+        if start + sum(len(entry.raw) for entry in entries) >= _ZIP32_LIMIT:
+            return None
+
+        f.seek(start)
+        central = io.BytesIO()
+        for info, (begin, _) in zip(infos[:kept], spans):
+            entry = _Entry.copied(info, None)
+            entry.offset = begin
+            central.write(entry.central_header())
+        for entry in entries:
+            entry.offset = f.tell()
+            f.write(entry.raw)
+            central.write(entry.central_header())
+        directory_offset = f.tell()
+        f.write(central.getbuffer())
+        count = kept + len(entries)
+        f.write(_END_OF_CENTRAL_DIR.pack(b"PK\x05\x06", 0, 0, count, count, central.tell(), directory_offset, 0))
+        f.truncate()
+        written = f.tell() - start
+
+    copied = sum(1 for name in order[kept:] if name in unchanged)
+    removed = len(infos) - sum(1 for info in infos if info.filename in members)
+    return kept, copied, len(order) - kept - copied, removed, written
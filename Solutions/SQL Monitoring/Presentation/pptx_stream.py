@@ -0,0 +1,190 @@
+"""
+Bounded-memory .pptx writer for very large generated decks.
+
+python-pptx keeps every slide's XML tree in the Presentation until save(),
+so memory grows with the slide count. StreamingPresentation hands out
+ordinary python-pptx slides, drawn with the same add_* helpers as
+generate_pptx.py, but as soon as the next slide is started (or the writer is
+closed) the finished slide is serialized into the output zip, together with
+the charts, embedded workbooks and images it references, and detached from
+the presentation so its tree is freed. presentation.xml, its rels and
+[Content_Types].xml are written at close, from the template's parts plus a
+part name and content type per slide already written.
+
+    with StreamingPresentation("appendix.pptx") as deck:
+        for database in databases:
+            slide = deck.add_slide()
+            add_text_box(slide, ...)
+
+stream_presentation() does build_presentation() and save_presentation() in
+one pass for a list of slide specs, with the same slide cache (kept on disk
+only, so it doesn't grow either). Images are shared across slides by SHA-1,
+as python-pptx does within a package. The deck is written to a temporary file
+next to the output and moved into place on close.
+"""
+import os
+import re
+import tempfile
+import zipfile
+
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI, PackURI
+from pptx.opc.serialized import _ContentTypesItem
+from pptx.oxml import parse_xml
+from pptx.parts.image import ImagePart
+
+from deck_spec import PALETTE
+from generate_pptx import DEFAULT_TEMPLATE, SlideCache, fill_slide, load_template, prepare_media
+
+_NUMBERED = re.compile(r"^(.*?)(\d+)(\.\w+)$")
+
+
+class _WrittenPart:
+    """What [Content_Types].xml needs from a part that is already in the zip."""
+    __slots__ = ("partname", "content_type")
+
+    def __init__(self, partname, content_type):
+        self.partname = partname
+        self.content_type = content_type
+
+
+class StreamingPresentation:
+    """Writes each slide to output_path as soon as it is finished; see the module docstring."""
+
+    def __init__(self, output_path, template_path=DEFAULT_TEMPLATE):
+        self.prs = load_template(template_path)
+        self.output_path = output_path
+        self.slide_count = 0
+        self._layout = self.prs.slide_layouts[6]  # Blank
+        self._package = self.prs.part.package
+        self._template_parts = set(self._package.iter_parts())
+        self._sldIdLst = self.prs.slides._sldIdLst
+        self._first_slide = len(self._sldIdLst)
+        # Highest number used per partname prefix (/ppt/charts/chart, /ppt/media/image, ...)
+        self._numbers = {}
+        for part in self._template_parts:
+            match = _NUMBERED.match(part.partname)
+            if match:
+                self._numbers[match.group(1)] = max(self._numbers.get(match.group(1), 0), int(match.group(2)))
+        self._images = {}
+        self._written = []
+        self._slides = []
+        self._pending = None
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        fd, self._tmp_path = tempfile.mkstemp(dir=output_dir, prefix=".~", suffix=".pptx")
+        os.close(fd)
+        self._zip = zipfile.ZipFile(self._tmp_path, "w", zipfile.ZIP_DEFLATED)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def add_slide(self, layout=None):
+        """Write out the previous slide and start a new one on layout (default: Blank)."""
+        self._flush()
+        slide = self.prs.slides.add_slide(layout or self._layout)
+        # Only this Slide object ever touches the new slide, so shape ids can be counted instead of searched
+        slide.shapes.turbo_add_enabled = True
+        self._pending = slide
+        return slide
+
+    def _next_partname(self, partname):
+        match = _NUMBERED.match(partname)
+        prefix, ext = match.group(1), match.group(3)
+        number = self._numbers[prefix] = self._numbers.get(prefix, 0) + 1
+        return PackURI(f"{prefix}{number}{ext}")
+
+    def _write(self, membername, blob):
+        self._zip.writestr(membername, blob)
+
+    def _flush(self):
+        slide, self._pending = self._pending, None
+        if slide is None:
+            return
+        self.slide_count += 1
+        slide_part = slide.part
+        slide_part.partname = PackURI(f"/ppt/slides/slide{self._first_slide + self.slide_count}.xml")
+
+        # Everything this slide added to the package: charts, their workbooks, images
+        parts = [slide_part]
+        seen = {slide_part}
+        for part in parts:
+            for rel in part.rels.values():
+                if not rel.is_external and rel.target_part not in seen and rel.target_part not in self._template_parts:
+                    seen.add(rel.target_part)
+                    parts.append(rel.target_part)
+
+        # Name every part before serializing any rels, since rels refer to the targets' names
+        new_parts = [slide_part]
+        for part in parts[1:]:
+            if isinstance(part, ImagePart):
+                existing = self._images.get(part.sha1)
+                if existing is not None:
+                    part.partname = existing
+                    continue
+                part.partname = self._images[part.sha1] = self._next_partname(part.partname)
+            else:
+                part.partname = self._next_partname(part.partname)
+            new_parts.append(part)
+
+        for part in new_parts:
+            self._write(part.partname.membername, part.blob)
+            if len(part.rels):
+                self._write(part.partname.rels_uri.membername, part.rels.xml)
+            self._written.append(_WrittenPart(part.partname, part.content_type))
+        self._slides.append(slide_part.partname)
+
+        # Detach the slide; nothing refers to its part any more, so its tree can be freed
+        sldId = self._sldIdLst[-1]
+        self._sldIdLst.remove(sldId)
+        self.prs.part.drop_rel(sldId.rId)
+
+    def close(self):
+        """Write the last slide and the package-level parts, then move the deck into place."""
+        self._flush()
+        prs_part = self.prs.part
+
+        # The presentation's own relationships, then one per written slide
+        rels = parse_xml(prs_part.rels.xml)
+        last_rId = max((int(rId[3:]) for rId in prs_part.rels.keys() if rId[3:].isdigit()), default=0)
+        last_id = max((sldId.id for sldId in self._sldIdLst), default=255)
+        for number, partname in enumerate(self._slides, 1):
+            rId = f"rId{last_rId + number}"
+            rels.add_rel(rId, RT.SLIDE, partname.relative_ref(prs_part.partname.baseURI), False)
+            self._sldIdLst._add_sldId(id=last_id + number, rId=rId)
+
+        parts = list(self._package.iter_parts())
+        self._write(CONTENT_TYPES_URI.membername,
+                    serialize_part_xml(_ContentTypesItem.xml_for(parts + self._written)))
+        self._write(PACKAGE_URI.rels_uri.membername, self._package._rels.xml)
+        for part in parts:
+            self._write(part.partname.membername, part.blob)
+            if part is prs_part:
+                self._write(part.partname.rels_uri.membername, rels.xml_file_bytes)
+            elif len(part.rels):
+                self._write(part.partname.rels_uri.membername, part.rels.xml)
+        self._zip.close()
+        os.replace(self._tmp_path, self.output_path)
+
+    def abort(self):
+        """Discard the partly written deck."""
+        self._zip.close()
+        os.unlink(self._tmp_path)
+
+
+def stream_presentation(slides, output_path, palette=PALETTE, cache=None, media=None,
+                        template_path=DEFAULT_TEMPLATE):
+    """Render slide specs straight into output_path. Returns (rendered, cached) like build_presentation()."""
+    cache = cache if cache is not None else SlideCache(memory=False)
+    slides = prepare_media(slides, media)
+    rendered = 0
+    with StreamingPresentation(output_path, template_path) as deck:
+        for spec in slides:
+            rendered += fill_slide(deck.add_slide(), spec, cache, palette)
+    return rendered, len(slides) - rendered
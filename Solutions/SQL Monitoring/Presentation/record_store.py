@@ -0,0 +1,506 @@
+"""
+Local columnar store of SQLServerMonitoring_CL records.
+
+Exports are parsed once (sql_export.read_records) and appended to a store
+directory, after which reports read only the rows they need:
+
+    store/
+      meta.json                  segments, ingested files, per-instance watermarks
+      dictionaries.json          string dictionaries (append-only, so codes never change)
+      segments/000001/<Column>.npy
+      segments/000001/index.npy  sorted (SqlInstance, TimeGenerated) key
+      segments/000001/instances.npy  instance codes present in the segment
+
+String columns are dictionary-encoded to uint32 codes, timestamps are int64
+epoch seconds (-1 when empty) and the runbook's counters are int32/int64. Each
+column is a plain .npy file opened with mmap_mode="r", so a query maps only the
+columns it touches and the OS pages in only the rows it reads. Rows within a
+segment are sorted by (SqlInstance, TimeGenerated) and index.npy holds that
+composite key, so an instance / time-window filter is two searchsorted calls
+per segment instead of a scan.
+
+Ingestion is append-only: each batch of new records becomes a new immutable
+segment, files already ingested (same content) are skipped, and rows older
+than an instance's watermark (the newest TimeGenerated stored for it), or at
+it and already stored, are dropped, so overlapping exports can be ingested
+without duplicates. compact() merges the segments into one.
+
+    python record_store.py ingest .record-store export-*.jsonl.gz
+    python record_store.py latest .record-store --instance SQLVM00042 --output latest.jsonl
+    python record_store.py critical .record-store --days 7
+    python generate_pptx.py --store .record-store --since 2026-02-01
+"""
+import hashlib
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from sql_export import COLUMNS, ERROR_DATABASE, TIME_COLUMNS, normalize_time, read_records
+
+STORE_VERSION = 1
+DEFAULT_STORE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".record-store")
+
+NUMERIC_COLUMNS = {
+    "InstanceUptimeSeconds": np.int64, "InstanceUptimeMinutes": np.int32, "InstanceUptimeHours": np.int32,
+    "InstanceUptimeDays": np.int32, "HoursSinceFullBackup": np.int32, "MinutesSinceLogBackup": np.int32,
+}
+STRING_COLUMNS = [c for c in COLUMNS if c not in TIME_COLUMNS and c not in NUMERIC_COLUMNS]
+
+# index = instance code << TIME_BITS | TimeGenerated (epoch seconds, good until 2514)
+TIME_BITS = 34
+DAY = 86400
+
+
+def _write_json(path, data):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def to_epoch(values):
+    """ISO timestamps ("yyyy-MM-ddTHH:mm:ss[.fff]Z") to int64 epoch seconds, -1 for empty."""
+    text = np.array([value[:19] for value in values], dtype="U19")
+    empty = text == ""
+    text[empty] = "1970-01-01T00:00:00"
+    epochs = text.astype("datetime64[s]").astype(np.int64)
+    epochs[empty] = -1
+    return epochs
+
+
+def from_epoch(epochs):
+    """int64 epoch seconds back to the runbook's "yyyy-MM-ddTHH:mm:ssZ" ("" for -1)."""
+    # Few distinct values per column (one TimeGenerated per collection), so format each once
+    unique, inverse = np.unique(epochs, return_inverse=True)
+    text = np.char.add(np.datetime_as_string(np.maximum(unique, 0).astype("datetime64[s]"), unit="s"), "Z")
+    return np.where(unique < 0, "", text).astype(object)[inverse]
+
+
+def to_epoch_value(value):
+    """One timestamp (a --since / --start bound) as epoch seconds."""
+    return int(to_epoch([normalize_time(value)])[0])
+
+
+class Dictionary:
+    """Append-only dictionary encoding of one string column."""
+
+    def __init__(self, values=()):
+        self.values = list(values)
+        self.index = {value: code for code, value in enumerate(self.values)}
+        self._array = None
+
+    def encode(self, values):
+        index = self.index
+        for value in set(values).difference(index):
+            index[value] = len(self.values)
+            self.values.append(value)
+            self._array = None
+        return np.fromiter(map(index.__getitem__, values), dtype=np.uint32, count=len(values))
+
+    def decode(self, codes):
+        if self._array is None:
+            self._array = np.array(self.values, dtype=object)
+        return self._array[codes]
+
+    def code(self, value):
+        return self.index.get(value)
+
+    def __len__(self):
+        return len(self.values)
+
+
+class Segment:
+    """One immutable, sorted batch of rows; columns are memory-mapped on first use."""
+
+    def __init__(self, path, rows):
+        self.path = path
+        self.rows = rows
+        self._columns = {}
+
+    def column(self, name):
+        array = self._columns.get(name)
+        if array is None:
+            array = self._columns[name] = np.load(os.path.join(self.path, name + ".npy"), mmap_mode="r")
+        return array
+
+    @property
+    def index(self):
+        return self.column("index")
+
+    def select(self, instance_codes=None, start=None, end=None):
+        """Row numbers for the given instances (None for all) and TimeGenerated window, in index order."""
+        index = self.index
+        if instance_codes is None:
+            if start is None and end is None:
+                return np.arange(self.rows)
+            instance_codes = self.column("instances")
+        codes = np.asarray(instance_codes, dtype=np.int64) << TIME_BITS
+        low = np.searchsorted(index, codes | (max(start, 0) if start is not None else 0), "left")
+        high = np.searchsorted(index, codes | (end if end is not None else (1 << TIME_BITS) - 1), "right")
+        lengths = high - low
+        if not lengths.sum():
+            return np.zeros(0, dtype=np.int64)
+        # Concatenate the [low, high) ranges without a Python loop
+        offsets = np.repeat(low - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+        return offsets + np.arange(lengths.sum())
+
+
+class RecordStore:
+    """A directory of columnar segments with shared dictionaries; see the module docstring."""
+
+    def __init__(self, path=DEFAULT_STORE, create=False):
+        """Open the store at path; a missing store is an error unless create is set (ingest)."""
+        self.path = path
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                self.meta = json.load(f)
+            if self.meta.get("version") != STORE_VERSION:
+                raise ValueError(f"{path} is a version {self.meta.get('version')} store; expected {STORE_VERSION}")
+            with open(os.path.join(path, "dictionaries.json"), encoding="utf-8") as f:
+                values = json.load(f)
+        elif create:
+            os.makedirs(os.path.join(path, "segments"), exist_ok=True)
+            self.meta = {"version": STORE_VERSION, "segments": [], "sources": {}, "watermarks": {}}
+            values = {}
+        else:
+            raise FileNotFoundError(f"No record store at {path} (create one with: record_store.py ingest {path} ...)")
+        self.dictionaries = {column: Dictionary(values.get(column, ())) for column in STRING_COLUMNS}
+        self.segments = [Segment(os.path.join(path, "segments", s["name"]), s["rows"]) for s in self.meta["segments"]]
+
+    @property
+    def rows(self):
+        return sum(segment.rows for segment in self.segments)
+
+    @property
+    def instances(self):
+        return self.dictionaries["SqlInstance"]
+
+    def _save(self):
+        _write_json(os.path.join(self.path, "dictionaries.json"),
+                    {column: d.values for column, d in self.dictionaries.items()})
+        _write_json(os.path.join(self.path, "meta.json"), self.meta)
+
+    # ------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------
+    def ingest(self, paths, chunk_size=1_000_000):
+        """Append the records of export files not ingested before; returns (files, rows added, rows skipped)."""
+        files = added = skipped = 0
+        for path in paths:
+            digest = file_digest(path)
+            if digest in self.meta["sources"]:
+                continue
+            file_added, file_skipped = self.ingest_records(read_records(path), chunk_size)
+            self.meta["sources"][digest] = {"path": os.path.abspath(path), "rows": file_added,
+                                            "ingested": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())}
+            self._save()
+            files += 1
+            added += file_added
+            skipped += file_skipped
+        return files, added, skipped
+
+    def ingest_records(self, records, chunk_size=1_000_000):
+        """Append normalized records (sql_export.normalize shape); returns (rows added, rows skipped)."""
+        added = skipped = 0
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) == chunk_size:
+                result = self._append(chunk)
+                added, skipped, chunk = added + result[0], skipped + result[1], []
+        if chunk:
+            result = self._append(chunk)
+            added, skipped = added + result[0], skipped + result[1]
+        self._save()
+        return added, skipped
+
+    def _append(self, records):
+        columns = {}
+        for column in STRING_COLUMNS:
+            columns[column] = self.dictionaries[column].encode([r[column] for r in records])
+        for column in TIME_COLUMNS:
+            columns[column] = to_epoch([r[column] for r in records])
+        for column, dtype in NUMERIC_COLUMNS.items():
+            columns[column] = np.fromiter((r[column] for r in records), dtype=dtype, count=len(records))
+        if (columns["TimeGenerated"] < 0).any():
+            raise ValueError("Records without TimeGenerated can't be stored")
+
+        instance = columns["SqlInstance"].astype(np.int64)
+        index = (instance << TIME_BITS) | columns["TimeGenerated"]
+        database = columns["DatabaseName"].astype(np.int64)
+        # Drop rows before their instance's watermark (already stored) and rows
+        # at it that are stored too (an export can end partway through a
+        # collection), then exact duplicates within the batch, and sort by
+        # (SqlInstance, TimeGenerated)
+        watermarks = np.full(len(self.instances), -1, dtype=np.int64)
+        for name, epoch in self.meta["watermarks"].items():
+            watermarks[self.instances.code(name)] = epoch
+        keep = columns["TimeGenerated"] >= watermarks[instance]
+        at_watermark = np.flatnonzero(keep & (columns["TimeGenerated"] == watermarks[instance]))
+        if len(at_watermark):
+            stored = self._stored_at(np.unique(instance[at_watermark]), watermarks)
+            keep[at_watermark[np.isin((instance[at_watermark] << 32) | database[at_watermark], stored)]] = False
+        order = np.flatnonzero(keep)
+        order = order[np.lexsort((database[order], index[order]))]
+        duplicate = np.zeros(len(order), dtype=bool)
+        duplicate[1:] = (index[order][1:] == index[order][:-1]) & (database[order][1:] == database[order][:-1])
+        order = order[~duplicate]
+        skipped = len(records) - len(order)
+        if not len(order):
+            return 0, skipped
+
+        name = f"{len(self.meta['segments']) + 1:06d}"
+        while os.path.exists(os.path.join(self.path, "segments", name)):
+            name = f"{int(name) + 1:06d}"
+        self._write_segment(name, {column: values[order] for column, values in columns.items()}, index[order])
+
+        last = np.full(len(self.instances), -1, dtype=np.int64)
+        np.maximum.at(last, instance[order], columns["TimeGenerated"][order])
+        for code in np.flatnonzero(last >= 0):
+            self.meta["watermarks"][self.instances.values[code]] = int(max(last[code], watermarks[code]))
+        return len(order), skipped
+
+    def _stored_at(self, codes, watermarks):
+        """(instance << 32 | database) keys of the rows stored at each instance's watermark."""
+        keys = [np.zeros(0, dtype=np.int64)]
+        bounds = (codes.astype(np.int64) << TIME_BITS) | watermarks[codes]
+        for segment in self.segments:
+            low = np.searchsorted(segment.index, bounds, "left")
+            high = np.searchsorted(segment.index, bounds, "right")
+            for code, lo, hi in zip(codes.tolist(), low.tolist(), high.tolist()):
+                if hi > lo:
+                    keys.append((code << 32) | np.asarray(segment.column("DatabaseName")[lo:hi], dtype=np.int64))
+        return np.concatenate(keys)
+
+    def _write_segment(self, name, columns, index):
+        final = os.path.join(self.path, "segments", name)
+        staging = tempfile.mkdtemp(dir=os.path.join(self.path, "segments"), prefix=".tmp-")
+        try:
+            for column, values in columns.items():
+                np.save(os.path.join(staging, column + ".npy"), values)
+            np.save(os.path.join(staging, "index.npy"), index)
+            np.save(os.path.join(staging, "instances.npy"), np.unique(index >> TIME_BITS))
+            os.replace(staging, final)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        rows = len(index)
+        self.meta["segments"].append({"name": name, "rows": rows, "min_time": int((index & ((1 << TIME_BITS) - 1)).min()),
+                                      "max_time": int((index & ((1 << TIME_BITS) - 1)).max())})
+        self.segments.append(Segment(final, rows))
+
+    def compact(self):
+        """Merge all segments into one; returns the number of segments merged."""
+        if len(self.segments) < 2:
+            return len(self.segments)
+        merged = {column: np.concatenate([np.asarray(s.column(column)) for s in self.segments]) for column in COLUMNS}
+        index = np.concatenate([np.asarray(s.index) for s in self.segments])
+        order = np.argsort(index, kind="stable")
+        old = self.segments
+        self.meta["segments"], self.segments = [], []
+        name = f"{max(int(os.path.basename(s.path)) for s in old) + 1:06d}"
+        self._write_segment(name, {column: values[order] for column, values in merged.items()}, index[order])
+        self._save()
+        for segment in old:
+            segment._columns.clear()
+            shutil.rmtree(segment.path, ignore_errors=True)
+        return len(old)
+
+    # ------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------
+    def _instance_codes(self, instances):
+        if instances is None:
+            return None
+        codes = [self.instances.code(name) for name in instances]
+        return [code for code in codes if code is not None]
+
+    def _scan_segments(self, instances, start, end):
+        """Yield (segment, selected row numbers) for every segment overlapping [start, end]."""
+        start = to_epoch_value(start) if isinstance(start, str) else start
+        end = to_epoch_value(end) if isinstance(end, str) else end
+        # The index packs whole seconds, so fractional bounds (e.g. days=0.5) round inwards
+        start = math.ceil(start) if start is not None else None
+        end = math.floor(end) if end is not None else None
+        codes = self._instance_codes(instances)
+        for segment, info in zip(self.segments, self.meta["segments"]):
+            if (start is not None and info["max_time"] < start) or (end is not None and info["min_time"] > end):
+                continue
+            yield segment, segment.select(codes, start, end)
+
+    def scan(self, columns=COLUMNS, instances=None, start=None, end=None):
+        """Column arrays (codes for strings, epochs for times) of the rows for instances in [start, end].
+
+        start / end are ISO timestamps or epoch seconds; only segments
+        overlapping the window are touched and only the named columns are read.
+        """
+        parts = {column: [] for column in columns}
+        for segment, rows in self._scan_segments(instances, start, end):
+            for column in columns:
+                parts[column].append(np.asarray(segment.column(column)[rows]))
+        return {column: np.concatenate(arrays) if arrays else np.zeros(0, dtype=self._dtype(column))
+                for column, arrays in parts.items()}
+
+    def _dtype(self, column):
+        if column in NUMERIC_COLUMNS:
+            return NUMERIC_COLUMNS[column]
+        return np.int64 if column in TIME_COLUMNS else np.uint32
+
+    def decode(self, columns):
+        """Turn scan() arrays into lists of record values (strings and ints, as sql_export yields them)."""
+        decoded = {}
+        for column, values in columns.items():
+            if column in STRING_COLUMNS:
+                decoded[column] = self.dictionaries[column].decode(values).tolist()
+            elif column in TIME_COLUMNS:
+                decoded[column] = from_epoch(values).tolist()
+            else:
+                decoded[column] = values.tolist()
+        return decoded
+
+    def records(self, instances=None, start=None, end=None, chunk_size=100_000):
+        """Yield the selected rows as sql_export-style record dicts, segment by segment.
+
+        Within a segment rows come instance by instance in time order. Only
+        chunk_size rows are decoded at a time, so memory stays flat however
+        large the selection is.
+        """
+        for segment, rows in self._scan_segments(instances, start, end):
+            for offset in range(0, len(rows), chunk_size):
+                chunk = rows[offset:offset + chunk_size]
+                decoded = self.decode({column: np.asarray(segment.column(column)[chunk]) for column in COLUMNS})
+                for values in zip(*(decoded[column] for column in COLUMNS)):
+                    yield dict(zip(COLUMNS, values))
+
+    def latest_per_database(self, instances=None, start=None, end=None):
+        """The newest record of every (SqlInstance, DatabaseName) in the window, _ERROR rows excluded."""
+        columns = self.scan(COLUMNS, instances, start, end)
+        error = self.dictionaries["DatabaseName"].code(ERROR_DATABASE)
+        rows = np.flatnonzero(columns["DatabaseName"] != (error if error is not None else -1))
+        key = (columns["SqlInstance"][rows].astype(np.int64) << 32) | columns["DatabaseName"][rows]
+        order = rows[np.lexsort((columns["TimeGenerated"][rows], key))]
+        key = (columns["SqlInstance"][order].astype(np.int64) << 32) | columns["DatabaseName"][order]
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = key[1:] != key[:-1]
+        latest = self.decode({column: values[order[last]] for column, values in columns.items()})
+        return [dict(zip(COLUMNS, values)) for values in zip(*(latest[column] for column in COLUMNS))]
+
+    def instances_with_status(self, status="Critical", days=7, end=None):
+        """{SqlInstance: sorted database names} with a FullBackupAlertStatus of status in the last days.
+
+        The window ends at end (default: the newest record stored).
+        """
+        if not self.segments:
+            return {}
+        end = to_epoch_value(end) if isinstance(end, str) else end
+        if end is None:
+            end = max(info["max_time"] for info in self.meta["segments"])
+        code = self.dictionaries["FullBackupAlertStatus"].code(status)
+        if code is None:
+            return {}
+        columns = self.scan(["SqlInstance", "DatabaseName", "FullBackupAlertStatus"], start=end - days * DAY, end=end)
+        hit = columns["FullBackupAlertStatus"] == code
+        pairs = np.unique((columns["SqlInstance"][hit].astype(np.int64) << 32) | columns["DatabaseName"][hit])
+        result = {}
+        names, databases = self.instances.values, self.dictionaries["DatabaseName"].values
+        for pair in pairs.tolist():
+            result.setdefault(names[pair >> 32], []).append(databases[pair & 0xFFFFFFFF])
+        return {instance: sorted(dbs) for instance, dbs in sorted(result.items())}
+
+    def describe(self):
+        times = [(info["min_time"], info["max_time"]) for info in self.meta["segments"]]
+        span = ""
+        if times:
+            first, last = from_epoch(np.array([min(t[0] for t in times), max(t[1] for t in times)]))
+            span = f", {first} to {last}"
+        return (f"{self.rows:,} rows in {len(self.segments)} segment(s), {len(self.instances.values):,} instances, "
+                f"{len(self.dictionaries['DatabaseName'].values):,} database names, "
+                f"{len(self.meta['sources'])} export(s) ingested{span}")
+
+
+def _write_records(records, output):
+    f = sys.stdout if output == "-" else open(output, "w", encoding="utf-8")
+    try:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Columnar store of SQLServerMonitoring_CL exports")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="Append new exports (.jsonl/.csv, optionally .gz)")
+    ingest.add_argument("store")
+    ingest.add_argument("exports", nargs="+")
+
+    info = commands.add_parser("info", help="Summarize the store")
+    info.add_argument("store")
+
+    compact = commands.add_parser("compact", help="Merge all segments into one")
+    compact.add_argument("store")
+
+    latest = commands.add_parser("latest", help="Latest record per database as JSONL")
+    latest.add_argument("store")
+    latest.add_argument("--instance", action="append", help="Only these instances; repeatable")
+    latest.add_argument("--since", help="Only records at or after this ISO timestamp")
+    latest.add_argument("--output", default="-")
+
+    status = commands.add_parser("critical", help="Instances with databases in a backup status in the last days")
+    status.add_argument("store")
+    status.add_argument("--status", default="Critical")
+    status.add_argument("--days", type=float, default=7)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        store = RecordStore(args.store, create=args.command == "ingest")
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    if args.command == "ingest":
+        files, added, skipped = store.ingest(args.exports)
+        print(f"Ingested {files} new export(s): {added:,} rows added, {skipped:,} already stored")
+        print(store.describe())
+    elif args.command == "info":
+        print(store.describe())
+    elif args.command == "compact":
+        merged = store.compact()
+        print(f"Merged {merged} segment(s); {store.describe()}")
+    elif args.command == "latest":
+        records = store.latest_per_database(args.instance, args.since)
+        _write_records(records, args.output)
+        print(f"{len(records):,} database(s)", file=sys.stderr)
+    else:
+        instances = store.instances_with_status(args.status, args.days)
+        for instance, databases in instances.items():
+            print(f"{instance}\t{len(databases)}\t{', '.join(databases[:10])}{' …' if len(databases) > 10 else ''}")
+        print(f"{len(instances):,} instance(s) with {args.status} backups in the last {args.days:g} day(s)",
+              file=sys.stderr)
+    print(f"({time.perf_counter() - started:.2f}s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
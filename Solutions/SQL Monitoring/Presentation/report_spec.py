@@ -0,0 +1,137 @@
+"""
+Data-driven report slides built from SQLServerMonitoring_CL exports.
+
+Takes a sql_aggregate.FleetAggregate and yields the Summary-tab KPI and
+backup-age slides plus paginated backup-compliance and uptime tables (one row
+per instance, read from the aggregate's per-instance arrays) as slide specs in
+the same format as deck_spec, so they go through the same renderer and slide
+cache.
+"""
+from deck_spec import chart, header, rounded, slide, table, text
+from sql_export import BACKUP_STATUSES
+
+ROWS_PER_SLIDE = 14
+TABLE_BOX = (0.5, 1.9, 12.3, 5.3)
+
+STATUS_COLORS = {"OK": "GREEN", "Warning": "ORANGE", "Critical": "RED", "Never": "MEDIUM_GRAY"}
+MODEL_COLORS = ["AZURE_BLUE", "ORANGE", "6A1B9A", "43A047", "MEDIUM_GRAY"]
+
+COMPLIANCE_COLUMNS = ["SQL Instance", "Databases", "OK", "Warning", "Critical", "Never", "Errors", "Compliance"]
+COMPLIANCE_WIDTHS = [4.1, 1.2, 1.0, 1.1, 1.1, 1.0, 1.0, 1.8]
+
+UPTIME_COLUMNS = ["SQL Instance", "Server", "SQL Version", "Uptime", "Last Start", "Restarts", "Errors", "Last Seen"]
+UPTIME_WIDTHS = [2.4, 1.6, 2.5, 1.0, 1.6, 0.9, 0.8, 1.5]
+
+
+def _pages(items, size=ROWS_PER_SLIDE):
+    page = []
+    for item in items:
+        page.append(item)
+        if len(page) == size:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+def _short_time(value):
+    # "2026-02-25T10:00:00Z" -> "2026-02-25 10:00"
+    return value[:16].replace("T", " ") if value else "—"
+
+
+def _fleet_line(aggregate):
+    databases = aggregate.database_count
+    compliant = int(aggregate.compliant_by_instance.sum())
+    overall = f"{100.0 * compliant / databases:.1f}%" if databases else "n/a"
+    return (f"{aggregate.instance_count} instances  •  {databases} databases  •  {overall} backup compliance  •  "
+            f"{aggregate.failing_instances} instances with connection errors")
+
+
+def _paged_slides(name, title, columns, widths, rows_of_page, fleet_line):
+    page_count = max((len(rows_of_page) + ROWS_PER_SLIDE - 1) // ROWS_PER_SLIDE, 1)
+    for page_number, page in enumerate(_pages(rows_of_page), 1):
+        suffix = f" ({page_number}/{page_count})" if page_count > 1 else ""
+        rows = [columns] + page
+        yield slide(f"{name} {page_number}", header(title + suffix) + [
+            text((0.5, 1.35, 12.3, 0.4), fleet_line, 14, False, "MEDIUM_GRAY"),
+            table(TABLE_BOX, rows, 11, "DARK_BLUE", widths),
+        ], background="WHITE")
+
+
+def backup_compliance_slides(aggregate):
+    """Instances ordered worst compliance first; unreachable instances lead."""
+    names = aggregate.instance_names
+    compliance = aggregate.instance_compliance()
+    counts = aggregate.status_by_instance[:, :len(BACKUP_STATUSES)].tolist()
+    databases = aggregate.databases_by_instance.tolist()
+    errors = aggregate.errors_by_instance.tolist()
+    order = sorted(range(len(names)), key=lambda i: (-1 if compliance[i] is None else compliance[i], names[i]))
+    rows = [[names[i], databases[i], *counts[i], errors[i], "n/a" if compliance[i] is None else f"{compliance[i]}%"]
+            for i in order]
+    return _paged_slides("Backup Compliance", "Backup Compliance by Instance", COMPLIANCE_COLUMNS,
+                         COMPLIANCE_WIDTHS, rows, _fleet_line(aggregate))
+
+
+def uptime_slides(aggregate):
+    """Instances ordered by most recent restart first."""
+    names = aggregate.instance_names
+    days = aggregate.uptime_days_by_instance.tolist()
+    hours = aggregate.uptime_hours_by_instance.tolist()
+    restarts = aggregate.restarts_by_instance.tolist()
+    errors = aggregate.errors_by_instance.tolist()
+    order = sorted(range(len(names)), key=lambda i: (days[i] < 0, days[i], names[i]))
+    rows = [[names[i], aggregate.server_by_instance[i] or "—", aggregate.version_by_instance[i][:40] or "—",
+             f"{days[i]}d {hours[i] % 24}h" if days[i] >= 0 else "—", _short_time(aggregate.start_by_instance[i]),
+             restarts[i], errors[i], _short_time(aggregate.last_seen_by_instance[i])]
+            for i in order]
+    return _paged_slides("Instance Uptime", "SQL Instance Uptime", UPTIME_COLUMNS,
+                         UPTIME_WIDTHS, rows, _fleet_line(aggregate))
+
+
+def report_slides(aggregate):
+    """The per-instance report tables, compliance first."""
+    yield from backup_compliance_slides(aggregate)
+    yield from uptime_slides(aggregate)
+
+
+def _percentile_line(label, percentiles, unit):
+    if not percentiles:
+        return f"{label}: no data"
+    return f"{label}:  " + "  •  ".join(f"p{p} {value:g}{unit}" for p, value in percentiles.items())
+
+
+def summary_slides(aggregate):
+    """Summary-tab KPIs: four tiles, status / recovery-model pies, then backup-age distributions."""
+    compliance = aggregate.compliance_percent
+    tiles = [
+        ("Instances", f"{aggregate.instance_count}", "AZURE_BLUE"),
+        ("Databases", f"{aggregate.database_count}", "43A047"),
+        ("Backup Alerts", f"{aggregate.backup_alerts}", "E65100"),
+        ("Compliance", "n/a" if compliance is None else f"{compliance}%", "6A1B9A"),
+    ]
+    shapes = header("Fleet Summary")
+    for i, (label, value, color) in enumerate(tiles):
+        shapes.append(rounded((0.8 + i * 3.1, 1.5, 2.8, 1.2), color, f"{value}\n{label}", 20, "WHITE"))
+
+    statuses = aggregate.status_distribution()
+    models = aggregate.recovery_model_distribution()
+    if statuses:
+        shapes.append(chart("pie", (0.8, 3.0, 5.8, 4.2), [s for s, _ in statuses], [c for _, c in statuses],
+                            "Databases by Backup Alert Status", [STATUS_COLORS.get(s, "DARK_GRAY") for s, _ in statuses]))
+    if models:
+        shapes.append(chart("pie", (6.9, 3.0, 5.8, 4.2), [m for m, _ in models], [c for _, c in models],
+                            "Databases by Recovery Model",
+                            [MODEL_COLORS[i % len(MODEL_COLORS)] for i in range(len(models))]))
+    yield slide("Fleet Summary", shapes, background="WHITE")
+
+    full, log = aggregate.full_backup_buckets(), aggregate.log_backup_buckets()
+    yield slide("Backup Age Distribution", header("Backup Age Distribution") + [
+        chart("bar", (0.5, 1.5, 6.1, 4.6), [b for b, _ in full], [c for _, c in full],
+              "Time Since Last Full Backup", ["GREEN", "ORANGE", "RED", "RED", "MEDIUM_GRAY"]),
+        chart("bar", (6.8, 1.5, 6.1, 4.6), [b for b, _ in log], [c for _, c in log],
+              "Time Since Last Log Backup (FULL recovery)"),
+        text((0.8, 6.3, 12, 0.4), _percentile_line("Hours since full backup", aggregate.full_backup_percentiles(), "h"),
+             14, False, "MEDIUM_GRAY"),
+        text((0.8, 6.7, 12, 0.4), _percentile_line("Minutes since log backup", aggregate.log_backup_percentiles(), " min"),
+             14, False, "MEDIUM_GRAY"),
+    ], background="WHITE")
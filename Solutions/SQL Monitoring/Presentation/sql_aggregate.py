@@ -0,0 +1,243 @@
+"""
+Vectorized fleet rollup of SQLServerMonitoring_CL records for the Summary KPIs.
+
+Records are dictionary-encoded into typed columns as they stream past, then
+reduced with NumPy in whole-array passes instead of one Where-Object per
+status: the latest row per (SqlInstance, DatabaseName) via a single lexsort,
+per-instance status / recovery-model counts via bincount, and backup-age
+percentiles and buckets via percentile / digitize. The same arrays carry the
+per-instance server, version, uptime and restart columns of the report tables.
+Buffers are compacted to the latest row per database every chunk_size records,
+so memory is bounded by fleet size.
+"""
+from array import array
+
+import numpy as np
+
+from sql_export import BACKUP_STATUSES, ERROR_DATABASE
+
+# HoursSinceFullBackup buckets, on the runbook's 24h (Warning) / 168h (Critical) thresholds
+FULL_BACKUP_EDGES = [25, 169, 721]
+FULL_BACKUP_LABELS = ["≤ 24h", "1–7 days", "7–30 days", "> 30 days"]
+# MinutesSinceLogBackup buckets for FULL recovery databases
+LOG_BACKUP_EDGES = [16, 61, 241, 1441]
+LOG_BACKUP_LABELS = ["≤ 15 min", "15–60 min", "1–4 h", "4–24 h", "> 24 h"]
+PERCENTILES = [50, 90, 95, 99]
+
+
+class Codes:
+    """Dictionary encoding of a string column."""
+
+    def __init__(self, values=()):
+        self.index = {}
+        self.values = []
+        for value in values:
+            self.code(value)
+
+    def code(self, value):
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self):
+        return len(self.values)
+
+
+class RecordColumns:
+    """Accumulates records into typed column buffers for FleetAggregate."""
+
+    def __init__(self, chunk_size=1_000_000):
+        self.chunk_size = chunk_size
+        self.instances = Codes()
+        self.databases = Codes()
+        self.statuses = Codes(BACKUP_STATUSES)
+        self.models = Codes()
+        self.times = Codes()
+        self.servers = Codes()
+        self.versions = Codes()
+        self.start_times = Codes([""])
+        self._latest = None
+        self._errors = np.zeros(0, dtype=np.int64)
+        # Distinct (instance << 32 | start time) pairs, for restart counts
+        self._starts = np.zeros(0, dtype=np.int64)
+        self._reset()
+
+    def _reset(self):
+        self._buffers = {name: array("q") for name in
+                         ("instance", "database", "status", "model", "time", "hours", "minutes",
+                          "server", "version", "start", "uptime_days", "uptime_hours")}
+        self._error_buffer = array("q")
+        self._pending = 0
+
+    def add(self, record):
+        instance = self.instances.code(record["SqlInstance"])
+        if record["DatabaseName"] == ERROR_DATABASE:
+            self._error_buffer.append(instance)
+            return
+        b = self._buffers
+        b["instance"].append(instance)
+        b["database"].append(self.databases.code(record["DatabaseName"]))
+        b["status"].append(self.statuses.code(record["FullBackupAlertStatus"]))
+        b["model"].append(self.models.code(record["RecoveryModel"]))
+        b["time"].append(self.times.code(record["TimeGenerated"]))
+        b["hours"].append(record["HoursSinceFullBackup"])
+        b["minutes"].append(record["MinutesSinceLogBackup"])
+        b["server"].append(self.servers.code(record["ServerName"]))
+        b["version"].append(self.versions.code(record["SqlVersion"]))
+        b["start"].append(self.start_times.code(record["InstanceStartTime"]))
+        b["uptime_days"].append(record["InstanceUptimeDays"])
+        b["uptime_hours"].append(record["InstanceUptimeHours"])
+        self._pending += 1
+        if self._pending >= self.chunk_size:
+            self._flush()
+
+    def _flush(self):
+        chunk = {name: np.frombuffer(buffer, dtype=np.int64) for name, buffer in self._buffers.items()}
+        started = chunk["start"] != 0
+        self._starts = np.union1d(self._starts, (chunk["instance"][started] << 32) | chunk["start"][started])
+        if self._latest is not None:
+            chunk = {name: np.concatenate([self._latest[name], chunk[name]]) for name in chunk}
+        self._latest = self._latest_per_database(chunk)
+        errors = np.bincount(np.frombuffer(self._error_buffer, dtype=np.int64), minlength=len(self.instances))
+        self._errors = np.concatenate([self._errors, np.zeros(len(errors) - len(self._errors), dtype=np.int64)]) + errors
+        self._reset()
+
+    def time_rank(self):
+        """Chronological rank of every TimeGenerated code."""
+        # sql_export normalizes TimeGenerated to ISO UTC, so sorted string order is time order
+        rank = np.empty(len(self.times), dtype=np.int64)
+        rank[np.argsort(np.array(self.times.values), kind="stable")] = np.arange(len(self.times))
+        return rank
+
+    def _latest_per_database(self, chunk):
+        key = (chunk["instance"] << 32) | chunk["database"]
+        rows = _last_per_key(key, self.time_rank()[chunk["time"]])
+        return {name: column[rows] for name, column in chunk.items()}
+
+    def finish(self):
+        self._flush()
+        return FleetAggregate(self)
+
+
+def _last_per_key(key, rank):
+    """Row index of the highest-ranked row of every distinct key, in key order."""
+    order = np.lexsort((rank, key))
+    key = key[order]
+    last = np.ones(len(key), dtype=bool)
+    last[:-1] = key[1:] != key[:-1]
+    return order[last]
+
+
+def _names(values, codes):
+    # Code -1 (an instance with no database rows) reads as ""
+    names = values + [""]
+    return [names[code] for code in codes.tolist()]
+
+
+class FleetAggregate:
+    """Fleet KPIs computed from the latest record of every database."""
+
+    def __init__(self, columns):
+        latest = columns._latest
+        self.instance_names = columns.instances.values
+        self.status_names = columns.statuses.values
+        self.model_names = columns.models.values
+        n_instances, n_statuses = len(self.instance_names), len(self.status_names)
+
+        instance, status, model = latest["instance"], latest["status"], latest["model"]
+        self.hours = latest["hours"]
+        self.minutes = latest["minutes"]
+        self.is_full_recovery = model == columns.models.index.get("FULL", -1)
+
+        self.status_by_instance = np.bincount(instance * n_statuses + status,
+                                              minlength=n_instances * n_statuses).reshape(n_instances, n_statuses)
+        self.databases_by_instance = self.status_by_instance.sum(axis=1)
+        self.compliant_by_instance = np.bincount(instance, weights=(self.hours >= 0) & (self.hours <= 24),
+                                                 minlength=n_instances).astype(np.int64)
+        self.errors_by_instance = np.concatenate(
+            [columns._errors, np.zeros(n_instances - len(columns._errors), dtype=np.int64)])
+        self.status_counts = self.status_by_instance.sum(axis=0)
+        self.model_counts = np.bincount(model, minlength=len(self.model_names))
+
+        # Instance columns come from each instance's latest row; instances that only sent errors get -1 / ""
+        seen = np.full(n_instances, -1, dtype=np.int64)
+        rows = _last_per_key(instance, columns.time_rank()[latest["time"]])
+        seen[instance[rows]] = rows
+        self.server_by_instance = _names(columns.servers.values, np.append(latest["server"], -1)[seen])
+        self.version_by_instance = _names(columns.versions.values, np.append(latest["version"], -1)[seen])
+        self.start_by_instance = _names(columns.start_times.values, np.append(latest["start"], -1)[seen])
+        self.last_seen_by_instance = _names(columns.times.values, np.append(latest["time"], -1)[seen])
+        self.uptime_days_by_instance = np.append(latest["uptime_days"], -1)[seen]
+        self.uptime_hours_by_instance = np.append(latest["uptime_hours"], -1)[seen]
+        # Restarts inside the export window: distinct start times beyond the first
+        starts = np.bincount(columns._starts >> 32, minlength=n_instances)
+        self.restarts_by_instance = np.maximum(starts - 1, 0)
+
+    @property
+    def instance_count(self):
+        return len(self.instance_names)
+
+    @property
+    def database_count(self):
+        return int(self.databases_by_instance.sum())
+
+    @property
+    def backup_alerts(self):
+        return int(sum(self.status_counts[self.status_names.index(s)] for s in ("Warning", "Critical", "Never")))
+
+    @property
+    def compliance_percent(self):
+        if not self.database_count:
+            return None
+        return round(100.0 * int(self.compliant_by_instance.sum()) / self.database_count, 1)
+
+    @property
+    def failing_instances(self):
+        """Instances that sent at least one connection-error row."""
+        return int((self.errors_by_instance > 0).sum())
+
+    def instance_compliance(self):
+        """Per-instance backup compliance percent, None for instances without databases."""
+        return [round(100.0 * compliant / databases, 1) if databases else None
+                for compliant, databases in zip(self.compliant_by_instance.tolist(), self.databases_by_instance.tolist())]
+
+    def status_distribution(self):
+        """(status, count) pairs in BACKUP_STATUSES order, then any unexpected statuses."""
+        return [(name, int(count)) for name, count in zip(self.status_names, self.status_counts) if count]
+
+    def recovery_model_distribution(self):
+        pairs = [(name or "(none)", int(count)) for name, count in zip(self.model_names, self.model_counts) if count]
+        return sorted(pairs, key=lambda pair: -pair[1])
+
+    def full_backup_percentiles(self):
+        """HoursSinceFullBackup percentiles over databases that have a full backup."""
+        hours = self.hours[self.hours >= 0]
+        if not len(hours):
+            return {}
+        return dict(zip(PERCENTILES, np.percentile(hours, PERCENTILES).round(1).tolist()))
+
+    def log_backup_percentiles(self):
+        minutes = self.minutes[self.is_full_recovery & (self.minutes >= 0)]
+        if not len(minutes):
+            return {}
+        return dict(zip(PERCENTILES, np.percentile(minutes, PERCENTILES).round(1).tolist()))
+
+    def full_backup_buckets(self):
+        hours = self.hours[self.hours >= 0]
+        counts = np.bincount(np.digitize(hours, FULL_BACKUP_EDGES), minlength=len(FULL_BACKUP_LABELS))
+        return list(zip(FULL_BACKUP_LABELS, counts.tolist())) + [("Never", int((self.hours < 0).sum()))]
+
+    def log_backup_buckets(self):
+        minutes = self.minutes[self.is_full_recovery]
+        counts = np.bincount(np.digitize(minutes[minutes >= 0], LOG_BACKUP_EDGES), minlength=len(LOG_BACKUP_LABELS))
+        return list(zip(LOG_BACKUP_LABELS, counts.tolist())) + [("No log backup", int((minutes < 0).sum()))]
+
+
+def aggregate_records(records, chunk_size=1_000_000):
+    """Aggregate a record stream in one call."""
+    columns = RecordColumns(chunk_size)
+    for record in records:
+        columns.add(record)
+    return columns.finish()
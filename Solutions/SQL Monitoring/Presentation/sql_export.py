@@ -0,0 +1,132 @@
+"""
+Streaming reader for SQLServerMonitoring_CL exports.
+
+Exports are JSONL (one record per line, as ConvertTo-LogAnalyticsRecord in the
+runbook produces them) or CSV (as exported from Log Analytics), optionally
+gzip-compressed. Records flow through generators end to end, so memory is
+bounded by the size of the fleet (instances x databases), never by row count.
+
+Datetime columns are normalized to the runbook's "yyyy-MM-ddTHH:mm:ssZ" (UTC),
+whatever the export used (Log Analytics CSVs hold "10/3/2026, 9:05:00.000 AM"),
+so timestamps compare and sort correctly as strings.
+"""
+import csv
+from datetime import datetime, timezone
+import gzip
+import io
+import json
+import os
+import re
+
+# SQLServerMonitoring_CL columns, in ConvertTo-LogAnalyticsRecord order
+COLUMNS = [
+    "TimeGenerated", "CollectorName", "SqlInstance", "ServerName", "SqlVersion",
+    "InstanceStartTime", "InstanceUptimeSeconds", "InstanceUptimeMinutes",
+    "InstanceUptimeHours", "InstanceUptimeDays", "DatabaseName", "DatabaseState",
+    "RecoveryModel", "DatabaseCreateDate", "LastFullBackupTime", "HoursSinceFullBackup",
+    "LastFullBackupStatus", "FullBackupAlertStatus", "LastLogBackupTime", "MinutesSinceLogBackup",
+]
+INT_COLUMNS = {
+    "InstanceUptimeSeconds", "InstanceUptimeMinutes", "InstanceUptimeHours",
+    "InstanceUptimeDays", "HoursSinceFullBackup", "MinutesSinceLogBackup",
+}
+TIME_COLUMNS = ["TimeGenerated", "InstanceStartTime", "DatabaseCreateDate", "LastFullBackupTime", "LastLogBackupTime"]
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+# Log Analytics CSV exports (US locale), with and without milliseconds
+CSV_TIME_FORMATS = ["%m/%d/%Y, %I:%M:%S.%f %p", "%m/%d/%Y, %I:%M:%S %p"]
+_FRACTION = re.compile(r"(?<=:\d\d)\.\d+")
+
+# DatabaseName of the sentinel row the runbook sends when an instance can't be queried
+ERROR_DATABASE = "_ERROR"
+BACKUP_STATUSES = ["OK", "Warning", "Critical", "Never"]
+
+
+def _open_text(path):
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8-sig", newline="")
+    return open(path, encoding="utf-8-sig", newline="")
+
+
+def _as_int(value):
+    # Missing values mean "unknown", which the runbook encodes as -1
+    if value is None or value == "":
+        return -1
+    return int(float(value))
+
+
+def normalize_time(value):
+    """A timestamp as "yyyy-MM-ddTHH:mm:ssZ" UTC; naive values are taken as UTC.
+
+    Accepts ISO 8601 (with or without fractions, offset or time) and the Log
+    Analytics CSV format. Empty and unrecognized values are returned unchanged.
+    """
+    if not value or (len(value) == 20 and value[10] == "T" and value[19] == "Z"):
+        return value
+    try:
+        # Drop fractions (Log Analytics JSON has 7 digits) and spell Z as an offset for older fromisoformat
+        parsed = datetime.fromisoformat(_FRACTION.sub("", value).replace("Z", "+00:00"))
+    except ValueError:
+        parsed = None
+        for fmt in CSV_TIME_FORMATS:
+            try:
+                parsed = datetime.strptime(value, fmt)
+                break
+            except ValueError:
+                pass
+        if parsed is None:
+            return value
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime(TIME_FORMAT)
+
+
+def normalize(raw):
+    """Project a raw export row onto the 20 known columns with typed numbers and UTC ISO timestamps."""
+    record = {}
+    for column in COLUMNS:
+        value = raw.get(column)
+        if column in INT_COLUMNS:
+            record[column] = _as_int(value)
+        elif column in TIME_COLUMNS:
+            record[column] = "" if value is None else normalize_time(str(value))
+        else:
+            record[column] = "" if value is None else str(value)
+    return record
+
+
+def _iter_jsonl(f):
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def _iter_csv(f):
+    reader = csv.reader(f)
+    # Log Analytics suffixes datetime headers with " [UTC]"
+    header = [name.split(" [")[0].strip() for name in next(reader, [])]
+    for row in reader:
+        yield dict(zip(header, row))
+
+
+def read_records(path):
+    """Yield normalized records from one JSONL or CSV export (optionally .gz)."""
+    name = path[:-3] if path.endswith(".gz") else path
+    parse = _iter_csv if os.path.splitext(name)[1].lower() == ".csv" else _iter_jsonl
+    with _open_text(path) as f:
+        for raw in parse(f):
+            yield normalize(raw)
+
+
+def read_exports(paths):
+    """Chain read_records over several export files."""
+    for path in paths:
+        yield from read_records(path)
+
+
+def records_since(records, since=None):
+    """Drop records older than the timestamp since (no-op when since is empty)."""
+    if not since:
+        return records
+    since = normalize_time(since)
+    return (record for record in records if record["TimeGenerated"] >= since)
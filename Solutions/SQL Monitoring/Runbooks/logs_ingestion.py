@@ -0,0 +1,470 @@
+"""
+Logs Ingestion API client for SQLServerMonitoring_CL records.
+
+The Python counterpart of Send-ToLogsIngestionApi in
+Get-SQLServerInfo-LogsIngestionApi.ps1, for payloads too big for one call.
+Records are JSON-encoded one at a time and packed into batches that stay
+just under the 1 MB per-call limit. Each batch is gzip-compressed and POSTed
+over a small pool of keep-alive connections by a bounded number of workers.
+429 and 5xx responses (and dropped connections) are retried with exponential
+backoff that honours Retry-After. A batch that still fails is reported (and,
+from the CLI, appended to a JSONL file for a later re-send as soon as it
+fails) without stopping the others.
+
+Library:
+
+    client = LogsIngestionClient(dce_endpoint, dcr_immutable_id, token_provider=static_token(token))
+    result = client.upload(records)          # dicts, or pre-encoded JSON bytes
+    result = client.upload(records, on_failure=callback)   # callback(count, body, error) per failed batch
+    client.close()
+
+CLI (the token comes from --token, $LOGS_INGESTION_TOKEN or, if installed, azure-identity):
+
+    python logs_ingestion.py send --endpoint https://my-dce.eastus-1.ingest.monitor.azure.com \\
+        --dcr-id dcr-00000000000000000000000000000000 records.jsonl [more.jsonl.gz ...]
+    python logs_ingestion.py stub --port 8080      # local stand-in DCE for testing
+
+Only the standard library is required.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import email.utils
+import gzip
+import http.client
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import urllib.parse
+
+API_VERSION = "2023-01-01"
+DEFAULT_STREAM = "Custom-SQLServerMonitoring_CL"
+TOKEN_SCOPE = "https://monitor.azure.com//.default"
+
+# The API rejects calls over 1 MB; keep a little headroom
+MAX_BATCH_BYTES = 1_000_000
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+# ============================================================
+# Batching
+# ============================================================
+def encode_record(record):
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def iter_batches(encoded_records, max_bytes=MAX_BATCH_BYTES):
+    """Pack JSON-encoded records into JSON array bodies of at most max_bytes.
+
+    Yields (record_count, body). Sizes are tracked as records are added, so
+    nothing is ever encoded twice. A record too big for any batch is yielded
+    alone in a body over max_bytes, for the caller to fail without sending.
+    """
+    batch, size = [], 2  # "[" and "]"
+    for encoded in encoded_records:
+        added = len(encoded) + (1 if batch else 0)
+        if batch and size + added > max_bytes:
+            yield len(batch), b"[" + b",".join(batch) + b"]"
+            batch, size, added = [], 2, len(encoded)
+        if size + added > max_bytes:
+            yield 1, b"[" + encoded + b"]"
+            continue
+        batch.append(encoded)
+        size += added
+    if batch:
+        yield len(batch), b"[" + b",".join(batch) + b"]"
+
+
+def read_jsonl(path):
+    """Yield the raw JSON lines of a .jsonl (or .jsonl.gz) file, already encoded."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line.lstrip(b"\xef\xbb\xbf")
+
+
+# ============================================================
+# Tokens
+# ============================================================
+def static_token(token):
+    return lambda: token
+
+
+def azure_identity_token(client_id=None):
+    """Token provider backed by azure-identity (managed identity, az login, environment...)."""
+    try:
+        from azure.identity import DefaultAzureCredential
+    except ImportError:
+        raise RuntimeError("azure-identity is not installed; pass --token or set LOGS_INGESTION_TOKEN") from None
+    credential = DefaultAzureCredential(managed_identity_client_id=client_id)
+    lock = threading.Lock()
+    cached = [None]
+
+    def provider():
+        with lock:
+            # Refresh five minutes ahead of expiry
+            if cached[0] is None or cached[0].expires_on - time.time() < 300:
+                cached[0] = credential.get_token(TOKEN_SCOPE)
+            return cached[0].token
+    return provider
+
+
+# ============================================================
+# Uploader
+# ============================================================
+class _ConnectionPool:
+    """Keep-alive HTTP(S) connections to one host, handed out one per in-flight request."""
+
+    def __init__(self, url, timeout):
+        parsed = urllib.parse.urlsplit(url)
+        self._connection_class = http.client.HTTPSConnection if parsed.scheme == "https" else http.client.HTTPConnection
+        self._host = parsed.netloc
+        self._timeout = timeout
+        self._idle = queue.LifoQueue()
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connection_class(self._host, timeout=self._timeout)
+
+    def release(self, connection):
+        self._idle.put(connection)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class UploadResult:
+    """Counters for one upload() call. Failed batches are counted, not kept; see upload(on_failure=...)."""
+
+    def __init__(self):
+        self.batches = 0
+        self.records = 0
+        self.bytes_sent = 0
+        self.retries = 0
+        self.failed_batches = 0
+        self.failed_records = 0
+        self.last_error = ""
+        self._lock = threading.Lock()
+
+    @property
+    def ok(self):
+        return not self.failed_batches
+
+
+class LogsIngestionClient:
+    """Uploads records to one DCR stream through a Data Collection Endpoint."""
+
+    def __init__(self, endpoint, dcr_immutable_id, stream_name=DEFAULT_STREAM, token_provider=None,
+                 max_workers=4, max_retries=5, backoff=1.0, max_backoff=60.0, timeout=30, compress=True):
+        self.path = (f"{urllib.parse.urlsplit(endpoint).path.rstrip('/')}/dataCollectionRules/{dcr_immutable_id}"
+                     f"/streams/{stream_name}?api-version={API_VERSION}")
+        self.token_provider = token_provider or static_token("")
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.compress = compress
+        self._pool = _ConnectionPool(endpoint, timeout)
+
+    def close(self):
+        self._pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _post(self, payload, headers):
+        """One POST on a pooled connection; returns (status, headers, body)."""
+        connection = self._pool.acquire()
+        try:
+            connection.request("POST", self.path, payload, headers)
+            response = connection.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            raise
+        if response.will_close:
+            connection.close()
+        else:
+            self._pool.release(connection)
+        return response.status, response.headers, body
+
+    def _delay(self, attempt, retry_after):
+        if retry_after:
+            try:
+                return max(float(retry_after), 0.0)
+            except ValueError:
+                pass
+            try:
+                when = email.utils.parsedate_to_datetime(retry_after)
+                return max(when.timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                pass  # Unparseable Retry-After: fall back to our own backoff
+        # Full jitter, so a burst of throttled workers doesn't come back in lockstep
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def send_batch(self, body, result=None):
+        """POST one JSON array body, retrying throttling and server errors. Raises IOError when it gives up."""
+        payload = gzip.compress(body, compresslevel=5) if self.compress else body
+        for attempt in range(self.max_retries + 1):
+            headers = {"Authorization": f"Bearer {self.token_provider()}", "Content-Type": "application/json"}
+            if self.compress:
+                headers["Content-Encoding"] = "gzip"
+            try:
+                status, response_headers, response_body = self._post(payload, headers)
+            except (OSError, http.client.HTTPException) as e:
+                status, response_headers, error = None, {}, f"{type(e).__name__}: {e}"
+            else:
+                if 200 <= status < 300:
+                    return len(payload)
+                error = f"HTTP {status}: {response_body[:500].decode('utf-8', 'replace')}"
+                if status not in RETRY_STATUSES:
+                    raise IOError(error)
+            if attempt == self.max_retries:
+                raise IOError(error)
+            if result is not None:
+                with result._lock:
+                    result.retries += 1
+            time.sleep(self._delay(attempt, response_headers.get("Retry-After")))
+
+    def upload(self, records, max_bytes=MAX_BATCH_BYTES, on_failure=None):
+        """Send records (dicts, or JSON-encoded bytes) in size-bounded batches, concurrently.
+
+        At most 2 x max_workers batches are encoded ahead of the uploads, so a
+        stream of any length is sent in bounded memory. on_failure(count, body,
+        error) is called for each batch given up on, one call at a time, so
+        failed bodies can be saved as they fail instead of piling up.
+        """
+        result = UploadResult()
+        encoded = (r if isinstance(r, bytes) else encode_record(r) for r in records)
+        in_flight = threading.BoundedSemaphore(self.max_workers * 2)
+
+        def fail(count, body, error):
+            with result._lock:
+                result.failed_batches += 1
+                result.failed_records += count
+                result.last_error = error
+                if on_failure is not None:
+                    on_failure(count, body, error)
+
+        def send(count, body):
+            try:
+                sent = self.send_batch(body, result)
+                with result._lock:
+                    result.batches += 1
+                    result.records += count
+                    result.bytes_sent += sent
+            except Exception as e:
+                # Token provider errors and the like fail the batch too, never drop it silently
+                fail(count, body, str(e) if isinstance(e, IOError) else f"{type(e).__name__}: {e}")
+            finally:
+                in_flight.release()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for count, body in iter_batches(encoded, max_bytes):
+                if len(body) > max_bytes:
+                    # The API would reject it anyway; fail it here and carry on with the rest
+                    fail(count, body, f"A single record of {len(body) - 2} bytes exceeds the {max_bytes}-byte batch limit")
+                    continue
+                in_flight.acquire()
+                executor.submit(send, count, body)
+        return result
+
+
+# ============================================================
+# Local stub DCE
+# ============================================================
+class StubDce(ThreadingHTTPServer):
+    """Minimal stand-in for a Data Collection Endpoint, for tests and load runs.
+
+    Accepts Logs Ingestion API POSTs (gzip or plain), enforces the 1 MB limit
+    and counts what it receives. The first fail_first requests are answered
+    with fail_status (and Retry-After, if given), to exercise retries.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port=0, fail_first=0, fail_status=503, retry_after=None, output=None):
+        super().__init__(("127.0.0.1", port), _StubHandler)
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.retry_after = retry_after
+        self.requests = 0
+        self.records = 0
+        self.bytes_received = 0
+        self._output = open(output, "ab") if output else None
+        self._lock = threading.Lock()
+
+    @property
+    def endpoint(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def server_close(self):
+        super().server_close()
+        if self._output:
+            self._output.close()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, message="", headers=()):
+        body = json.dumps({"error": {"message": message}}).encode() if message else b""
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        payload = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server._lock:
+            server.requests += 1
+            failing = server.requests <= server.fail_first
+        if failing:
+            retry_after = [("Retry-After", str(server.retry_after))] if server.retry_after is not None else []
+            return self._reply(server.fail_status, "Injected failure", retry_after)
+        if "/dataCollectionRules/" not in self.path or "/streams/" not in self.path:
+            return self._reply(404, f"Unknown path {self.path}")
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            return self._reply(401, "Missing bearer token")
+        body = gzip.decompress(payload) if self.headers.get("Content-Encoding") == "gzip" else payload
+        if len(body) > 1024 * 1024:
+            return self._reply(413, "Payload exceeds 1 MB")
+        try:
+            records = json.loads(body)
+        except ValueError as e:
+            return self._reply(400, f"Invalid JSON: {e}")
+        with server._lock:
+            server.records += len(records)
+            server.bytes_received += len(payload)
+            if server._output:
+                server._output.writelines(json.dumps(r).encode() + b"\n" for r in records)
+        self._reply(204)
+
+
+# ============================================================
+# CLI
+# ============================================================
+class FailedRecordWriter:
+    """upload() on_failure callback appending the records of each failed batch to a JSONL file.
+
+    The file is created on the first failure, so a clean run leaves none behind.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def __call__(self, count, body, error):
+        if self._file is None:
+            self._file = open(self.path, "wb")
+        self._file.writelines(encode_record(r) + b"\n" for r in json.loads(body))
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def _send(args):
+    if args.token or os.environ.get("LOGS_INGESTION_TOKEN"):
+        token_provider = static_token(args.token or os.environ["LOGS_INGESTION_TOKEN"])
+    else:
+        token_provider = azure_identity_token(args.client_id)
+
+    def records():
+        for path in args.files:
+            yield from read_jsonl(path)
+
+    failed = FailedRecordWriter(args.failed) if args.failed else None
+    started = time.perf_counter()
+    try:
+        with LogsIngestionClient(args.endpoint, args.dcr_id, args.stream, token_provider, args.workers,
+                                 args.retries, compress=not args.no_gzip) as client:
+            result = client.upload(records(), args.max_bytes, failed)
+    finally:
+        if failed:
+            failed.close()
+    seconds = time.perf_counter() - started
+
+    print(f"Sent {result.records} record(s) in {result.batches} batch(es), {result.bytes_sent / 1e6:.1f} MB "
+          f"on the wire, {result.retries} retr{'y' if result.retries == 1 else 'ies'}, {seconds:.2f}s "
+          f"({result.records / seconds if seconds else 0:,.0f} records/s)")
+    if not result.ok:
+        print(f"Failed: {result.failed_records} record(s) in {result.failed_batches} batch(es); last error: "
+              f"{result.last_error}", file=sys.stderr)
+        if args.failed:
+            print(f"Failed records written to: {args.failed}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _stub(args):
+    server = StubDce(args.port, args.fail_first, args.fail_status, args.retry_after, args.output)
+    print(f"Stub DCE listening on {server.endpoint} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Received {server.records} record(s) in {server.requests} request(s)")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Send SQLServerMonitoring_CL records through the Logs Ingestion API")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    send = commands.add_parser("send", help="Upload JSONL record files")
+    send.add_argument("files", nargs="+", help="JSONL files (optionally .gz), one record per line")
+    send.add_argument("--endpoint", required=True, help="Data Collection Endpoint URI")
+    send.add_argument("--dcr-id", required=True, help="Immutable ID of the Data Collection Rule")
+    send.add_argument("--stream", default=DEFAULT_STREAM)
+    send.add_argument("--token", help="Bearer token (default: $LOGS_INGESTION_TOKEN, then azure-identity)")
+    send.add_argument("--client-id", help="User-assigned managed identity client ID for azure-identity")
+    send.add_argument("--workers", type=int, default=4, help="Concurrent uploads")
+    send.add_argument("--retries", type=int, default=5, help="Retries per batch on 429/5xx")
+    send.add_argument("--max-bytes", type=int, default=MAX_BATCH_BYTES, help="Uncompressed batch size limit")
+    send.add_argument("--no-gzip", action="store_true", help="Send uncompressed bodies")
+    send.add_argument("--failed", help="Write records from batches that could not be sent to this JSONL file")
+    send.set_defaults(run=_send)
+
+    stub = commands.add_parser("stub", help="Run a local stub DCE")
+    stub.add_argument("--port", type=int, default=8080)
+    stub.add_argument("--fail-first", type=int, default=0, help="Fail this many requests first")
+    stub.add_argument("--fail-status", type=int, default=503)
+    stub.add_argument("--retry-after", type=float, help="Retry-After seconds sent with injected failures")
+    stub.add_argument("--output", help="Append received records to this JSONL file")
+    stub.set_defaults(run=_stub)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+"""
+Synthetic SQLServerMonitoring_CL load generator.
+
+Simulates a fleet of SQL Server instances polled by the runbook on a schedule
+and emits one record per database per collection, field for field as
+ConvertTo-LogAnalyticsRecord builds them (and the _ERROR sentinel row for
+instances that can't be reached). Use it to scale-test ingestion and the
+SQLServerMonitoring workbook without real servers.
+
+What it models:
+
+- uptime that grows between collections and resets when an instance restarts
+- full backups on daily, 12-hour and weekly schedules (plus databases never
+  backed up, like tempdb), and stalls that leave a database without backups
+  for days, so HoursSinceFullBackup drifts across the runbook's 24h (Warning)
+  and 168h (Critical) thresholds and FullBackupAlertStatus follows it
+- log backups every 15 minutes for FULL / BULK_LOGGED databases, with gaps
+  when the log backup job stops for a few hours
+- connection failures, more often on a few flaky instances, as _ERROR rows
+
+Hours and minutes use SQL Server's DATEDIFF semantics (boundaries crossed),
+like the runbook's backup query. Records are built from preformatted JSON
+fragments, so the generator streams millions of rows a minute. With --seed
+(and a fixed --start, which defaults to 2026-01-01 when seeded) the output is
+byte-for-byte reproducible.
+
+    python sql_load_generator.py --instances 5000 --databases 200 --collections 24 --output load.jsonl.gz
+    python sql_load_generator.py --instances 100 --collections 4 --seed 42 --output -
+    python sql_load_generator.py --instances 500 --endpoint http://127.0.0.1:8080   # logs_ingestion.py stub
+"""
+import argparse
+import bisect
+import calendar
+import functools
+import gzip
+import itertools
+import json
+import random
+import sys
+import time
+
+HOUR = 3600
+DAY = 24 * HOUR
+SEEDED_START = "2026-01-01T00:00:00Z"
+
+# Runbook thresholds for FullBackupAlertStatus
+WARNING_HOURS = 24
+CRITICAL_HOURS = 168
+
+
+def _weighted(choices):
+    """(value, weight) pairs as (values, cumulative weights) for _pick; rng.choices redoes that per call."""
+    return [value for value, _ in choices], list(itertools.accumulate(weight for _, weight in choices))
+
+
+SQL_VERSIONS = [
+    "Microsoft SQL Server 2022 (RTM-CU12) (KB5033663) - 16.0.4125.3 (X64)",
+    "Microsoft SQL Server 2019 (RTM-CU25) (KB5033688) - 15.0.4355.3 (X64)",
+    "Microsoft SQL Server 2017 (RTM-CU31) (KB5016884) - 14.0.3456.2 (X64)",
+    "Microsoft SQL Server 2016 (SP3) (KB5003279) - 13.0.6300.2 (X64)",
+]
+SYSTEM_DATABASES = [("master", "SIMPLE"), ("model", "FULL"), ("msdb", "SIMPLE"), ("tempdb", "SIMPLE")]
+RECOVERY_MODELS = _weighted([("FULL", 0.6), ("SIMPLE", 0.35), ("BULK_LOGGED", 0.05)])
+# (hours between full backups or None for never, share of user databases)
+FULL_SCHEDULES = _weighted([(24, 0.7), (12, 0.1), (168, 0.15), (None, 0.05)])
+DATABASE_STATES = _weighted([("ONLINE", 0.99), ("OFFLINE", 0.006), ("RESTORING", 0.004)])
+CONNECTION_ERRORS = [
+    "A network-related or instance-specific error occurred while establishing a connection to SQL Server. "
+    "The server was not found or was not accessible.",
+    "Login failed for user 'CONTOSO\\HYBRIDWORKER01$'.",
+    "Execution Timeout Expired. The timeout period elapsed prior to completion of the operation "
+    "or the server is not responding.",
+]
+
+LOG_INTERVAL = 15 * 60
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def iso(epoch):
+    """Epoch seconds as the runbook's "yyyy-MM-ddTHH:mm:ssZ"."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(epoch))
+
+
+def parse_iso(value):
+    return calendar.timegm(time.strptime(value, "%Y-%m-%dT%H:%M:%SZ"))
+
+
+def _pick(rng, table):
+    values, cumulative = table
+    return values[bisect.bisect(cumulative, rng.random() * cumulative[-1])]
+
+
+def _between(rng, low, high):
+    # Cheaper than rng.randrange, which matters across a million databases
+    return low + int(rng.random() * (high - low))
+
+
+def _json(value):
+    return json.dumps(value, ensure_ascii=False)
+
+
+class Database:
+    __slots__ = ("name", "fragment", "full_interval", "next_full", "last_full", "stalled_until",
+                 "logged", "log_phase", "last_log", "gap_until")
+
+    def __init__(self, rng, name, recovery_model, full_interval, created, start):
+        state = "ONLINE" if name in ("master", "model", "msdb", "tempdb") else _pick(rng, DATABASE_STATES)
+        # DatabaseName .. DatabaseCreateDate never change, so they're encoded once
+        self.fragment = (f'"DatabaseName":"{name}","DatabaseState":"{state}","RecoveryModel":"{recovery_model}",'
+                         f'"DatabaseCreateDate":"{iso(created)}",')
+        self.name = name
+        self.full_interval = full_interval * HOUR if full_interval else None
+        self.last_full = None
+        self.stalled_until = 0
+        if self.full_interval:
+            # Schedules run at a fixed time of day; the last one before start has already happened
+            self.next_full = start - _between(rng, 0, self.full_interval)
+            self.last_full = self.next_full - self.full_interval + _between(rng, 60, 1800)
+            if rng.random() < 0.03:
+                # Already in the middle of a stall when the simulation starts
+                self.last_full -= _between(rng, DAY, 14 * DAY)
+                self.stalled_until = start + _between(rng, 0, 7 * DAY)
+            if self.last_full < created:
+                self.last_full = None
+        self.logged = recovery_model != "SIMPLE" and self.full_interval is not None
+        self.log_phase = _between(rng, 0, LOG_INTERVAL)
+        self.last_log = None
+        self.gap_until = 0
+
+    def recreated(self, created):
+        head, _, _ = self.fragment.partition('"DatabaseCreateDate":')
+        self.fragment = f'{head}"DatabaseCreateDate":"{iso(created)}",'
+
+    def advance(self, rng, now, stall_rate, gap_rate):
+        if self.full_interval:
+            if now >= self.stalled_until and rng.random() < stall_rate:
+                # The backup job breaks and nobody notices for 1 to 14 days
+                self.stalled_until = now + _between(rng, DAY, 14 * DAY)
+            while self.next_full <= now:
+                if self.next_full >= self.stalled_until:
+                    self.last_full = min(self.next_full + _between(rng, 60, 1800), now)
+                self.next_full += self.full_interval
+        if self.logged and self.last_full is not None:
+            if now >= self.gap_until and rng.random() < gap_rate:
+                self.gap_until = now + _between(rng, HOUR, 12 * HOUR)
+            if now >= self.gap_until:
+                self.last_log = now - (now - self.log_phase) % LOG_INTERVAL
+
+    def backup_fields(self, now):
+        if self.last_full is None:
+            full = '"LastFullBackupTime":"","HoursSinceFullBackup":-1,"LastFullBackupStatus":"Never",' \
+                   '"FullBackupAlertStatus":"Never",'
+        else:
+            # DATEDIFF(HOUR, last, now) counts hour boundaries crossed
+            hours = now // HOUR - self.last_full // HOUR
+            alert = "Critical" if hours > CRITICAL_HOURS else "Warning" if hours > WARNING_HOURS else "OK"
+            full = (f'"LastFullBackupTime":"{iso(self.last_full)}","HoursSinceFullBackup":{hours},'
+                    f'"LastFullBackupStatus":"Success","FullBackupAlertStatus":"{alert}",')
+        if self.last_log is None:
+            return full + '"LastLogBackupTime":"","MinutesSinceLogBackup":-1}'
+        return full + (f'"LastLogBackupTime":"{iso(self.last_log)}",'
+                       f'"MinutesSinceLogBackup":{now // 60 - self.last_log // 60}}}')
+
+
+class Instance:
+    __slots__ = ("name", "version", "collector", "started", "failure_rate", "databases")
+
+    def __init__(self, rng, index, databases, collectors, start):
+        host = f"SQLVM{index:05d}"
+        # @@SERVERNAME, which the runbook reports as ServerName, includes the instance name
+        self.name = _json(f"{host}\\INST01" if rng.random() < 0.1 else host)
+        self.version = _json(rng.choice(SQL_VERSIONS))
+        self.collector = _json(f"HybridWorker{index % collectors + 1:02d}")
+        self.started = start - _between(rng, HOUR, 90 * DAY)
+        # A few instances sit behind a flaky network or firewall
+        self.failure_rate = 0.2 if rng.random() < 0.02 else 0.002
+        count = max(len(SYSTEM_DATABASES) + 1, int(rng.gauss(databases, databases * 0.2)))
+        created_floor = start - 5 * 365 * DAY
+        self.databases = []
+        for name, model in SYSTEM_DATABASES:
+            if name == "tempdb":
+                # Recreated at every startup and never backed up
+                self.databases.append(Database(rng, name, model, None, self.started, start))
+            else:
+                self.databases.append(Database(rng, name, model, 24, created_floor, start))
+        for i in range(count - len(SYSTEM_DATABASES)):
+            self.databases.append(Database(rng, f"AppDb{i:04d}", _pick(rng, RECOVERY_MODELS),
+                                           _pick(rng, FULL_SCHEDULES), _between(rng, created_floor, start), start))
+
+    def rows(self, rng, now, time_generated, restart_rate, stall_rate, gap_rate):
+        if rng.random() < self.failure_rate:
+            message = _json("Error: " + rng.choice(CONNECTION_ERRORS))
+            yield (f'{{"TimeGenerated":"{time_generated}","CollectorName":{self.collector},"SqlInstance":{self.name},'
+                   f'"ServerName":"","SqlVersion":"","InstanceStartTime":"","InstanceUptimeSeconds":-1,'
+                   f'"InstanceUptimeMinutes":-1,"InstanceUptimeHours":-1,"InstanceUptimeDays":-1,'
+                   f'"DatabaseName":"_ERROR","DatabaseState":"ConnectionError","RecoveryModel":"",'
+                   f'"DatabaseCreateDate":"","LastFullBackupTime":"","HoursSinceFullBackup":-1,'
+                   f'"LastFullBackupStatus":{message},"FullBackupAlertStatus":"Error","LastLogBackupTime":"",'
+                   f'"MinutesSinceLogBackup":-1}}')
+            return
+        if rng.random() < restart_rate:
+            self.started = now - _between(rng, 60, HOUR)
+            self.databases[SYSTEM_DATABASES.index(("tempdb", "SIMPLE"))].recreated(self.started)
+        uptime = now - self.started
+        # The runbook's [int] casts round half to even, as Python's round() does
+        # Everything up to DatabaseName is the same for every database of this collection
+        prefix = (f'{{"TimeGenerated":"{time_generated}","CollectorName":{self.collector},"SqlInstance":{self.name},'
+                  f'"ServerName":{self.name},'
+                  f'"SqlVersion":{self.version},"InstanceStartTime":"{iso(self.started)}",'
+                  f'"InstanceUptimeSeconds":{uptime},"InstanceUptimeMinutes":{round(uptime / 60)},'
+                  f'"InstanceUptimeHours":{round(uptime / HOUR)},"InstanceUptimeDays":{round(uptime / DAY)},')
+        for database in self.databases:
+            database.advance(rng, now, stall_rate, gap_rate)
+            yield prefix + database.fragment + database.backup_fields(now)
+
+
+class Fleet:
+    """A simulated fleet; iterating rows() advances it through its collections."""
+
+    def __init__(self, instances=100, databases=20, collectors=4, start=None, interval_minutes=60, seed=None,
+                 restart_rate=0.001, stall_rate=0.0005, gap_rate=0.002):
+        self.rng = random.Random(seed)
+        if start is None:
+            start = SEEDED_START if seed is not None else iso(int(time.time()) // HOUR * HOUR)
+        self.start = parse_iso(start) if isinstance(start, str) else int(start)
+        self.interval = interval_minutes * 60
+        self.restart_rate = restart_rate
+        self.stall_rate = stall_rate
+        self.gap_rate = gap_rate
+        self.instances = [Instance(self.rng, i + 1, databases, collectors, self.start) for i in range(instances)]
+
+    def rows(self, collections=1):
+        """JSON text of every record, one collection (all instances) after another."""
+        rng = self.rng
+        for n in range(collections):
+            now = self.start + n * self.interval
+            time_generated = iso(now)
+            for instance in self.instances:
+                yield from instance.rows(rng, now, time_generated, self.restart_rate, self.stall_rate, self.gap_rate)
+
+
+def _open_output(path):
+    if path == "-":
+        return sys.stdout.buffer
+    if path.endswith(".gz"):
+        return gzip.open(path, "wb", compresslevel=1)
+    return open(path, "wb")
+
+
+def write_jsonl(rows, path, chunk=10_000):
+    """Write rows to a JSONL file (.gz compresses, "-" is stdout); returns the row count."""
+    f = _open_output(path)
+    count = 0
+    try:
+        buffer = []
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) == chunk:
+                f.write(("\n".join(buffer) + "\n").encode("utf-8"))
+                count += len(buffer)
+                buffer = []
+        if buffer:
+            f.write(("\n".join(buffer) + "\n").encode("utf-8"))
+            count += len(buffer)
+    finally:
+        if f is not sys.stdout.buffer:
+            f.close()
+        else:
+            f.flush()
+    return count
+
+
+def send_rows(rows, endpoint, dcr_id, token, workers):
+    """Upload rows through logs_ingestion.LogsIngestionClient; returns its UploadResult."""
+    from logs_ingestion import LogsIngestionClient, static_token
+    with LogsIngestionClient(endpoint, dcr_id, token_provider=static_token(token), max_workers=workers) as client:
+        return client.upload(row.encode("utf-8") for row in rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic SQLServerMonitoring_CL records")
+    parser.add_argument("--instances", type=int, default=100)
+    parser.add_argument("--databases", type=int, default=20, help="Mean databases per instance (incl. 4 system)")
+    parser.add_argument("--collections", type=int, default=1, help="Runbook runs to simulate")
+    parser.add_argument("--interval", type=int, default=60, help="Minutes between runbook runs")
+    parser.add_argument("--collectors", type=int, default=4, help="Hybrid workers the instances are spread over")
+    parser.add_argument("--start", help="First collection time, yyyy-MM-ddTHH:mm:ssZ (default: this hour, "
+                                        f"or {SEEDED_START} with --seed)")
+    parser.add_argument("--seed", type=int, help="Seed for a reproducible fleet and record stream")
+    parser.add_argument("--restart-rate", type=float, default=0.001, help="Chance an instance restarts per run")
+    parser.add_argument("--stall-rate", type=float, default=0.0005,
+                        help="Chance a database's full backups stop (for 1-14 days) per run")
+    parser.add_argument("--gap-rate", type=float, default=0.002,
+                        help="Chance a database's log backups stop (for 1-12 hours) per run")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--output", default="-", help="JSONL file (.gz to compress) or - for stdout")
+    target.add_argument("--endpoint", help="Send to this DCE (e.g. a logs_ingestion.py stub) instead of a file")
+    target.add_argument("--stub", action="store_true", help="Send to an in-process stub DCE and report what it got")
+    parser.add_argument("--dcr-id", default="dcr-loadtest")
+    parser.add_argument("--token", default="loadtest")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent uploads with --endpoint/--stub")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    fleet = Fleet(args.instances, args.databases, args.collectors, args.start, args.interval, args.seed,
+                  args.restart_rate, args.stall_rate, args.gap_rate)
+    rows = fleet.rows(args.collections)
+    if args.endpoint or args.stub:
+        stub = None
+        if args.stub:
+            from logs_ingestion import StubDce
+            stub = StubDce().start()
+        result = send_rows(rows, stub.endpoint if stub else args.endpoint, args.dcr_id, args.token, args.workers)
+        count = result.records + result.failed_records
+        if stub:
+            stub.shutdown()
+            stub.server_close()
+            print(f"Stub received {stub.records} record(s) in {stub.requests} request(s)", file=sys.stderr)
+        if not result.ok:
+            print(f"Failed: {result.failed_records} record(s); last error: {result.last_error}", file=sys.stderr)
+    else:
+        count = write_jsonl(rows, args.output)
+    seconds = time.perf_counter() - started
+    print(f"Generated {count:,} record(s) for {args.instances} instance(s) x {args.collections} collection(s) "
+          f"in {seconds:.1f}s ({count / seconds * 60 if seconds else 0:,.0f} rows/min)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())